@@ -27,11 +27,10 @@ from datetime import datetime
 from pathlib import Path
 
 import yaml
-import pandas as pd
-import openpyxl
 from openpyxl.styles import PatternFill, Font, Alignment, Border, Side
 from openpyxl.utils import get_column_letter
 
+from src.core.workbook import excel_reader, open_workbook
 from src.diagnostics.run_manager import detect_vendor_from_path
 
 if hasattr(sys.stdout, "reconfigure") and sys.stdout.encoding \
@@ -610,7 +609,8 @@ def issue_color(issues_str: str) -> str:
 
 def write_audited_excel(source_path: Path, out_path: Path, vendor: str,
                          ai_predictions: dict[int, dict] | None = None):
-    df_raw = pd.read_excel(source_path, header=None, dtype=str, engine="openpyxl").fillna("")
+    with open_workbook(source_path) as session:
+        df_raw = session.dataframe(0, header=None, dtype=str).fillna("")
 
     # Find header row
     header_row_idx = None
@@ -677,7 +677,8 @@ def write_audited_excel(source_path: Path, out_path: Path, vendor: str,
     option_names = [str(row.get("option_name") or "").strip() for row in data_rows]
 
     # Write to Excel
-    wb = openpyxl.load_workbook(source_path)
+    with open_workbook(source_path) as session:
+        wb = session.editable_copy()
     ws = wb.active
 
     xlsx_header_row = header_row_idx + 1
@@ -1445,81 +1446,83 @@ def main():
         file_num = files.index(f) + 1
         print(f"  [{file_num}/{len(files)}] [{vendor.upper()}] {f.name}", flush=True)
 
-        ai_predictions = None
-        f_tok_in = 0
-        f_tok_out = 0
-        if use_ai and client:
-            # Load rows for LLM
+        # One read of the file for the LLM prep and the audited copy
+        with open_workbook(f, reader=excel_reader(config, vendor)) as session:
+            ai_predictions = None
+            f_tok_in = 0
+            f_tok_out = 0
+            if use_ai and client:
+                # Load rows for LLM
+                try:
+                    df_raw = session.dataframe(0, header=None, dtype=str).fillna("")
+                    header_row_idx = None
+                    for i, row in df_raw.iterrows():
+                        vals = [str(v).strip().lower() for v in row.values]
+                        if "entity type" in vals or "entity_type" in vals:
+                            header_row_idx = i
+                            break
+                    if header_row_idx is not None:
+                        df = df_raw.copy()
+                        raw_cols2 = [str(v).strip() for v in df_raw.iloc[header_row_idx].values]
+                        seen2: dict = {}
+                        deduped2 = []
+                        for c in raw_cols2:
+                            lc2 = c.lower().replace(" ", "_")
+                            if lc2 in seen2:
+                                seen2[lc2] += 1
+                                deduped2.append(f"{c}_{seen2[lc2]}")
+                            else:
+                                seen2[lc2] = 0
+                                deduped2.append(c)
+                        df.columns = deduped2
+                        df = df.iloc[header_row_idx + 1:].reset_index(drop=True)
+                        col_map = {c: c.lower().replace(" ", "_") for c in df.columns}
+                        df_work = df.rename(columns=col_map)
+                        _AL = {"description": "option_name", "product_description": "option_name", "part_number": "skus", "product_#": "skus"}
+                        data_rows = []
+                        for row in df_work.to_dict("records"):
+                            for src, dst in _AL.items():
+                                if src in row and dst not in row:
+                                    row[dst] = row[src]
+                            data_rows.append(row)
+                        ai_predictions, f_tok_in, f_tok_out = run_llm_predictions(data_rows, client, args.batch_size, llm_model)
+                        session_tok_in += f_tok_in
+                        session_tok_out += f_tok_out
+                except Exception as e:
+                    print(f"    ⚠ LLM prep error: {e}")
+
             try:
-                df_raw = pd.read_excel(f, header=None, dtype=str, engine="openpyxl").fillna("")
-                header_row_idx = None
-                for i, row in df_raw.iterrows():
-                    vals = [str(v).strip().lower() for v in row.values]
-                    if "entity type" in vals or "entity_type" in vals:
-                        header_row_idx = i
-                        break
-                if header_row_idx is not None:
-                    df = df_raw.copy()
-                    raw_cols2 = [str(v).strip() for v in df_raw.iloc[header_row_idx].values]
-                    seen2: dict = {}
-                    deduped2 = []
-                    for c in raw_cols2:
-                        lc2 = c.lower().replace(" ", "_")
-                        if lc2 in seen2:
-                            seen2[lc2] += 1
-                            deduped2.append(f"{c}_{seen2[lc2]}")
-                        else:
-                            seen2[lc2] = 0
-                            deduped2.append(c)
-                    df.columns = deduped2
-                    df = df.iloc[header_row_idx + 1:].reset_index(drop=True)
-                    col_map = {c: c.lower().replace(" ", "_") for c in df.columns}
-                    df_work = df.rename(columns=col_map)
-                    _AL = {"description": "option_name", "product_description": "option_name", "part_number": "skus", "product_#": "skus"}
-                    data_rows = []
-                    for row in df_work.to_dict("records"):
-                        for src, dst in _AL.items():
-                            if src in row and dst not in row:
-                                row[dst] = row[src]
-                        data_rows.append(row)
-                    ai_predictions, f_tok_in, f_tok_out = run_llm_predictions(data_rows, client, args.batch_size, llm_model)
-                    session_tok_in += f_tok_in
-                    session_tok_out += f_tok_out
+                success, results, option_names = write_audited_excel(f, out_path, vendor, ai_predictions)
+                if success:
+                    issue_count = sum(1 for r in results if r != "OK")
+                    ai_count = sum(1 for r in results if "AI_MISMATCH" in r)
+                    ai_tag = f", {ai_count} AI mismatch" if use_ai else ""
+                    # Per-file token cost
+                    cost_str = ""
+                    file_cost = 0.0
+                    if use_ai and (f_tok_in + f_tok_out) > 0:
+                        pricing = PRICING.get(llm_model, {"in": 0, "out": 0})
+                        file_cost = (f_tok_in * pricing["in"] + f_tok_out * pricing["out"]) / 1_000_000
+                        cost_str = f"  |  {f_tok_in+f_tok_out:,} токенов  ${file_cost:.4f}"
+                    print(f"    → {out_path.name} ✅  проблем: {issue_count}{ai_tag}{cost_str}")
+                    ok_count += 1
+                    # Collect for report
+                    report_files.append({
+                        "file": f.name,
+                        "vendor": vendor,
+                        "total_rows": len(results),
+                        "ok": sum(1 for r in results if r == "OK"),
+                        "issues": issue_count,
+                        "tokens": f_tok_in + f_tok_out,
+                        "cost_usd": round(file_cost, 4),
+                        "results": results,
+                        "option_names": option_names,
+                    })
+                else:
+                    failed += 1
             except Exception as e:
-                print(f"    ⚠ LLM prep error: {e}")
-
-        try:
-            success, results, option_names = write_audited_excel(f, out_path, vendor, ai_predictions)
-            if success:
-                issue_count = sum(1 for r in results if r != "OK")
-                ai_count = sum(1 for r in results if "AI_MISMATCH" in r)
-                ai_tag = f", {ai_count} AI mismatch" if use_ai else ""
-                # Per-file token cost
-                cost_str = ""
-                file_cost = 0.0
-                if use_ai and (f_tok_in + f_tok_out) > 0:
-                    pricing = PRICING.get(llm_model, {"in": 0, "out": 0})
-                    file_cost = (f_tok_in * pricing["in"] + f_tok_out * pricing["out"]) / 1_000_000
-                    cost_str = f"  |  {f_tok_in+f_tok_out:,} токенов  ${file_cost:.4f}"
-                print(f"    → {out_path.name} ✅  проблем: {issue_count}{ai_tag}{cost_str}")
-                ok_count += 1
-                # Collect for report
-                report_files.append({
-                    "file": f.name,
-                    "vendor": vendor,
-                    "total_rows": len(results),
-                    "ok": sum(1 for r in results if r == "OK"),
-                    "issues": issue_count,
-                    "tokens": f_tok_in + f_tok_out,
-                    "cost_usd": round(file_cost, 4),
-                    "results": results,
-                    "option_names": option_names,
-                })
-            else:
+                print(f"    ❌ {e}")
                 failed += 1
-        except Exception as e:
-            print(f"    ❌ {e}")
-            failed += 1
 
     print(f"\nГотово: {ok_count} обработано, {failed} ошибок.")
     if use_ai and (session_tok_in + session_tok_out) > 0:
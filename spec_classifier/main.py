@@ -5,17 +5,36 @@ Pipeline: Excel → parse → normalize → classify → artifacts + cleaned spe
 """
 
 import argparse
+import io
 import json
 import logging
+import multiprocessing
+import os
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack, redirect_stderr, redirect_stdout
 from datetime import datetime, timezone
 from pathlib import Path
 
 import yaml
 
 from src.rules.rules_engine import RuleSet
-from src.core.classifier import classify_row
+from src.rules.ruleset_registry import ruleset_registry
+from src.core.classifier import ClassificationTable, classification_memo, classify_row
+from src.core.classification_cache import ClassificationCache, DEFAULT_MAX_ENTRIES
+from src.core.parse_cache import DEFAULT_MAX_BYTES as DEFAULT_PARSE_CACHE_MAX_BYTES
+from src.core.parse_cache import ParseCache, ParsedInput
+from src.core.row_table import RowTable
+from src.core.workbook import excel_reader, open_workbook
 from src.diagnostics.run_manager import create_spec_folder, write_manifest
+from src.diagnostics.batch_manifest import (
+    BatchManifest,
+    config_hash,
+    file_sha256,
+    pipeline_code_version,
+    spec_artifacts,
+)
 from src.outputs.json_writer import (
     save_rows_raw,
     save_rows_normalized,
@@ -23,7 +42,9 @@ from src.outputs.json_writer import (
     save_unknown_rows,
     save_header_rows,
 )
-from src.diagnostics.stats_collector import collect_stats, save_run_summary, compute_file_hash
+from src.diagnostics.stats_collector import collect_stats, save_run_summary
+from src.diagnostics.stage_timer import StageTimer, aggregate_timings, save_batch_metrics
+from src.diagnostics.rule_profiler import PROFILE_FILENAME, RuleProfiler, merge_profiles, save_rule_profile
 from src.outputs.excel_writer import generate_cleaned_spec
 from src.outputs.annotated_writer import generate_annotated_source_excel
 from src.outputs.branded_spec_writer import generate_branded_spec
@@ -33,6 +54,7 @@ from src.vendors.hpe.adapter import HPEAdapter
 from src.vendors.lenovo.adapter import LenovoAdapter
 from src.vendors.huawei.adapter import HuaweiAdapter
 from src.vendors.xfusion.adapter import XFusionAdapter
+from src.vendors.detect import detect_vendor
 
 VENDOR_REGISTRY: dict[str, type] = {
     "dell": DellAdapter,
@@ -56,9 +78,19 @@ def _resolve_path(path: str, base: Path) -> Path:
     return p if p.is_absolute() else (base / p).resolve()
 
 
+# --vendor value that detects the vendor of each input file (src/vendors/detect.py).
+AUTO_VENDOR = "auto"
+
+
 # Default I/O roots when not in config (repo stays code-only; cwd-relative).
 DEFAULT_INPUT_ROOT = Path.cwd() / "input"
 DEFAULT_OUTPUT_ROOT = Path.cwd() / "output"
+# Persistent caches live in <temp_root>/<CACHE_DIRNAME> unless --cache-dir is given.
+CACHE_DIRNAME = "spec_classifier_cache"
+# Compiled rules snapshots (RuleSet.load snapshot_dir) live in <cache dir>/<RULES_SNAPSHOT_DIRNAME>.
+RULES_SNAPSHOT_DIRNAME = "rules"
+# Parsed and normalized rows (src/core/parse_cache.py) live in <cache dir>/<PARSE_CACHE_DIRNAME>.
+PARSE_CACHE_DIRNAME = "parsed"
 
 
 def _load_config(config_path: Path) -> dict:
@@ -81,6 +113,86 @@ def _load_config(config_path: Path) -> dict:
     return data
 
 
+def _cache_dir(args, config: dict, cwd: Path):
+    """
+    Directory of the on-disk caches (classification cache, rules snapshots), or None.
+    --cache-dir, else <temp_root>/spec_classifier_cache when temp_root is configured; --no-cache disables it.
+    """
+    if getattr(args, "no_cache", False):
+        return None
+    if getattr(args, "cache_dir", None):
+        return _resolve_path(args.cache_dir, cwd)
+    if config.get("temp_root"):
+        return _resolve_path(str(config["temp_root"]), cwd) / CACHE_DIRNAME
+    return None
+
+
+def _cache_max_entries(config: dict) -> int:
+    return int((config.get("cache") or {}).get("max_entries") or DEFAULT_MAX_ENTRIES)
+
+
+def _open_classification_cache(args, config: dict, cwd: Path):
+    """On-disk classification cache for this process (in _cache_dir), or None."""
+    cache_dir = _cache_dir(args, config, cwd)
+    if cache_dir is None:
+        return None
+    return ClassificationCache.open(cache_dir, max_entries=_cache_max_entries(config))
+
+
+def _open_parse_cache(cache_dir, config: dict):
+    """Parsed-rows cache in <cache_dir>/parsed (size limit: cache.parse_max_mb), or None."""
+    if cache_dir is None:
+        return None
+    max_mb = (config.get("cache") or {}).get("parse_max_mb")
+    max_bytes = int(max_mb * 1024 * 1024) if max_mb else DEFAULT_PARSE_CACHE_MAX_BYTES
+    return ParseCache(cache_dir / PARSE_CACHE_DIRNAME, max_bytes=max_bytes)
+
+
+def _save_batch_rule_profile(output_dir: Path, vendor: str, processed: list, log) -> None:
+    """Merge rule_profile.json of every processed file into SPLIT/<vendor>/rule_profile.json."""
+    vendor_dir = Path(output_dir) / "SPLIT" / vendor
+    profiles = []
+    for name in processed:
+        path = vendor_dir / Path(name).stem / PROFILE_FILENAME
+        if path.exists():
+            with open(path, encoding="utf-8") as f:
+                profiles.append(json.load(f))
+    if not profiles:
+        return
+    path = save_rule_profile(merge_profiles(profiles, vendor=vendor), vendor_dir)
+    log.info("Batch rule profile: %s", path)
+
+
+def _save_batch_metrics(output_dir: Path, outcomes: list, jobs: int, wall_s: float, log) -> None:
+    """
+    Aggregate the run_summary.json timings of the (status, vendor, input path) outcomes processed
+    in this run into batch_metrics.json; files --incremental left unchanged are only counted
+    (their timings are of an earlier run). Left as is when no file was processed or unchanged.
+    """
+    files = []
+    counts = {"processed": 0, "unchanged": 0}
+    for status, vendor, xlsx_path in outcomes:
+        if status == "unchanged":
+            counts["unchanged"] += 1
+        if status != "processed":
+            continue
+        path = Path(output_dir) / "SPLIT" / vendor / xlsx_path.stem / "run_summary.json"
+        try:
+            with open(path, encoding="utf-8") as f:
+                timings = json.load(f).get("timings")
+        except (OSError, ValueError):
+            continue
+        if timings:
+            files.append((vendor, timings))
+            counts["processed"] += 1
+    if not files and not counts["unchanged"]:
+        log.info("Batch metrics not written: no file processed with timings or unchanged")
+        return
+    metrics = aggregate_timings(files)
+    metrics = {"batch_wall_s": round(wall_s, 3), "jobs": jobs, **counts, **metrics}
+    log.info("Batch metrics: %s", save_batch_metrics(metrics, output_dir))
+
+
 def _build_golden_rows(normalized_rows, classification_results):
     """Build list of dicts for golden JSONL: source_row_index, row_kind, entity_type, state, matched_rule_id, device_type, hw_type, skus."""
     out = []
@@ -115,14 +227,29 @@ def _run_single(
     update_golden: bool = False,
     cwd: Path = None,
     log=None,
+    profile_rules: bool = False,
+    rules_snapshot_dir: Path = None,
+    adapter=None,
+    parse_cache: ParseCache = None,
+    timer: StageTimer = None,
 ) -> int:
-    """Run the full pipeline for one input file. Returns 0 on success, 1 on failure."""
+    """
+    Run the full pipeline for one input file. Returns 0 on success, 1 on failure.
+    profile_rules: write rule_profile.json (per-rule evaluations/hits/time) to the SPLIT folder.
+    rules_snapshot_dir: load rules through compiled snapshots in this directory (see RuleSet.load).
+    adapter: vendor adapter to reuse (batch mode); built from vendor and config when None.
+    parse_cache: take parsed / normalized rows from (and store them in) this cache.
+    timer: stage timings for run_summary.json "timings" (may already hold can_parse); a new one when None.
+    """
     if cwd is None:
         cwd = Path.cwd()
     if log is None:
         log = logging.getLogger(__name__)
+    if timer is None:
+        timer = StageTimer()
     try:
-        adapter = _get_adapter(vendor, config)
+        if adapter is None:
+            adapter = _get_adapter(vendor, config)
         # Create split_folder and ready_folder before first pipeline log so all stages are captured (OUT-002)
         split_folder = create_spec_folder(output_dir, "SPLIT", vendor, input_path.stem)
         ready_folder = create_spec_folder(output_dir, "READY", vendor, input_path.stem)
@@ -131,11 +258,35 @@ def _run_single(
         fh.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] %(message)s", datefmt="%Y-%m-%d %H:%M:%S"))
         root_logger = logging.getLogger()
         root_logger.addHandler(fh)
+        workbooks = ExitStack()
         try:
-            log.info("Parsing Excel: %s", input_path)
-            raw_rows, header_row_index = adapter.parse(str(input_path))
-            log.info("Normalizing rows (row_kind)...")
-            normalized_rows = adapter.normalize(raw_rows)
+            # One workbook session for parse and the annotated export (batch: also can_parse).
+            with timer.stage("read_workbook"):
+                session = workbooks.enter_context(open_workbook(input_path, reader=excel_reader(config, vendor)))
+            parsed = None
+            if parse_cache is not None:
+                parse_cache_before = parse_cache.stats()
+                with timer.stage("parse_cache"):
+                    parsed = parse_cache.get(session.sha256, adapter)
+            if parsed is not None:
+                log.info("Parsed rows from cache: %s", input_path)
+                raw_rows, header_row_index, sheet_name, normalized_rows = parsed
+            else:
+                log.info("Parsing Excel: %s", input_path)
+                with timer.stage("parse") as stage:
+                    raw_rows, header_row_index = adapter.parse(str(input_path))
+                    sheet_name = adapter.get_source_sheet_name()
+                    if not isinstance(raw_rows, RowTable):
+                        # Columnar from here on: the parser's list of dicts is released.
+                        raw_rows = RowTable(dict, raw_rows)
+                    stage["rows"] = len(raw_rows)
+                log.info("Normalizing rows (row_kind)...")
+                with timer.stage("normalize", rows=len(raw_rows)):
+                    normalized_rows = adapter.normalize(raw_rows)
+                if parse_cache is not None:
+                    parse_cache.put(
+                        session.sha256, adapter, ParsedInput(raw_rows, header_row_index, sheet_name, normalized_rows)
+                    )
 
             rules_file = adapter.get_rules_file()
             rules_path = _resolve_path(rules_file, cwd)
@@ -143,43 +294,85 @@ def _run_single(
                 print(f"Error: Rules file not found: {rules_path}", file=sys.stderr)
                 return 1
             log.info("Loading rules: %s", rules_path)
-            ruleset = RuleSet.load(str(rules_path))
+            profiler = RuleProfiler() if profile_rules else None
+            with timer.stage("rules_load"):
+                if profiler is not None:
+                    ruleset = RuleSet.load(str(rules_path), profiler=profiler)
+                else:
+                    # Loaded once per process and rules file; reloaded if the file changes.
+                    ruleset = ruleset_registry.get(rules_path, snapshot_dir=rules_snapshot_dir)
+            cache = classification_memo.store
+            if cache is not None:
+                cache.bind_rules(str(rules_path), ruleset.fingerprint)
+                cache_before = cache.stats()
 
             log.info("Classifying rows...")
-            classification_results = [classify_row(r, ruleset) for r in normalized_rows]
+            memo_before = classification_memo.stats()
+            rows = len(normalized_rows)
+            with timer.stage("classify", rows=rows):
+                if profiler is not None:
+                    # Row by row, without memo/cache: every row is evaluated against the rules.
+                    classification_results = ClassificationTable(classify_row(r, ruleset) for r in normalized_rows)
+                else:
+                    classification_results = ClassificationTable(
+                        classification_memo.classify_rows(normalized_rows, ruleset)
+                    )
+                if cache is not None:
+                    cache.flush()
 
             log.info("Saving artifacts to %s", split_folder)
-            save_rows_raw(raw_rows, split_folder)
-            save_rows_normalized(normalized_rows, split_folder)
-            save_classification(classification_results, normalized_rows, split_folder)
-            save_unknown_rows(normalized_rows, classification_results, split_folder)
-            save_header_rows(normalized_rows, split_folder)
+            with timer.stage("rows_raw", rows=len(raw_rows)):
+                save_rows_raw(raw_rows, split_folder)
+            with timer.stage("rows_normalized", rows=rows):
+                save_rows_normalized(normalized_rows, split_folder)
+            with timer.stage("classification", rows=rows):
+                save_classification(classification_results, normalized_rows, split_folder)
+            with timer.stage("unknown_rows", rows=rows):
+                save_unknown_rows(normalized_rows, classification_results, split_folder)
+            with timer.stage("header_rows", rows=rows):
+                save_header_rows(normalized_rows, split_folder)
 
             stats = collect_stats(classification_results)
-            stats["rules_file_hash"] = compute_file_hash(str(rules_path))
+            stats["rules_file_hash"] = ruleset.fingerprint
             stats["input_file"] = input_path.name
             stats["run_timestamp"] = datetime.now(timezone.utc).replace(microsecond=0).isoformat()
 
             stats["vendor_stats"] = adapter.get_vendor_stats(normalized_rows)
-
-            save_run_summary(stats, split_folder)
-
-            generate_cleaned_spec(normalized_rows, classification_results, config, split_folder)
-            sheet_name = adapter.get_source_sheet_name()
-            generate_annotated_source_excel(
-                raw_rows, normalized_rows, classification_results, input_path, split_folder,
-                header_row_index=header_row_index,
-                sheet_name=sheet_name,
-                extra_cols=adapter.get_extra_cols(),
-            )
+            stats["classification_memo"] = classification_memo.stats(since=memo_before)
+            if cache is not None:
+                stats["classification_cache"] = cache.stats(since=cache_before)
+            if parse_cache is not None:
+                stats["parse_cache"] = parse_cache.stats(since=parse_cache_before)
+
+            if profiler is not None:
+                with timer.stage("rule_profile"):
+                    save_rule_profile(
+                        profiler.to_dict(
+                            input_file=input_path.name,
+                            rules_file=rules_path.name,
+                            rules_file_hash=stats["rules_file_hash"],
+                        ),
+                        split_folder,
+                    )
+
+            with timer.stage("cleaned_spec", rows=rows):
+                generate_cleaned_spec(normalized_rows, classification_results, config, split_folder)
+            with timer.stage("annotated_source", rows=rows):
+                generate_annotated_source_excel(
+                    raw_rows, normalized_rows, classification_results, input_path, split_folder,
+                    header_row_index=header_row_index,
+                    sheet_name=sheet_name,
+                    extra_cols=adapter.get_extra_cols(),
+                )
             if adapter.generates_branded_spec():
                 branded_path = ready_folder / f"Коммерческое предложение_{input_path.stem}.xlsx"
-                generate_branded_spec(
-                    normalized_rows=normalized_rows,
-                    classification_results=classification_results,
-                    source_filename=input_path.name,
-                    output_path=branded_path,
-                )
+                with timer.stage("branded_spec", rows=rows):
+                    generate_branded_spec(
+                        normalized_rows=normalized_rows,
+                        classification_results=classification_results,
+                        source_filename=input_path.name,
+                        output_path=branded_path,
+                    )
 
             log.info("Done.")
 
@@ -196,14 +389,18 @@ def _run_single(
                     if answer != "y":
                         log.info("Golden not updated (skipped or non-interactive).")
                     else:
-                        golden_rows = _build_golden_rows(normalized_rows, classification_results)
-                        _save_golden(golden_rows, golden_path)
+                        with timer.stage("golden", rows=rows):
+                            _save_golden(_build_golden_rows(normalized_rows, classification_results), golden_path)
                         log.info("Golden updated: %s", golden_path)
                 else:
-                    golden_rows = _build_golden_rows(normalized_rows, classification_results)
-                    _save_golden(golden_rows, golden_path)
+                    with timer.stage("golden", rows=rows):
+                        _save_golden(_build_golden_rows(normalized_rows, classification_results), golden_path)
                     log.info("Golden saved: %s", golden_path)
 
+            # Written last, so "timings" covers every stage above.
+            stats["timings"] = timer.to_dict()
+            save_run_summary(stats, split_folder)
+
             print("Summary:")
             print(f"  total_rows: {stats['total_rows']}")
             print(f"  header_rows_count: {stats['header_rows_count']}")
@@ -212,6 +409,7 @@ def _run_single(
             print(f"  unknown_count: {stats['unknown_count']}")
             print(f"  split_folder: {split_folder}")
         finally:
+            workbooks.close()
             root_logger.removeHandler(fh)
             fh.close()
 
@@ -228,6 +426,193 @@ def _run_single(
     return 0
 
 
+def _configure_logging(handler: logging.Handler = None) -> None:
+    """Root logger at INFO, to stderr or (replacing the handlers already set up) to handler."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+        handlers=None if handler is None else [handler],
+        force=handler is not None,
+    )
+
+
+class _CurrentStderrHandler(logging.StreamHandler):
+    """Writes to sys.stderr as it is when a record is emitted, so redirect_stderr captures it."""
+
+    @property
+    def stream(self):
+        return sys.stderr
+
+    @stream.setter
+    def stream(self, value) -> None:
+        pass
+
+
+# Settings shared by every file of a batch (_init_batch); a --jobs worker process gets its own copy.
+_batch: dict = {}
+
+
+def _init_batch(settings: dict, worker: bool = False) -> None:
+    """
+    Set up batch processing in this process: adapters for settings["vendors"], and (worker)
+    console logging into the stderr _batch_file captures per file, and the on-disk
+    classification cache, which a worker opens itself — an SQLite connection must not cross
+    a fork.
+    """
+    _batch.clear()
+    _batch.update(settings)
+    _batch["adapters"] = {v: _get_adapter(v, settings["config"]) for v in settings["vendors"]}
+    if worker:
+        # A forked worker inherits the parent's handler, bound to the real stderr.
+        _configure_logging(_CurrentStderrHandler())
+        classification_memo.store = (
+            ClassificationCache.open(settings["cache_dir"], max_entries=settings["cache_max_entries"])
+            if settings["cache_dir"] is not None else None
+        )
+
+
+def _preload_rulesets(adapters: dict, cwd: Path, snapshot_dir) -> None:
+    """Load every adapter's rules into ruleset_registry, so forked workers share them copy-on-write."""
+    for adapter in adapters.values():
+        rules_path = _resolve_path(adapter.get_rules_file(), cwd)
+        if rules_path.exists():
+            ruleset_registry.get(rules_path, snapshot_dir=snapshot_dir)
+
+
+def _batch_file(xlsx_path: Path, capture: bool = False) -> tuple:
+    """
+    Detect / check the vendor of one batch file and run the pipeline on it.
+    Returns (status, vendor, stdout, stderr, sha256): status "processed", "skipped" or "failed";
+    stdout and stderr are the file's output (console log included) when capture is set (--jobs:
+    printed by the parent in file order), else "" (printed as it goes); sha256 is the input's
+    hash from its workbook session when --incremental records it in the manifest, else None.
+    """
+    out = io.StringIO()
+    err = io.StringIO()
+    with ExitStack() as stack:
+        if capture:
+            stack.enter_context(redirect_stdout(out))
+            stack.enter_context(redirect_stderr(err))
+        status, vendor, sha256 = _batch_file_status(xlsx_path)
+    return status, vendor, out.getvalue(), err.getvalue(), sha256
+
+
+def _batch_file_status(xlsx_path: Path) -> tuple:
+    log = logging.getLogger(__name__)
+    config = _batch["config"]
+    adapters = _batch["adapters"]
+    timer = StageTimer(trace_memory=_batch["trace_memory"])
+    timer.start()
+    with ExitStack() as workbooks:
+        workbooks.callback(timer.stop)
+        try:
+            with timer.stage("can_parse"):
+                session = workbooks.enter_context(
+                    open_workbook(xlsx_path, reader=excel_reader(config, _batch["vendor"]))
+                )
+                if _batch["vendor"] == AUTO_VENDOR:
+                    vendor = detect_vendor(xlsx_path, adapters)
+                else:
+                    vendor = _batch["vendor"] if adapters[_batch["vendor"]].can_parse(str(xlsx_path)) else None
+            if vendor is None:
+                if _batch["vendor"] == AUTO_VENDOR:
+                    log.warning("Skipping %s: no vendor signature matched", xlsx_path.name)
+                    return "skipped", None, None
+                log.warning("Skipping %s: not a %s file", xlsx_path.name, _batch["vendor"])
+                return "skipped", _batch["vendor"], None
+            if _batch["vendor"] == AUTO_VENDOR:
+                log.info("Detected vendor %s: %s", vendor, xlsx_path.name)
+        except Exception as e:
+            log.error("Failed to read %s: %s", xlsx_path.name, e)
+            return "failed", None, None
+
+        log.info("--- Batch: processing %s ---", xlsx_path.name)
+        code = _run_single(
+            input_path=xlsx_path,
+            config=config,
+            config_path=_batch["config_path"],
+            output_dir=_batch["output_dir"],
+            vendor=vendor,
+            save_golden=_batch["save_golden"],
+            update_golden=_batch["update_golden"],
+            cwd=_batch["cwd"],
+            log=log,
+            profile_rules=_batch["profile_rules"],
+            rules_snapshot_dir=_batch["rules_snapshot_dir"],
+            adapter=adapters[vendor],
+            parse_cache=_batch["parse_cache"],
+            timer=timer,
+        )
+        sha256 = session.sha256 if code == 0 and _batch["incremental"] else None
+        return ("processed" if code == 0 else "failed"), vendor, sha256
+
+
+def _manifest_fingerprint(vendor: str, input_sha256: str, rules_file_hash: str, config_digest: str,
+                          profile_rules: bool) -> dict:
+    """What a batch input's artifacts depend on (see src/diagnostics/batch_manifest.py)."""
+    return {
+        "input_sha256": input_sha256,
+        "vendor": vendor,
+        "rules_file_hash": rules_file_hash,
+        "config_hash": config_digest,
+        "code_version": pipeline_code_version(),
+        "profile_rules": profile_rules,
+    }
+
+
+def _unchanged_inputs(xlsx_files: list, manifest: BatchManifest, vendor_arg: str,
+                      config_digest: str, profile_rules: bool, cwd: Path) -> dict:
+    """
+    {path: vendor} of the inputs whose manifest fingerprint still holds and whose artifacts
+    exist. Only inputs recorded for a vendor of this run are hashed.
+    """
+    rules_hashes: dict = {}
+    unchanged = {}
+    for xlsx_path in xlsx_files:
+        entry = manifest.get(xlsx_path)
+        vendor = (entry or {}).get("fingerprint", {}).get("vendor")
+        if vendor not in _batch["adapters"] or (vendor_arg != AUTO_VENDOR and vendor != vendor_arg):
+            continue
+        if vendor not in rules_hashes:
+            rules_path = _resolve_path(_batch["adapters"][vendor].get_rules_file(), cwd)
+            rules_hashes[vendor] = file_sha256(rules_path) if rules_path.exists() else None
+        fingerprint = _manifest_fingerprint(
+            vendor, file_sha256(xlsx_path), rules_hashes[vendor], config_digest, profile_rules
+        )
+        if manifest.is_current(xlsx_path, fingerprint):
+            unchanged[xlsx_path] = vendor
+    return unchanged
+
+
+def _record_in_manifest(manifest: BatchManifest, xlsx_path: Path, vendor: str, input_sha256: str,
+                        config_digest: str, profile_rules: bool) -> None:
+    """Record a processed input with the rules hash its run_summary.json reports and its artifacts."""
+    spec = xlsx_path.stem
+    try:
+        with open(Path(manifest.output_root) / "SPLIT" / vendor / spec / "run_summary.json", encoding="utf-8") as f:
+            rules_file_hash = json.load(f).get("rules_file_hash")
+    except (OSError, ValueError):
+        manifest.forget(xlsx_path)
+        return
+    fingerprint = _manifest_fingerprint(vendor, input_sha256, rules_file_hash, config_digest, profile_rules)
+    manifest.record(xlsx_path, fingerprint, spec_artifacts(manifest.output_root, vendor, spec))
+
+
+def _batch_pool(jobs: int, settings: dict) -> ProcessPoolExecutor:
+    """
+    Pool of jobs worker processes for _batch_file. Forked where the platform allows, so the
+    rulesets preloaded in the parent are shared copy-on-write; spawned workers load them once each.
+    """
+    method = "fork" if "fork" in multiprocessing.get_all_start_methods() else None
+    return ProcessPoolExecutor(
+        max_workers=jobs,
+        mp_context=multiprocessing.get_context(method),
+        initializer=_init_batch,
+        initargs=(settings, True),
+    )
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(
         description="Spec Classifier — classify Excel/CCW spec (Dell, Cisco), write artifacts and cleaned spec.",
@@ -239,7 +624,12 @@ def main() -> int:
         help="Process all .xlsx files in this directory (batch mode). "
         "Creates per-run folders + a TOTAL aggregation folder.",
     )
-    parser.add_argument("--vendor", choices=list(VENDOR_REGISTRY), default="dell", help="Vendor adapter (default: dell)")
+    parser.add_argument(
+        "--vendor",
+        choices=list(VENDOR_REGISTRY) + [AUTO_VENDOR],
+        default="dell",
+        help="Vendor adapter (default: dell); 'auto' detects the vendor of each file from its workbook signature",
+    )
     parser.add_argument("--config", default="config.yaml", help="Path to config YAML (default: config.yaml)")
     parser.add_argument(
         "--output-dir",
@@ -253,17 +643,48 @@ def main() -> int:
     )
     parser.add_argument("--save-golden", action="store_true", help="Run pipeline and save golden/<stem>_expected.jsonl")
     parser.add_argument("--update-golden", action="store_true", help="Run pipeline and overwrite golden after confirmation (y/n)")
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help="Directory of the on-disk classification cache and rules snapshots "
+        "(default: <temp_root>/spec_classifier_cache when temp_root is configured)",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Do not use the on-disk classification cache or rules snapshots"
+    )
+    parser.add_argument(
+        "--profile-rules",
+        action="store_true",
+        help="Write rule_profile.json (evaluations, hits, time per rule_id) per file, merged per vendor in batch mode",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Batch mode: process up to N files at once in worker processes (default: 1; 0 = one per CPU)",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Batch mode: skip inputs whose file, rules, config and pipeline code are unchanged since the run "
+        "recorded in <output-dir>/.teresa_manifest.json and whose artifacts still exist",
+    )
+    parser.add_argument(
+        "--trace-memory",
+        action="store_true",
+        help="Trace allocations (tracemalloc) per file and report the peak in run_summary.json timings; slower",
+    )
     args = parser.parse_args()
 
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s [%(levelname)s] %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
-    )
+    _configure_logging()
     log = logging.getLogger(__name__)
 
     cwd = Path.cwd()
     config_path = _resolve_path(args.config, cwd)
+    if args.jobs < 0:
+        print(f"Error: --jobs must be >= 0, got {args.jobs}", file=sys.stderr)
+        return 1
+    jobs = args.jobs or os.cpu_count() or 1
 
     try:
         config = _load_config(config_path)
@@ -282,6 +703,11 @@ def main() -> int:
     )
     output_dir = Path(output_dir_raw) if Path(output_dir_raw).is_absolute() else _resolve_path(output_dir_raw, cwd)
     write_manifest(output_dir)
+    # Second level behind the in-process memo; entries are flushed after each file.
+    classification_memo.store = _open_classification_cache(args, config, cwd)
+    cache_dir = _cache_dir(args, config, cwd)
+    rules_snapshot_dir = cache_dir / RULES_SNAPSHOT_DIRNAME if cache_dir is not None else None
+    parse_cache = _open_parse_cache(cache_dir, config)
 
     # Batch mode: --batch-dir <path> or --batch (use input_root from config or default)
     if args.batch_dir:
@@ -302,44 +728,117 @@ def main() -> int:
             return 1
 
         log.info("Batch mode: %d files, output_root: %s", len(xlsx_files), output_dir)
+        batch_start = time.perf_counter()
+
+        # One adapter per vendor for the whole batch (auto: every vendor, for detection).
+        vendors = list(VENDOR_REGISTRY) if args.vendor == AUTO_VENDOR else [args.vendor]
+        settings = {
+            "vendors": vendors,
+            "vendor": args.vendor,
+            "config": config,
+            "config_path": config_path,
+            "output_dir": output_dir,
+            "save_golden": getattr(args, "save_golden", False),
+            "update_golden": getattr(args, "update_golden", False),
+            "cwd": cwd,
+            "profile_rules": args.profile_rules,
+            "rules_snapshot_dir": rules_snapshot_dir,
+            "parse_cache": parse_cache,
+            "cache_dir": cache_dir if classification_memo.store is not None else None,
+            "cache_max_entries": _cache_max_entries(config),
+            "trace_memory": args.trace_memory,
+        }
+        incremental = args.incremental and not (settings["save_golden"] or settings["update_golden"])
+        if args.incremental and not incremental:
+            log.warning("--incremental ignored with --save-golden / --update-golden: every file is processed")
+        settings["incremental"] = incremental
+        _init_batch(settings)
+
+        # The manifest is read and written only by --incremental runs; processed inputs are
+        # recorded with the hash their worker's workbook session computed.
+        unchanged = {}
+        if incremental:
+            manifest = BatchManifest.load(output_dir)
+            config_digest = config_hash(config)
+            unchanged = _unchanged_inputs(
+                xlsx_files, manifest, args.vendor, config_digest, args.profile_rules, cwd
+            )
+            for xlsx_path in unchanged:
+                log.info("Unchanged since the last run, skipping: %s", xlsx_path.name)
+        todo = [p for p in xlsx_files if p not in unchanged]
+
+        jobs = min(jobs, len(todo)) or 1
+        if jobs > 1 and settings["update_golden"]:
+            print("Error: --update-golden asks for confirmation per file; it cannot run with --jobs", file=sys.stderr)
+            return 1
+        outcomes = {p: ("unchanged", vendor) for p, vendor in unchanged.items()}
+        input_hashes: dict = {}
+        if jobs > 1:
+            log.info("Batch: %d worker processes", jobs)
+            _preload_rulesets(_batch["adapters"], cwd, rules_snapshot_dir)
+            # Workers open their own connection to the on-disk classification cache.
+            if classification_memo.store is not None:
+                classification_memo.store.close()
+                classification_memo.store = None
+            with _batch_pool(jobs, settings) as pool:
+                futures = [pool.submit(_batch_file, xlsx_path, True) for xlsx_path in todo]
+                # In file order, whatever order the workers finish in.
+                for xlsx_path, future in zip(todo, futures):
+                    try:
+                        status, vendor, output, errors, sha256 = future.result()
+                    except Exception as e:
+                        log.error("Worker failed on %s: %s", xlsx_path.name, e)
+                        status, vendor, output, errors, sha256 = "failed", None, "", "", None
+                    sys.stdout.write(output)
+                    sys.stdout.flush()
+                    sys.stderr.write(errors)
+                    sys.stderr.flush()
+                    outcomes[xlsx_path] = (status, vendor)
+                    input_hashes[xlsx_path] = sha256
+        else:
+            for xlsx_path in todo:
+                status, vendor, _, _, input_hashes[xlsx_path] = _batch_file(xlsx_path)
+                outcomes[xlsx_path] = (status, vendor)
 
-        adapter = _get_adapter(args.vendor, config)
         processed = []
+        processed_by_vendor: dict = {}
         skipped = []
         failed = []
         for xlsx_path in xlsx_files:
-            try:
-                if not adapter.can_parse(str(xlsx_path)):
-                    log.warning("Skipping %s: not a %s file", xlsx_path.name, args.vendor)
-                    skipped.append(xlsx_path.name)
-                    continue
-            except Exception as e:
-                log.error("Failed to read %s: %s", xlsx_path.name, e)
-                failed.append(xlsx_path.name)
-                continue
-
-            log.info("--- Batch: processing %s ---", xlsx_path.name)
-            code = _run_single(
-                input_path=xlsx_path,
-                config=config,
-                config_path=config_path,
-                output_dir=output_dir,
-                vendor=args.vendor,
-                save_golden=getattr(args, "save_golden", False),
-                update_golden=getattr(args, "update_golden", False),
-                cwd=cwd,
-                log=log,
-            )
-            if code == 0:
-                processed.append(xlsx_path.name)
+            status, vendor = outcomes[xlsx_path]
+            if status in ("processed", "unchanged"):
+                if status == "processed":
+                    processed.append(xlsx_path.name)
+                    if incremental:
+                        _record_in_manifest(
+                            manifest, xlsx_path, vendor, input_hashes[xlsx_path], config_digest, args.profile_rules,
+                        )
+                processed_by_vendor.setdefault(vendor, []).append(xlsx_path.name)
+            elif status == "skipped":
+                skipped.append(xlsx_path.name)
             else:
                 failed.append(xlsx_path.name)
-
-        log.info(
-            "Batch complete: %d processed, %d skipped, %d failed",
-            len(processed), len(skipped), len(failed),
+                if incremental:
+                    manifest.forget(xlsx_path)
+        if incremental and todo:
+            try:
+                manifest.save()
+            except OSError as e:
+                log.warning("Cannot write batch manifest %s: %s", manifest.path, e)
+
+        if args.profile_rules:
+            for vendor, names in processed_by_vendor.items():
+                _save_batch_rule_profile(output_dir, vendor, names, log)
+        _save_batch_metrics(
+            output_dir, [(*outcomes[p], p) for p in xlsx_files],
+            jobs, time.perf_counter() - batch_start, log,
         )
-        print(f"Batch complete: {len(processed)} processed, {len(skipped)} skipped, {len(failed)} failed. Output: {output_dir}")
+
+        counts = f"{len(processed)} processed, {len(skipped)} skipped, {len(failed)} failed"
+        if incremental:
+            counts += f", {len(unchanged)} unchanged"
+        log.info("Batch complete: %s", counts)
+        print(f"Batch complete: {counts}. Output: {output_dir}")
         return 1 if len(failed) > 0 else 0
 
     if not args.input:
@@ -351,17 +850,43 @@ def main() -> int:
         print(f"Error: Input file not found: {input_path}", file=sys.stderr)
         return 1
 
-    return _run_single(
-        input_path=input_path,
-        config=config,
-        config_path=config_path,
-        output_dir=output_dir,
-        vendor=args.vendor,
-        save_golden=getattr(args, "save_golden", False),
-        update_golden=getattr(args, "update_golden", False),
-        cwd=cwd,
-        log=log,
-    )
+    vendor, adapter = args.vendor, None
+    timer = StageTimer(trace_memory=args.trace_memory)
+    timer.start()
+    with ExitStack() as workbooks:
+        workbooks.callback(timer.stop)
+        if vendor == AUTO_VENDOR:
+            # Detection and the run share one workbook session (and the detecting adapter).
+            adapters = {v: _get_adapter(v, config) for v in VENDOR_REGISTRY}
+            try:
+                with timer.stage("can_parse"):
+                    workbooks.enter_context(open_workbook(input_path, reader=excel_reader(config, vendor)))
+                    vendor = detect_vendor(input_path, adapters)
+            except Exception as e:
+                print(f"Error: Failed to read {input_path.name}: {e}", file=sys.stderr)
+                return 1
+            if vendor is None:
+                print(f"Error: no vendor signature matched {input_path.name}; pass --vendor explicitly", file=sys.stderr)
+                return 1
+            log.info("Detected vendor %s: %s", vendor, input_path.name)
+            adapter = adapters[vendor]
+
+        return _run_single(
+            input_path=input_path,
+            config=config,
+            config_path=config_path,
+            output_dir=output_dir,
+            vendor=vendor,
+            save_golden=getattr(args, "save_golden", False),
+            update_golden=getattr(args, "update_golden", False),
+            cwd=cwd,
+            log=log,
+            profile_rules=args.profile_rules,
+            rules_snapshot_dir=rules_snapshot_dir,
+            adapter=adapter,
+            parse_cache=parse_cache,
+            timer=timer,
+        )
 
 
 if __name__ == "__main__":
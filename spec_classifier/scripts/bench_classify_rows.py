@@ -0,0 +1,129 @@
+"""
+Benchmark: classify_row per row vs classify_rows over the whole column.
+
+Each size is run twice:
+  sampled  — rows drawn with repetition (as in real specs) from rows_normalized.json files
+             of earlier runs (--rows-json), or from a built-in synthetic Dell-like pool of
+             2000 rows; most of this speedup is classify_rows classifying equal rows once;
+  distinct — no two rows with equal fields (synthetic: every option name unique; --rows-json:
+             the pool's distinct rows, at most size), which leaves only the columnar rule
+             passes.
+Both paths must return equal results; the script exits 1 if they differ.
+
+Usage (from spec_classifier/):
+    python scripts/bench_classify_rows.py
+    python scripts/bench_classify_rows.py --rules rules/dell_rules.yaml \
+        --rows-json "C:/.../OUTPUT/SPLIT/dell/*/rows_normalized.json" --sizes 1000 10000 100000
+"""
+
+import argparse
+import glob
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.core.classifier import classify_row, classify_rows  # noqa: E402
+from src.core.normalizer import NormalizedRow, RowKind  # noqa: E402
+from src.rules.rules_engine import RuleSet  # noqa: E402
+
+_MODULES = [
+    "Base", "Processor", "Memory Capacity", "Hard Drives", "RAID Controller", "Network Adapter",
+    "Power Supply", "Rack Rails", "Bezel", "Fans", "Trusted Platform Module", "Dell Services:Extended Service",
+    "Shipping", "Operating System", "Embedded Systems Management", "Boot Optimized Storage Cards", "",
+]
+_OPTIONS = [
+    "PowerEdge R760 Server", "Intel Xeon Gold {n}Y 2.8G, 16C/32T", "{n}GB RDIMM, 5600MT/s, Dual Rank",
+    "{n}TB SSD SATA Read Intensive 6Gbps 512 2.5in Hot-plug", "No Hard Drive", "PERC H755 Controller Card",
+    "Broadcom 57414 Dual Port 10/25GbE SFP28, OCP NIC 3.0", "Dual, Hot-Plug, Power Supply Redundant (1+1), {n}W",
+    "ReadyRails Sliding Rails With Cable Management Arm", "No Bezel", "High Performance Fan x{n}",
+    "Trusted Platform Module 2.0 V3", "ProSupport and Next Business Day Onsite Service, {n} Month(s)",
+    "PowerEdge R760 Shipping", "No Operating System", "iDRAC9, Enterprise 16G", "BOSS-N1 controller card",
+    "Jumper Cord - C13/C14, 0.6M, 250V, 10A", "Blank", "Unconfigured RAID",
+]
+
+
+def _row(index: int, module_name: str, option_name: str, skus: list, row_kind: str = "ITEM") -> NormalizedRow:
+    return NormalizedRow(
+        source_row_index=index,
+        row_kind=RowKind(row_kind),
+        group_name=None,
+        group_id=None,
+        product_name=None,
+        module_name=module_name,
+        option_name=option_name,
+        option_id=None,
+        skus=skus,
+        qty=1,
+        option_price=0.0,
+    )
+
+
+def _synthetic_pool(rng: random.Random, size: int = 2000) -> list:
+    pool = [_row(0, "", "", [], "HEADER")]
+    while len(pool) < size:
+        option = rng.choice(_OPTIONS).format(n=rng.choice([1, 2, 4, 8, 16, 32, 36, 64, 800, 1100, 6526]))
+        pool.append(_row(0, rng.choice(_MODULES), option, [f"{rng.randint(100, 999)}-{rng.randint(1000, 9999)}"]))
+    return pool
+
+
+def _distinct_synthetic(rng: random.Random, size: int) -> list:
+    return [
+        _row(0, rng.choice(_MODULES), f"{rng.choice(_OPTIONS).format(n=i)} {i}", [f"{i:09d}"])
+        for i in range(size)
+    ]
+
+
+def _distinct(pool: list, size: int) -> list:
+    seen = {}
+    for r in pool:
+        seen.setdefault((r.row_kind, r.module_name, r.option_name, tuple(r.skus)), r)
+    return list(seen.values())[:size]
+
+
+def _pool_from_json(pattern: str) -> list:
+    pool = []
+    for path in sorted(glob.glob(pattern)):
+        with open(path, encoding="utf-8") as f:
+            for d in json.load(f):
+                pool.append(_row(0, d.get("module_name") or "", d.get("option_name") or "", d.get("skus") or [], d["row_kind"]))
+    return pool
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark classify_row vs classify_rows")
+    parser.add_argument("--rules", default="rules/dell_rules.yaml")
+    parser.add_argument("--rows-json", default=None, help="Glob of rows_normalized.json files to sample rows from")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    ruleset = RuleSet.load(args.rules)
+    pool = _pool_from_json(args.rows_json) if args.rows_json else _synthetic_pool(rng)
+    if not pool:
+        print(f"Error: no rows found for {args.rows_json}", file=sys.stderr)
+        return 1
+
+    print(f"{'rows':>8} {'mode':>9} {'per-row s':>10} {'columnar s':>11} {'speedup':>8}")
+    for size in args.sizes:
+        sampled = [rng.choice(pool) for _ in range(size)]
+        distinct = _distinct(pool, size) if args.rows_json else _distinct_synthetic(rng, size)
+        for mode, rows in (("sampled", sampled), ("distinct", distinct)):
+            t0 = time.perf_counter()
+            expected = [classify_row(r, ruleset) for r in rows]
+            t1 = time.perf_counter()
+            actual = classify_rows(rows, ruleset)
+            t2 = time.perf_counter()
+            if actual != expected:
+                print(f"Error: classify_rows differs from classify_row at {len(rows)} {mode} rows", file=sys.stderr)
+                return 1
+            print(f"{len(rows):>8} {mode:>9} {t1 - t0:>10.3f} {t2 - t1:>11.3f} {(t1 - t0) / max(t2 - t1, 1e-9):>7.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+"""
+Benchmark: peak memory of parse → normalize → classify → JSON artifacts with lists of rows
+vs RowTable.
+
+A synthetic Dell spec (--rows rows, default 100000; written once to --xlsx, default a temp
+file) goes through the pipeline twice under tracemalloc:
+  list   — a list of row dicts from the DataFrame and a list of NormalizedRow, as before;
+  table  — DellAdapter.parse() and .normalize(), which fill RowTables directly (main.py).
+Peak is the highest traced allocation from parse to the end of rows_raw.json /
+rows_normalized.json; held is what the rows and classification take once classified (they
+are kept for the writers). Both modes must give equal normalized rows and classification;
+the script exits 1 if not.
+
+Usage (from spec_classifier/):
+    python scripts/bench_row_table.py
+    python scripts/bench_row_table.py --rows 250000 --xlsx /tmp/dell_250k.xlsx
+"""
+
+import argparse
+import gc
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import openpyxl
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.core.classifier import ClassificationMemo, ClassificationTable  # noqa: E402
+from src.core.normalizer import normalize_row  # noqa: E402
+from src.core.parser import find_header_row  # noqa: E402
+from src.core.workbook import iter_records, open_workbook  # noqa: E402
+from src.outputs.json_writer import save_rows_normalized, save_rows_raw  # noqa: E402
+from src.rules.rules_engine import RuleSet  # noqa: E402
+from src.vendors.dell.adapter import DellAdapter  # noqa: E402
+
+_HEADER = ["Group Name", "Group ID", "Product Name", "Module Name", "Option Name", "Option ID", "SKUs", "Qty",
+           "Option List Price"]
+_MODULES = ["Base", "Processor", "Memory Capacity", "Hard Drives", "RAID Controller", "Network Adapter",
+            "Power Supply", "Rack Rails", "Bezel", "Fans", "Trusted Platform Module", "Shipping", None]
+_OPTIONS = ["PowerEdge R760 Server", "Intel Xeon Gold {n}Y 2.8G, 16C/32T", "{n}GB RDIMM, 5600MT/s, Dual Rank",
+            "{n}TB SSD SATA Read Intensive 6Gbps 512 2.5in Hot-plug", "PERC H755 Controller Card",
+            "Dual, Hot-Plug, Power Supply Redundant (1+1), {n}W", "No Bezel", "High Performance Fan x{n}",
+            "ProSupport and Next Business Day Onsite Service, {n} Month(s)", "iDRAC9, Enterprise 16G"]
+
+
+def _write_spec(path: Path, rows: int, seed: int) -> None:
+    rng = random.Random(seed)
+    # SKUs repeat across a spec's configurations, as option names do.
+    catalog = [f"{rng.randint(100, 999)}-{rng.randint(1000, 9999)}" for _ in range(2000)]
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet("Sheet1")
+    ws.append(["Solution Configurator export"])
+    ws.append([])
+    ws.append(_HEADER)
+    for i in range(rows):
+        group = i // 500 + 1
+        if i % 40 == 39:
+            ws.append([])
+            continue
+        option = rng.choice(_OPTIONS).format(n=rng.choice([1, 2, 8, 16, 32, 64, 800, 1100]))
+        sku = rng.choice(catalog) if rng.random() < 0.7 else None
+        ws.append([f"G{group}", str(group), "PowerEdge R760", rng.choice(_MODULES), option, None, sku,
+                   rng.choice([1, 1, 2, 4]), rng.choice([0, 10, 125.5])])
+    wb.save(path)
+
+
+def _parse_to_list(path: Path) -> list:
+    """parse_excel as it was before RowTable: one dict per row in a list."""
+    header_row_index = find_header_row(str(path))
+    with open_workbook(path) as session:
+        df = session.dataframe(0, header=header_row_index)
+    rows = []
+    for pandas_idx, row_dict in enumerate(iter_records(df)):
+        row_dict["__row_index__"] = pandas_idx + header_row_index + 2
+        rows.append(row_dict)
+    return rows
+
+
+def _run(mode: str, path: Path, ruleset: RuleSet, out_dir: Path) -> tuple:
+    """(seconds, peak bytes, held bytes, normalized rows, classification) for one mode."""
+    adapter = DellAdapter()
+    gc.collect()
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    t0 = time.perf_counter()
+    if mode == "table":
+        raw_rows, _ = adapter.parse(str(path))
+        normalized = adapter.normalize(raw_rows)
+    else:
+        raw_rows = _parse_to_list(path)
+        normalized = [normalize_row(r) for r in raw_rows]
+    results = ClassificationTable(ClassificationMemo().classify_rows(normalized, ruleset))
+    gc.collect()
+    held = tracemalloc.get_traced_memory()[0]
+    save_rows_raw(raw_rows, out_dir)
+    save_rows_normalized(normalized, out_dir)
+    elapsed = time.perf_counter() - t0
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak - start, held - start, normalized, results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark peak memory of row lists vs RowTable")
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--xlsx", default=None, help="Synthetic spec path (written if missing)")
+    parser.add_argument("--rules", default=str(ROOT / "rules" / "dell_rules.yaml"))
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(args.xlsx) if args.xlsx else Path(tmp) / f"dell_{args.rows}.xlsx"
+        if not path.exists():
+            print(f"Writing synthetic spec ({args.rows} rows): {path}")
+            _write_spec(path, args.rows, args.seed)
+        ruleset = RuleSet.load(args.rules)
+
+        runs = {mode: _run(mode, path, ruleset, Path(tmp)) for mode in ("list", "table")}
+        (_, _, _, expected_rows, expected), (_, _, _, actual_rows, actual) = runs["list"], runs["table"]
+        if actual_rows != expected_rows or list(actual) != list(expected):
+            print("Error: RowTable output differs from the row lists", file=sys.stderr)
+            return 1
+        print(f"{'mode':<6} {'rows':>8} {'seconds':>8} {'peak MB':>8} {'held MB':>8}")
+        for mode, (elapsed, peak, held, rows, _) in runs.items():
+            print(f"{mode:<6} {len(rows):>8} {elapsed:>8.2f} {peak / 2**20:>8.1f} {held / 2**20:>8.1f}")
+        (_, list_peak, list_held, _, _), (_, table_peak, table_held, _, _) = runs["list"], runs["table"]
+        print(f"RowTable: peak {table_peak / max(list_peak, 1):.0%} of lists, held {table_held / max(list_held, 1):.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+"""
+Benchmark: native xlsx reader vs openpyxl read_only (WorkbookSession reader="native" / "openpyxl").
+
+Every sheet of every input is decoded by both readers in both modes (cached values and
+formulas); rows, error cells and declared dimensions must be equal, as must the
+DataFrame pandas would build from the first sheet. The script exits 1 on any difference.
+
+Inputs: the given .xlsx files / globs, or — by default — the inputs of the golden files
+(golden/<stem>_expected.jsonl → <stem>.xlsx anywhere under paths.input_root).
+
+Usage (from spec_classifier/):
+    python scripts/bench_xlsx_reader.py
+    python scripts/bench_xlsx_reader.py "C:/.../INPUT/**/*.xlsx" --repeat 5
+"""
+
+import argparse
+import glob
+import sys
+import time
+import warnings
+from pathlib import Path
+
+import pandas as pd
+import yaml
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.core.workbook import WorkbookSession  # noqa: E402
+
+_GOLDEN_SUFFIX = "_expected.jsonl"
+
+
+def _golden_inputs(input_root: Path) -> list:
+    stems = {p.name[: -len(_GOLDEN_SUFFIX)] for p in (ROOT / "golden").glob("*" + _GOLDEN_SUFFIX)}
+    return sorted(p for p in input_root.rglob("*.xlsx") if p.stem in stems)
+
+
+def _input_root() -> Path:
+    config = {}
+    for name in ("config.yaml", "config.local.yaml"):
+        path = ROOT / name
+        if path.exists():
+            with open(path, encoding="utf-8") as f:
+                config.update(yaml.safe_load(f) or {})
+    raw = Path((config.get("paths") or {}).get("input_root") or "input")
+    return raw if raw.is_absolute() else ROOT / raw
+
+
+def _read_all(path: Path, reader: str) -> tuple:
+    """(seconds, {(sheet, data_only): (rows, errors, dimensions)}, first-sheet DataFrame)."""
+    t0 = time.perf_counter()
+    session = WorkbookSession(path, reader=reader)
+    result = {}
+    for name in session.sheet_names:
+        for data_only in (True, False):
+            try:
+                rows = session.rows(name, data_only=data_only)
+            except (KeyError, IndexError):
+                continue  # (chartsheet)
+            s = session._sheet(name, data_only)
+            result[(name, data_only)] = (rows, s.errors, (s.max_row, s.max_col))
+    frame = session.dataframe(0, header=None)
+    elapsed = time.perf_counter() - t0
+    session.close()
+    return elapsed, result, frame
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the native xlsx reader against openpyxl")
+    parser.add_argument("inputs", nargs="*", help=".xlsx files or globs (default: inputs of golden/*.jsonl)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed reads per reader and file (best is reported)")
+    args = parser.parse_args()
+
+    if args.inputs:
+        files = sorted({Path(p) for pattern in args.inputs for p in glob.glob(pattern, recursive=True)})
+    else:
+        files = _golden_inputs(_input_root())
+    if not files:
+        print("Error: no input .xlsx files found", file=sys.stderr)
+        return 1
+
+    warnings.simplefilter("ignore")  # openpyxl style warnings, same for both readers
+    total = {"openpyxl": 0.0, "native": 0.0}
+    print(f"{'file':<40} {'rows':>8} {'openpyxl s':>11} {'native s':>9} {'speedup':>8}")
+    for path in files:
+        best = {}
+        outputs = {}
+        for reader in ("openpyxl", "native"):
+            for _ in range(max(args.repeat, 1)):
+                elapsed, result, frame = _read_all(path, reader)
+                best[reader] = min(best.get(reader, elapsed), elapsed)
+            outputs[reader] = (result, frame)
+            total[reader] += best[reader]
+        (expected, expected_frame), (actual, actual_frame) = outputs["openpyxl"], outputs["native"]
+        if actual != expected:
+            print(f"Error: native rows differ from openpyxl in {path}", file=sys.stderr)
+            return 1
+        try:
+            pd.testing.assert_frame_equal(actual_frame, expected_frame)
+        except AssertionError as e:
+            print(f"Error: native DataFrame differs from openpyxl in {path}: {e}", file=sys.stderr)
+            return 1
+        rows = sum(len(r[0]) for r in expected.values())
+        print(f"{path.name[:40]:<40} {rows:>8} {best['openpyxl']:>11.3f} {best['native']:>9.3f} "
+              f"{best['openpyxl'] / max(best['native'], 1e-9):>7.1f}x")
+    print(f"{'total (' + str(len(files)) + ' files, identical)':<40} {'':>8} {total['openpyxl']:>11.3f} "
+          f"{total['native']:>9.3f} {total['openpyxl'] / max(total['native'], 1e-9):>7.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,202 @@
+"""
+Persistent classification cache (SQLite, stdlib) shared between runs.
+
+Maps (rules_file_hash, rule-visible field tuple) → serialized ClassificationResult.
+It sits behind ClassificationMemo: a row missing from the in-process memo is looked up
+here before the rules are evaluated. The key contains the SHA-256 of the rules YAML, so
+editing the rules invalidates every entry made with the old file; bind_rules() also
+deletes those entries so they stop taking space. The stored rules hash also carries
+classifier_code_version() (classifier, rules engine, state detector), so results made by
+other classifier code are never returned; opening the cache deletes them.
+
+Writes are buffered and applied by flush() (once per input file), together with the
+last_used updates for hits and the LRU eviction down to max_entries.
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Optional
+
+from src.core import classifier, state_detector
+from src.core.classifier import ClassificationResult, EntityType
+from src.core.normalizer import RowKind
+from src.core.state_detector import State
+from src.rules import rules_engine
+
+_log = logging.getLogger(__name__)
+
+CACHE_FILENAME = "classification_cache.sqlite3"
+DEFAULT_MAX_ENTRIES = 200_000
+
+_classifier_code_version: Optional[str] = None
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    rules_hash TEXT NOT NULL,
+    fields     TEXT NOT NULL,
+    result     TEXT NOT NULL,
+    last_used  INTEGER NOT NULL,
+    PRIMARY KEY (rules_hash, fields)
+);
+CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used);
+CREATE TABLE IF NOT EXISTS rules_files (
+    path       TEXT PRIMARY KEY,
+    rules_hash TEXT NOT NULL
+);
+"""
+
+
+def classifier_code_version() -> str:
+    """Hash of the modules that turn a row and its rules into a ClassificationResult."""
+    global _classifier_code_version
+    if _classifier_code_version is None:
+        h = hashlib.sha256(sys.version.encode("utf-8"))
+        for module_file in (classifier.__file__, rules_engine.__file__, state_detector.__file__):
+            with open(module_file, "rb") as f:
+                h.update(f.read())
+        _classifier_code_version = h.hexdigest()
+    return _classifier_code_version
+
+
+def _dump_result(result: ClassificationResult) -> str:
+    return json.dumps([
+        result.row_kind.value,
+        result.entity_type.value if result.entity_type else None,
+        result.state.value if result.state else None,
+        result.matched_rule_id,
+        result.device_type,
+        result.hw_type,
+        list(result.warnings),
+    ], ensure_ascii=False)
+
+
+def _load_result(text: str) -> ClassificationResult:
+    row_kind, entity_type, state, matched_rule_id, device_type, hw_type, warnings = json.loads(text)
+    return ClassificationResult(
+        row_kind=RowKind(row_kind),
+        entity_type=EntityType(entity_type) if entity_type else None,
+        state=State(state) if state else None,
+        matched_rule_id=matched_rule_id,
+        device_type=device_type,
+        hw_type=hw_type,
+        warnings=tuple(warnings),
+    )
+
+
+class ClassificationCache:
+    """
+    On-disk classification store used as ClassificationMemo.store.
+
+    get(rules_hash, fields) / put(rules_hash, fields, result); fields is the tuple of
+    rule-visible values (row_kind first) that ClassificationMemo keys on. Rows are stored
+    under "<rules_hash>:<classifier_code_version()>".
+    """
+
+    def __init__(self, path: Path, max_entries: int = DEFAULT_MAX_ENTRIES):
+        if max_entries < 1:
+            raise ValueError(f"Classification cache max_entries must be >= 1, got {max_entries}")
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._pending: dict = {}
+        self._touched: set = set()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), timeout=30)
+        self._conn.executescript(_SCHEMA)
+        self._suffix = ":" + classifier_code_version()
+        with self._conn:
+            deleted = self._conn.execute(
+                "DELETE FROM results WHERE substr(rules_hash, -?) != ?", (len(self._suffix), self._suffix)
+            ).rowcount
+        if deleted:
+            _log.info("Classifier code changed: dropped %d cached classifications", deleted)
+        row = self._conn.execute("SELECT COALESCE(MAX(last_used), 0) FROM results").fetchone()
+        # Logical clock for LRU: one tick per flush(), i.e. per input file.
+        self._clock = row[0] + 1
+
+    @classmethod
+    def open(cls, cache_dir: Path, max_entries: int = DEFAULT_MAX_ENTRIES) -> Optional["ClassificationCache"]:
+        """Open (or create) <cache_dir>/classification_cache.sqlite3; None (with a warning) if unusable."""
+        path = Path(cache_dir) / CACHE_FILENAME
+        try:
+            return cls(path, max_entries=max_entries)
+        except (sqlite3.Error, OSError) as e:
+            _log.warning("Classification cache disabled: cannot open %s: %s", path, e)
+            return None
+
+    @staticmethod
+    def _fields_key(fields: tuple) -> str:
+        return json.dumps([f.value if isinstance(f, RowKind) else f for f in fields], ensure_ascii=False)
+
+    def bind_rules(self, rules_path: str, rules_hash: str) -> None:
+        """Record the current hash of a rules file; entries made with its previous hash are deleted."""
+        row = self._conn.execute("SELECT rules_hash FROM rules_files WHERE path = ?", (rules_path,)).fetchone()
+        if row is not None and row[0] == rules_hash:
+            return
+        with self._conn:
+            if row is not None:
+                deleted = self._conn.execute(
+                    "DELETE FROM results WHERE rules_hash = ?", (row[0] + self._suffix,)
+                ).rowcount
+                _log.info("Rules changed (%s): dropped %d cached classifications", rules_path, deleted)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO rules_files (path, rules_hash) VALUES (?, ?)", (rules_path, rules_hash)
+            )
+
+    def get(self, rules_hash: str, fields: tuple) -> Optional[ClassificationResult]:
+        key = (rules_hash + self._suffix, self._fields_key(fields))
+        text = self._pending.get(key)
+        if text is None:
+            row = self._conn.execute(
+                "SELECT result FROM results WHERE rules_hash = ? AND fields = ?", key
+            ).fetchone()
+            text = row[0] if row is not None else None
+        if text is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._touched.add(key)
+        return _load_result(text)
+
+    def put(self, rules_hash: str, fields: tuple, result: ClassificationResult) -> None:
+        self._pending[(rules_hash + self._suffix, self._fields_key(fields))] = _dump_result(result)
+
+    def flush(self) -> None:
+        """Write buffered entries, refresh last_used of hits, evict least recently used over max_entries."""
+        clock = self._clock
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO results (rules_hash, fields, result, last_used) VALUES (?, ?, ?, ?)",
+                [(h, f, text, clock) for (h, f), text in self._pending.items()],
+            )
+            self._conn.executemany(
+                "UPDATE results SET last_used = ? WHERE rules_hash = ? AND fields = ?",
+                [(clock, h, f) for h, f in self._touched],
+            )
+            count = self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+            if count > self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM results WHERE rowid IN "
+                    "(SELECT rowid FROM results ORDER BY last_used LIMIT ?)",
+                    (count - self.max_entries,),
+                )
+        self._pending.clear()
+        self._touched.clear()
+        self._clock = clock + 1
+
+    def stats(self, since: Optional[dict] = None) -> dict:
+        """hits/misses (optionally since an earlier snapshot) for run_summary.json."""
+        return {
+            "path": str(self.path),
+            "hits": self.hits - (since or {}).get("hits", 0),
+            "misses": self.misses - (since or {}).get("misses", 0),
+        }
+
+    def close(self) -> None:
+        self.flush()
+        self._conn.close()
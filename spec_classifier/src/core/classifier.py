@@ -3,13 +3,24 @@ Row classifier: entity type (BASE, HW, SERVICE, ...) from rules.
 HEADER rows are skipped; ITEM rows follow priority order.
 """
 
-from dataclasses import dataclass, field, replace
+import sys
+from array import array
+from collections import Counter, OrderedDict
+from collections.abc import Sequence
+from dataclasses import dataclass
 from enum import Enum
-from typing import List, Optional
+from typing import Iterable, Iterator, List, Optional, Tuple
 
 from src.core.normalizer import NormalizedRow, RowKind
-from src.core.state_detector import State, detect_state
-from src.rules.rules_engine import RuleSet, match_rule, match_device_type_rule, match_hw_type_rule
+from src.core.state_detector import State
+from src.rules.rules_engine import (
+    RowColumns,
+    RuleSet,
+    match_device_type_rule,
+    match_hw_type_rule,
+    match_rule,
+    match_view,
+)
 
 
 class EntityType(Enum):
@@ -51,9 +62,13 @@ HW_TYPE_VOCAB = frozenset({
 })
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ClassificationResult:
-    """Result of classifying one row."""
+    """
+    Result of classifying one row. Immutable: the classifier builds it once with its final
+    values, and equal rows (memo hits, duplicates in classify_rows) share one instance.
+    warnings is a tuple; rows without warnings share the empty tuple.
+    """
 
     row_kind: RowKind
     entity_type: Optional[EntityType]
@@ -61,7 +76,7 @@ class ClassificationResult:
     matched_rule_id: str
     device_type: Optional[str] = None
     hw_type: Optional[str] = None
-    warnings: List[str] = field(default_factory=list)
+    warnings: Tuple[str, ...] = ()
 
 
 def classify_row(row: NormalizedRow, ruleset: RuleSet) -> ClassificationResult:
@@ -70,156 +85,450 @@ def classify_row(row: NormalizedRow, ruleset: RuleSet) -> ClassificationResult:
     → LOGISTIC → SOFTWARE → NOTE → CONFIG → HW → UNKNOWN.
     For ITEM rows with entity_type HW or LOGISTIC, run second pass to set device_type.
     """
+    return _classify(row, match_view(row), ruleset)
+
+
+def _classify(row: NormalizedRow, view, ruleset: RuleSet) -> ClassificationResult:
     if row.row_kind == RowKind.HEADER:
-        return ClassificationResult(
-            row_kind=RowKind.HEADER,
-            entity_type=None,
-            state=None,
-            matched_rule_id="HEADER-SKIP",
-        )
+        return _HEADER_RESULT
 
-    state = detect_state(row.option_name, ruleset.get_state_rules())
+    # view: field values derived once per row, shared by every match_* call.
+    # State is detected only for branches that use it (BASE and NOTE are always PRESENT).
+    detect = ruleset.state_detector.detect
+    for rules_attr, entity_type, fixed_state in _ENTITY_PASSES:
+        match = match_rule(view, getattr(ruleset, rules_attr))
+        if match:
+            rule_id = match["rule_id"]
+            device_type = None
+            if _needs_device_type(entity_type, rule_id, ruleset):
+                device_type = _device_type_of(match_device_type_rule(view, ruleset.device_type_rules))
+            hw_type, warnings = _hw_type_of(view, entity_type, rule_id, device_type, ruleset)
+            return ClassificationResult(
+                RowKind.ITEM, entity_type, fixed_state or detect(view.state_text), rule_id,
+                device_type, hw_type, warnings,
+            )
+
+    return _unknown_result(detect(view.state_text))
+
+
+# Entity passes in priority order: (RuleSet attribute, entity type, state override).
+# BASE and NOTE rows are always PRESENT; the others take the detected state.
+_ENTITY_PASSES = (
+    ("base_rules", EntityType.BASE, State.PRESENT),
+    ("service_rules", EntityType.SERVICE, None),
+    ("logistic_rules", EntityType.LOGISTIC, None),
+    ("software_rules", EntityType.SOFTWARE, None),
+    ("note_rules", EntityType.NOTE, State.PRESENT),
+    ("config_rules", EntityType.CONFIG, None),
+    ("hw_rules", EntityType.HW, None),
+)
+
+_HEADER_RESULT = ClassificationResult(
+    row_kind=RowKind.HEADER,
+    entity_type=None,
+    state=None,
+    matched_rule_id="HEADER-SKIP",
+)
+_UNKNOWN_WARNINGS = ("No matching rule found",)
+_UNRESOLVED_WARNINGS = ("hw_type unresolved for HW row",)
 
-    match = match_rule(row, ruleset.base_rules)
-    if match:
-        result = ClassificationResult(
-            row_kind=RowKind.ITEM,
-            entity_type=EntityType.BASE,
-            state=State.PRESENT,
-            matched_rule_id=match["rule_id"],
-        )
-        result = _apply_device_type(row, result, ruleset)
-        return _apply_hw_type(row, result, ruleset)
-
-    match = match_rule(row, ruleset.service_rules)
-    if match:
-        result = ClassificationResult(
-            row_kind=RowKind.ITEM,
-            entity_type=EntityType.SERVICE,
-            state=state,
-            matched_rule_id=match["rule_id"],
-        )
-        result = _apply_device_type(row, result, ruleset)
-        return _apply_hw_type(row, result, ruleset)
-
-    match = match_rule(row, ruleset.logistic_rules)
-    if match:
-        result = ClassificationResult(
-            row_kind=RowKind.ITEM,
-            entity_type=EntityType.LOGISTIC,
-            state=state,
-            matched_rule_id=match["rule_id"],
-        )
-        result = _apply_device_type(row, result, ruleset)
-        return _apply_hw_type(row, result, ruleset)
-
-    match = match_rule(row, ruleset.software_rules)
-    if match:
-        result = ClassificationResult(
-            row_kind=RowKind.ITEM,
-            entity_type=EntityType.SOFTWARE,
-            state=state,
-            matched_rule_id=match["rule_id"],
-        )
-        result = _apply_device_type(row, result, ruleset)
-        return _apply_hw_type(row, result, ruleset)
-
-    match = match_rule(row, ruleset.note_rules)
-    if match:
-        result = ClassificationResult(
-            row_kind=RowKind.ITEM,
-            entity_type=EntityType.NOTE,
-            state=State.PRESENT,
-            matched_rule_id=match["rule_id"],
-        )
-        result = _apply_device_type(row, result, ruleset)
-        return _apply_hw_type(row, result, ruleset)
-
-    match = match_rule(row, ruleset.config_rules)
-    if match:
-        result = ClassificationResult(
-            row_kind=RowKind.ITEM,
-            entity_type=EntityType.CONFIG,
-            state=state,
-            matched_rule_id=match["rule_id"],
-        )
-        result = _apply_device_type(row, result, ruleset)
-        return _apply_hw_type(row, result, ruleset)
-
-    match = match_rule(row, ruleset.hw_rules)
-    if match:
-        result = ClassificationResult(
-            row_kind=RowKind.ITEM,
-            entity_type=EntityType.HW,
-            state=state,
-            matched_rule_id=match["rule_id"],
-        )
-        result = _apply_device_type(row, result, ruleset)
-        return _apply_hw_type(row, result, ruleset)
 
-    result = ClassificationResult(
+def _unknown_result(state: State) -> ClassificationResult:
+    return ClassificationResult(
         row_kind=RowKind.ITEM,
         entity_type=EntityType.UNKNOWN,
         state=state,
         matched_rule_id="UNKNOWN-000",
-        warnings=["No matching rule found"],
+        warnings=_UNKNOWN_WARNINGS,
     )
-    return _apply_hw_type(row, result, ruleset)
 
 
-def _apply_device_type(row: NormalizedRow, result: ClassificationResult, ruleset: RuleSet) -> ClassificationResult:
+def classify_rows(rows: List[NormalizedRow], ruleset: RuleSet) -> List[ClassificationResult]:
     """
-    Second pass: for ITEM rows with entity_type in device_type_rules.applies_to
-    and matched_rule_id != UNKNOWN-000, set device_type from first matching rule.
+    Classify many rows at once; result i equals classify_row(rows[i], ruleset).
+
+    Rows with identical rule-visible fields are classified once. Each pass (entity buckets
+    in priority order, device_type, hw_type regex layer) runs rule by rule over the
+    distinct field values of the rows it still has to resolve (CompiledRuleList.first_matches),
+    instead of bucket by bucket for each row.
     """
-    if result.entity_type is None or result.matched_rule_id == "UNKNOWN-000":
-        return result
-    # P0-1 verified: entity_type is None returns early (line 171) before .value access
-    if result.entity_type.value not in ruleset.device_type_applies_to:
+    keys = {}
+    row_key = []
+    views = []
+    for row in rows:
+        view = match_view(row)
+        values = view.values
+        key = (row.row_kind,) + tuple(values[f] for f in _MEMO_FIELDS)
+        slot = keys.get(key)
+        if slot is None:
+            slot = keys[key] = len(views)
+            views.append(view)
+        row_key.append(slot)
+    columns = RowColumns(views)
+
+    # Entity passes: (entity_type, state, rule_id) per distinct row; HEADER rows are final.
+    unique: List[Optional[ClassificationResult]] = [None] * len(views)
+    entities: dict = {}
+    states: dict = {}
+    todo = []
+    for p, view in enumerate(views):
+        if view.row.row_kind == RowKind.HEADER:
+            unique[p] = _HEADER_RESULT
+        else:
+            todo.append(p)
+
+    for rules_attr, entity_type, fixed_state in _ENTITY_PASSES:
+        if not todo:
+            break
+        matched = getattr(ruleset, rules_attr).first_matches(columns, todo)
+        if not matched:
+            continue
+        for p, match in matched.items():
+            state = fixed_state or _state_of(views[p], ruleset, states)
+            entities[p] = (entity_type, state, match["rule_id"])
+        todo = [p for p in todo if p not in matched]
+    for p in todo:
+        unique[p] = _unknown_result(_state_of(views[p], ruleset, states))
+
+    # device_type pass
+    device_types: dict = {}
+    need = [p for p, (entity_type, _, rule_id) in entities.items() if _needs_device_type(entity_type, rule_id, ruleset)]
+    if need:
+        for p, match in ruleset.device_type_rules.first_matches(columns, need).items():
+            device_types[p] = _device_type_of(match)
+
+    # hw_type pass: map layers per row, regex layer over the rest at once; then build each result once
+    hw_types: dict = {}
+    need = []
+    for p, (entity_type, _, rule_id) in entities.items():
+        if not _needs_hw_type(entity_type, rule_id, ruleset):
+            continue
+        mapped = _hw_type_from_maps(device_types.get(p), rule_id, ruleset)
+        if mapped is not None:
+            hw_types[p] = mapped
+        else:
+            need.append(p)
+    if need:
+        matched = ruleset.hw_type_rules.first_matches(columns, need)
+        for p in need:
+            hw_types[p] = _hw_type_from_match(matched.get(p))
+    for p, (entity_type, state, rule_id) in entities.items():
+        hw_type, warnings = hw_types.get(p, (None, ()))
+        unique[p] = ClassificationResult(
+            RowKind.ITEM, entity_type, state, rule_id, device_types.get(p), hw_type, warnings,
+        )
+
+    # Duplicates share the (immutable) result of their first occurrence.
+    return [unique[slot] for slot in row_key]
+
+
+def _state_of(view, ruleset: RuleSet, cache: dict) -> State:
+    text = view.state_text
+    state = cache.get(text)
+    if state is None:
+        state = cache[text] = ruleset.state_detector.detect(text)
+    return state
+
+
+# Default bound of ClassificationMemo (entries, not bytes); a batch of specs has far fewer distinct rows.
+DEFAULT_MEMO_SIZE = 65536
+
+# Rule-visible fields, in key order (see RowMatchView.values).
+_MEMO_FIELDS = ("module_name", "option_name", "option_id", "sku", "is_bundle_root", "service_duration_months")
+
+
+class ClassificationMemo:
+    """
+    Bounded LRU memo in front of classify_row.
+
+    classify_row is a pure function of the row's rule-visible fields and the rules, so
+    the key is (rules fingerprint, rules version, row_kind, module_name, option_name,
+    option_id, first sku, is_bundle_root, service_duration_months) — two rows with the
+    same key always get equal results. Results are immutable, so hits return the
+    memoized instance itself.
+
+    store: optional second level consulted on a miss before the rules run
+    (get(rules_hash, fields) / put(rules_hash, fields, result), e.g. ClassificationCache).
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_MEMO_SIZE, store=None):
+        if maxsize < 1:
+            raise ValueError(f"ClassificationMemo maxsize must be >= 1, got {maxsize}")
+        self.maxsize = maxsize
+        self.store = store
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[tuple, ClassificationResult]" = OrderedDict()
+
+    def classify(self, row: NormalizedRow, ruleset: RuleSet) -> ClassificationResult:
+        """classify_row(row, ruleset), answered from the memo when the same key was seen."""
+        view = match_view(row)
+        key = _memo_key(row, view, ruleset)
+        result = self._lookup(key, ruleset)
+        if result is None:
+            result = _classify(row, view, ruleset)
+            self._remember(key, result, ruleset)
         return result
-    match = match_device_type_rule(row, ruleset.device_type_rules)
+
+    def classify_rows(self, rows: List[NormalizedRow], ruleset: RuleSet) -> List[ClassificationResult]:
+        """
+        classify_rows(rows, ruleset) through the memo: rows found in the memo (or store)
+        are answered from it, the rest are classified together in one classify_rows call.
+        Counters match row-by-row classify(): repeats of a missing key count as hits.
+        """
+        results: List[Optional[ClassificationResult]] = [None] * len(rows)
+        missing: dict = {}
+        for i, row in enumerate(rows):
+            key = _memo_key(row, match_view(row), ruleset)
+            if key in missing:
+                self.hits += 1
+                missing[key].append(i)
+                continue
+            result = self._lookup(key, ruleset)
+            if result is None:
+                missing[key] = [i]
+            else:
+                results[i] = result
+        if missing:
+            classified = classify_rows([rows[positions[0]] for positions in missing.values()], ruleset)
+            for (key, positions), result in zip(missing.items(), classified):
+                self._remember(key, result, ruleset)
+                for i in positions:
+                    results[i] = result
+        return results
+
+    def _lookup(self, key: tuple, ruleset: RuleSet) -> Optional[ClassificationResult]:
+        cached = self._entries.get(key)
+        if cached is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return cached
+        self.misses += 1
+        if self.store is not None:
+            result = self.store.get(ruleset.fingerprint, key[2:])
+            if result is not None:
+                self._entries[key] = result
+                self._evict()
+            return result
+        return None
+
+    def _remember(self, key: tuple, result: ClassificationResult, ruleset: RuleSet) -> None:
+        if self.store is not None:
+            self.store.put(ruleset.fingerprint, key[2:], result)
+        self._entries[key] = result
+        self._evict()
+
+    def _evict(self) -> None:
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def stats(self, since: Optional[dict] = None) -> dict:
+        """
+        Counters for run_summary.json: hits, misses, hit_rate, size, maxsize.
+        since: an earlier stats() snapshot — hits/misses are then counted from that point.
+        """
+        hits = self.hits - (since or {}).get("hits", 0)
+        misses = self.misses - (since or {}).get("misses", 0)
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+        }
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+def _memo_key(row: NormalizedRow, view, ruleset: RuleSet) -> tuple:
+    values = view.values
+    return (ruleset.fingerprint, ruleset.version, row.row_kind) + tuple(values[f] for f in _MEMO_FIELDS)
+
+
+# Process-wide memo: main.py shares it across every file of a batch.
+classification_memo = ClassificationMemo()
+
+
+# Enum columns of ClassificationTable: code = position in the member tuple, -1 = None.
+_ENUM_MEMBERS = {"row_kind": tuple(RowKind), "entity_type": tuple(EntityType), "state": tuple(State)}
+_ENUM_CODES = {name: {m: code for code, m in enumerate(members)} for name, members in _ENUM_MEMBERS.items()}
+_POOLED_COLUMNS = ("matched_rule_id", "device_type", "hw_type", "warnings")
+_COLUMNS = ("row_kind", "entity_type", "state") + _POOLED_COLUMNS
+
+
+class ClassificationTable(Sequence):
+    """
+    Column-oriented list of ClassificationResult for a whole file.
+
+    row_kind / entity_type / state are stored as 1-byte enum codes (array "b"); matched_rule_id,
+    device_type, hw_type and warnings as 4-byte codes into one pool of interned values
+    (array "i"), so a row costs ~19 bytes however many rows share a rule_id. -1 stands for None.
+
+    Behaves as a read-only sequence of ClassificationResult (len, index, iteration), so the
+    writers take it wherever they take a list; table[i] == results[i] for the results it was
+    built from. Iteration hands out one shared instance per distinct row. collect_stats reads
+    the code columns directly (codes / code / value_counts).
+    """
+
+    __slots__ = ("_columns", "_pool", "_pool_codes")
+
+    def __init__(self, results: Iterable[ClassificationResult] = ()):
+        self._columns = {name: array("b") for name in _ENUM_MEMBERS}
+        self._columns.update({name: array("i") for name in _POOLED_COLUMNS})
+        self._pool: list = []
+        self._pool_codes: dict = {}
+        self.extend(results)
+
+    def extend(self, results: Iterable[ClassificationResult]) -> None:
+        """Append results; repeated instances (as classify_rows returns them) are encoded once."""
+        columns = [self._columns[name] for name in _COLUMNS]
+        encoded: dict = {}
+        for result in results:
+            codes = encoded.get(id(result))
+            if codes is None:
+                codes = encoded[id(result)] = (result, self._encode(result))
+            for column, code in zip(columns, codes[1]):
+                column.append(code)
+
+    def append(self, result: ClassificationResult) -> None:
+        self.extend((result,))
+
+    def _encode(self, result: ClassificationResult) -> tuple:
+        codes = []
+        for name in _COLUMNS:
+            value = getattr(result, name)
+            if value is None:
+                codes.append(-1)
+            elif name in _ENUM_CODES:
+                codes.append(_ENUM_CODES[name][value])
+            else:
+                code = self._pool_codes.get(value)
+                if code is None:
+                    code = self._pool_codes[value] = len(self._pool)
+                    self._pool.append(sys.intern(value) if isinstance(value, str) else value)
+                codes.append(code)
+        return tuple(codes)
+
+    def _decode(self, name: str, code: int):
+        if code < 0:
+            return None
+        if name in _ENUM_MEMBERS:
+            return _ENUM_MEMBERS[name][code]
+        return self._pool[code]
+
+    def __len__(self) -> int:
+        return len(self._columns["row_kind"])
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return ClassificationTable(self[i] for i in range(*index.indices(len(self))))
+        return ClassificationResult(*(self._decode(name, self._columns[name][index]) for name in _COLUMNS))
+
+    def __iter__(self) -> Iterator[ClassificationResult]:
+        shared: dict = {}
+        for codes in zip(*(self._columns[name] for name in _COLUMNS)):
+            result = shared.get(codes)
+            if result is None:
+                result = shared[codes] = ClassificationResult(
+                    *(self._decode(name, code) for name, code in zip(_COLUMNS, codes))
+                )
+            yield result
+
+    def codes(self, name: str) -> array:
+        """Code column of a ClassificationResult field (read-only by convention)."""
+        if name not in self._columns:
+            raise ValueError(f"Unknown ClassificationTable column: {name}")
+        return self._columns[name]
+
+    def code(self, name: str, value) -> Optional[int]:
+        """Code of value in column name (-1 for None); None if the value does not occur in the table."""
+        if value is None:
+            return -1
+        if name in _ENUM_CODES:
+            return _ENUM_CODES[name].get(value)
+        return self._pool_codes.get(value)
+
+    def value_counts(self, name: str, item_only: bool = False) -> dict:
+        """{value: count} of column name (None included), in order of first occurrence."""
+        column = self.codes(name)
+        if item_only:
+            item = _ENUM_CODES["row_kind"][RowKind.ITEM]
+            counts = Counter(code for kind, code in zip(self._columns["row_kind"], column) if kind == item)
+        else:
+            counts = Counter(column)
+        return {self._decode(name, code): count for code, count in counts.items()}
+
+
+def _needs_device_type(entity_type: Optional[EntityType], rule_id: str, ruleset: RuleSet) -> bool:
+    """
+    Second pass runs for ITEM rows with entity_type in device_type_rules.applies_to
+    and matched_rule_id != UNKNOWN-000; device_type comes from the first matching rule.
+    """
+    if entity_type is None or rule_id == "UNKNOWN-000":
+        return False
+    # P0-1 verified: entity_type is None returns early before .value access
+    return entity_type.value in ruleset.device_type_applies_to
+
+
+def _device_type_of(match: Optional[dict]) -> Optional[str]:
     if match and match.get("device_type"):
-        return replace(result, device_type=match["device_type"])
-    return result
+        return match["device_type"]
+    return None
 
 
-def _validate_hw_type_vocab(result: ClassificationResult) -> ClassificationResult:
-    """If hw_type is set and not in HW_TYPE_VOCAB, add warning (no raise)."""
-    hw_type = getattr(result, "hw_type", None)
+def _validate_hw_type_vocab(hw_type: Optional[str]) -> Tuple[Optional[str], Tuple[str, ...]]:
+    """(hw_type, warnings): a warning (no raise) if hw_type is set and not in HW_TYPE_VOCAB."""
     if hw_type is not None and hw_type not in HW_TYPE_VOCAB:
-        return replace(result, warnings=result.warnings + [f"hw_type '{hw_type}' not in HW_TYPE_VOCAB"])
-    return result
+        return hw_type, (f"hw_type '{hw_type}' not in HW_TYPE_VOCAB",)
+    return hw_type, ()
 
 
-def _apply_hw_type(
-    row: NormalizedRow,
-    result: ClassificationResult,
+def _hw_type_of(
+    view,
+    entity_type: EntityType,
+    rule_id: str,
+    device_type: Optional[str],
     ruleset: RuleSet,
-) -> ClassificationResult:
+) -> Tuple[Optional[str], Tuple[str, ...]]:
     """
-    Third pass: compute hw_type for HW rows.
+    Third pass: (hw_type, warnings) for HW rows.
     Priority: device_type_map > rule_id_map > regex rules > null.
     Only applies to entity_types in hw_type_rules.applies_to.
     """
-    if result.entity_type is None or result.matched_rule_id == "UNKNOWN-000":
-        return result
-    # P0-1 verified: entity_type is None returns early (line 199) before .value access
-    if result.entity_type.value not in ruleset.hw_type_applies_to:
-        return result
+    if not _needs_hw_type(entity_type, rule_id, ruleset):
+        return None, ()
+    mapped = _hw_type_from_maps(device_type, rule_id, ruleset)
+    if mapped is not None:
+        return mapped
+    # Layer 3: regex rules (first match wins)
+    return _hw_type_from_match(match_hw_type_rule(view, ruleset.hw_type_rules))
+
 
+def _needs_hw_type(entity_type: Optional[EntityType], rule_id: str, ruleset: RuleSet) -> bool:
+    if entity_type is None or rule_id == "UNKNOWN-000":
+        return False
+    # P0-1 verified: entity_type is None returns early before .value access
+    return entity_type.value in ruleset.hw_type_applies_to
+
+
+def _hw_type_from_maps(device_type: Optional[str], rule_id: str, ruleset: RuleSet) -> Optional[tuple]:
+    """Layers 1–2 of the hw_type pass as (hw_type, warnings); None when neither map decides."""
     # Layer 1: device_type → hw_type
-    if result.device_type and result.device_type in ruleset.hw_type_device_type_map:
-        return _validate_hw_type_vocab(replace(result, hw_type=ruleset.hw_type_device_type_map[result.device_type]))
+    if device_type and device_type in ruleset.hw_type_device_type_map:
+        return _validate_hw_type_vocab(ruleset.hw_type_device_type_map[device_type])
 
     # Layer 2: rule_id → hw_type
-    if result.matched_rule_id in ruleset.hw_type_rule_id_map:
-        return _validate_hw_type_vocab(replace(result, hw_type=ruleset.hw_type_rule_id_map[result.matched_rule_id]))
+    if rule_id in ruleset.hw_type_rule_id_map:
+        return _validate_hw_type_vocab(ruleset.hw_type_rule_id_map[rule_id])
+    return None
 
-    # Layer 3: regex rules (first match wins)
-    match = match_hw_type_rule(row, ruleset.hw_type_rules)
-    if match and match.get("hw_type"):
-        return _validate_hw_type_vocab(replace(result, hw_type=match["hw_type"]))
 
-    if result.entity_type and result.entity_type.value in ruleset.hw_type_applies_to:
-        return replace(result, warnings=result.warnings + ["hw_type unresolved for HW row"])
-    return result
+def _hw_type_from_match(match: Optional[dict]) -> Tuple[Optional[str], Tuple[str, ...]]:
+    """Layer 3 of the hw_type pass, given the first matching hw_type rule (or None)."""
+    if match and match.get("hw_type"):
+        return _validate_hw_type_vocab(match["hw_type"])
+    return None, _UNRESOLVED_WARNINGS
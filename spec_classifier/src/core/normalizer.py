@@ -5,7 +5,9 @@ HEADER = Module Name, Option Name, SKUs all empty; otherwise ITEM.
 
 from dataclasses import dataclass
 from enum import Enum
-from typing import List, Optional
+from typing import Callable, List, Optional
+
+from src.core.row_table import RowTable, map_distinct
 
 # Optional pandas NaN handling without requiring pandas import
 def _is_empty(value) -> bool:
@@ -66,6 +68,34 @@ def detect_row_kind(raw_row: dict) -> RowKind:
     return RowKind.ITEM
 
 
+def _skus_of(value) -> List[str]:
+    """SKUs cell: split by comma, strip each, list of non-empty strings."""
+    return [s.strip() for s in _str_val(value).split(",") if s.strip()]
+
+
+def _qty_of(value) -> int:
+    """Qty cell -> int; 1 when empty, 0 when not a number."""
+    try:
+        return int(value) if value is not None and not _is_empty(value) else 1
+    except (TypeError, ValueError):
+        return 0
+
+
+def _price_of(value) -> float:
+    """Option List Price cell -> float; 0.0 when empty or not a number."""
+    try:
+        return float(value) if value is not None and not _is_empty(value) else 0.0
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _opt_str(value) -> Optional[str]:
+    """Optional text cell: stripped string, None when empty."""
+    if value is None or _is_empty(value):
+        return None
+    return str(value).strip() or None
+
+
 def normalize_row(raw_row: dict) -> NormalizedRow:
     """
     Normalize a raw row from Excel: strip strings, parse SKUs, coerce types.
@@ -74,46 +104,74 @@ def normalize_row(raw_row: dict) -> NormalizedRow:
     - SKUs: split by comma, strip each, list of non-empty strings.
     - Qty -> int (default 1 when empty), Option List Price -> float (default 0.0).
     """
-    row_kind = detect_row_kind(raw_row)
-
-    module_name = _str_val(raw_row.get("Module Name"))
-    option_name = _str_val(raw_row.get("Option Name"))
+    return NormalizedRow(
+        source_row_index=int(raw_row["__row_index__"]),
+        row_kind=detect_row_kind(raw_row),
+        group_name=_opt_str(raw_row.get("Group Name")),
+        group_id=_opt_str(raw_row.get("Group ID")),
+        product_name=_opt_str(raw_row.get("Product Name")),
+        module_name=_str_val(raw_row.get("Module Name")),
+        option_name=_str_val(raw_row.get("Option Name")),
+        option_id=_opt_str(raw_row.get("Option ID")),
+        skus=_skus_of(raw_row.get("SKUs")),
+        qty=_qty_of(raw_row.get("Qty")),
+        option_price=_price_of(raw_row.get("Option List Price")),
+    )
 
-    skus_raw = _str_val(raw_row.get("SKUs"))
-    skus = [s.strip() for s in skus_raw.split(",") if s.strip()]
 
-    try:
-        qty_val = raw_row.get("Qty")
-        qty = int(qty_val) if qty_val is not None and not _is_empty(qty_val) else 1
-    except (TypeError, ValueError):
-        qty = 0
+def _normalize(names, map_column: Callable[[str, Callable], list], size: int) -> RowTable:
+    """
+    normalize_row over size raw rows held column-wise: names are the columns present and
+    map_column(name, fn) gives [fn(v) for v in that column] (a missing column reads as
+    None, like raw_row.get).
+
+    Each cleaning step runs as a column operation — row_kind from the three "empty" masks,
+    SKU splitting, Qty / price coercion (defaults 1 / 0 / 0.0), optional-field nulling —
+    evaluated once per distinct cell value, since specs repeat the same group, product,
+    module and option values row after row. Values equal normalize_row's, row by row.
+    """
+    def mapped(name: str, fn: Callable) -> list:
+        return map_column(name, fn) if name in names else [fn(None)] * size
+
+    if size and "__row_index__" not in names:
+        raise KeyError("__row_index__")
+    module_empty = mapped("Module Name", _is_empty)
+    option_empty = mapped("Option Name", _is_empty)
+    skus_empty = mapped("SKUs", _is_empty)
+    row_kind = [
+        RowKind.HEADER if m and o and k else RowKind.ITEM
+        for m, o, k in zip(module_empty, option_empty, skus_empty)
+    ]
+    return RowTable.from_columns(NormalizedRow, {
+        "source_row_index": mapped("__row_index__", int),
+        "row_kind": row_kind,
+        "group_name": mapped("Group Name", _opt_str),
+        "group_id": mapped("Group ID", _opt_str),
+        "product_name": mapped("Product Name", _opt_str),
+        "module_name": mapped("Module Name", _str_val),
+        "option_name": mapped("Option Name", _str_val),
+        "option_id": mapped("Option ID", _opt_str),
+        "skus": mapped("SKUs", _skus_of),
+        "qty": mapped("Qty", _qty_of),
+        "option_price": mapped("Option List Price", _price_of),
+    })
+
+
+def normalize_table(raw_rows: RowTable) -> RowTable:
+    """
+    normalize_row for every parsed row of a RowTable(dict) (parse_excel output), done
+    column by column over the table's pooled columns (see _normalize).
+    """
+    return _normalize(frozenset(raw_rows.column_names), raw_rows.map_column, len(raw_rows))
 
-    try:
-        price_val = raw_row.get("Option List Price")
-        option_price = (
-            float(price_val)
-            if price_val is not None and not _is_empty(price_val)
-            else 0.0
-        )
-    except (TypeError, ValueError):
-        option_price = 0.0
 
-    def opt_str(key: str) -> Optional[str]:
-        v = raw_row.get(key)
-        if v is None or _is_empty(v):
-            return None
-        return str(v).strip() or None
+def normalize_dataframe(df) -> RowTable:
+    """
+    normalize_row for every row of a DataFrame of raw rows (parsed columns plus
+    __row_index__), done column by column (see _normalize); equal to
+    [normalize_row(r) for r in iter_records(df)].
+    """
+    from src.core.workbook import frame_columns  # pandas only when a DataFrame is given
 
-    return NormalizedRow(
-        source_row_index=int(raw_row["__row_index__"]),
-        row_kind=row_kind,
-        group_name=opt_str("Group Name"),
-        group_id=opt_str("Group ID"),
-        product_name=opt_str("Product Name"),
-        module_name=module_name,
-        option_name=option_name,
-        option_id=opt_str("Option ID"),
-        skus=skus,
-        qty=qty,
-        option_price=option_price,
-    )
+    columns = frame_columns(df)
+    return _normalize(columns.keys(), lambda name, fn: map_distinct(columns[name], fn), len(df))
@@ -0,0 +1,146 @@
+"""
+On-disk cache of parsed and normalized rows (<cache dir>/parsed), shared between runs.
+
+When only the rules change, a rerun gets the parser output (raw rows, header_row_index,
+source sheet for the annotated export) and the normalized rows of an input from here
+instead of decoding the workbook again. Entries are files named after the input's
+SHA-256 and the adapter, and hold the parser code version they were written by: a
+changed input is a different file, and a changed parser / normalizer (or Python,
+pandas, openpyxl version) makes the entry a miss that the next write replaces.
+
+The total size of the directory is kept under max_bytes by deleting the least recently
+used entries (a hit refreshes the file's mtime).
+"""
+
+import hashlib
+import logging
+import os
+import pickle
+import sys
+from pathlib import Path
+from typing import Any, Mapping, NamedTuple, Optional, Sequence
+
+import openpyxl
+import pandas as pd
+
+_log = logging.getLogger(__name__)
+
+ENTRY_SUFFIX = ".pickle"
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+# Modules whose code shapes the cached rows, besides the adapter's own vendor package.
+_CORE_MODULES = (
+    "src/core/parser.py",
+    "src/core/normalizer.py",
+    "src/core/row_table.py",
+    "src/core/workbook.py",
+    "src/core/xlsx_reader.py",
+    "src/vendors/base.py",
+)
+_ROOT = Path(__file__).resolve().parent.parent.parent
+
+# Parser code version per vendor package directory.
+_code_versions: dict = {}
+
+
+class ParsedInput(NamedTuple):
+    """What _run_single takes from the adapter for one input file."""
+
+    raw_rows: Sequence[Mapping]
+    header_row_index: int
+    source_sheet: Optional[str]
+    normalized_rows: Sequence[Any]
+
+
+def parser_code_version(adapter) -> str:
+    """Hash of the adapter's vendor package, the core parsing modules and the library versions."""
+    package_dir = Path(sys.modules[type(adapter).__module__].__file__).resolve().parent
+    version = _code_versions.get(package_dir)
+    if version is None:
+        h = hashlib.sha256(f"{sys.version}|{pd.__version__}|{openpyxl.__version__}".encode("utf-8"))
+        for module_file in sorted(package_dir.glob("*.py")) + [_ROOT / m for m in _CORE_MODULES]:
+            h.update(module_file.read_bytes())
+        version = _code_versions[package_dir] = h.hexdigest()
+    return version
+
+
+class ParseCache:
+    """
+    get(input_sha256, adapter) / put(input_sha256, adapter, entry); hits / misses count
+    lookups for run_summary.json.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int = DEFAULT_MAX_BYTES):
+        if max_bytes < 1:
+            raise ValueError(f"Parse cache max_bytes must be >= 1, got {max_bytes}")
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, input_sha256: str, adapter) -> Path:
+        return self.directory / f"{input_sha256}.{type(adapter).__name__}{ENTRY_SUFFIX}"
+
+    def get(self, input_sha256: str, adapter) -> Optional[ParsedInput]:
+        """The cached entry for this input and adapter; None if missing, stale or unreadable."""
+        path = self._path(input_sha256, adapter)
+        try:
+            with open(path, "rb") as f:
+                code_version, entry = pickle.load(f)
+        except FileNotFoundError:
+            entry = None
+        except Exception as e:
+            _log.debug("Ignoring unreadable parse cache entry %s: %s", path, e)
+            entry = None
+        else:
+            if code_version != parser_code_version(adapter) or not isinstance(entry, ParsedInput):
+                entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry
+
+    def put(self, input_sha256: str, adapter, entry: ParsedInput) -> None:
+        """Write the entry atomically (temp file + replace), then evict down to max_bytes."""
+        path = self._path(input_sha256, adapter)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with open(tmp, "wb") as f:
+                pickle.dump((parser_code_version(adapter), entry), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+        except (OSError, pickle.PicklingError) as e:
+            _log.warning("Cannot write parse cache entry %s: %s", path, e)
+            tmp.unlink(missing_ok=True)
+            return
+        self._evict()
+
+    def _evict(self) -> None:
+        """Delete least recently used entries while the directory is over max_bytes."""
+        entries = []
+        for path in self.directory.glob("*" + ENTRY_SUFFIX):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime_ns, st.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries, key=lambda e: e[0]):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            _log.info("Parse cache over %d bytes, evicted %s", self.max_bytes, path.name)
+
+    def stats(self, since: Optional[dict] = None) -> dict:
+        """hits/misses (optionally since an earlier snapshot) for run_summary.json."""
+        return {
+            "path": str(self.directory),
+            "hits": self.hits - (since or {}).get("hits", 0),
+            "misses": self.misses - (since or {}).get("misses", 0),
+        }
@@ -5,65 +5,69 @@ with __row_index__ = 1-based Excel row number.
 """
 
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Optional, Tuple
 
-import pandas as pd
+from src.core.row_table import RowTable
+from src.core.workbook import iter_records, open_workbook
+
+# Rows scanned for the 'Module Name' header row.
+HEADER_SCAN_ROWS = 20
 
 
 def find_header_row(filepath: str) -> Optional[int]:
     """
     Find the 0-based row index where the header (containing 'Module Name') is located.
 
-    Reads the first sheet and scans rows until a cell contains exactly 'Module Name'.
-    Returns None if not found.
+    Scans the first HEADER_SCAN_ROWS rows of the first sheet for a cell containing exactly
+    'Module Name' (the rest of the sheet is not decoded). Returns None if not found.
     """
     path = Path(filepath)
     if not path.exists():
         raise FileNotFoundError(f"Excel file not found: {filepath}")
 
-    # Read without header to scan raw rows
-    df = pd.read_excel(path, header=None, engine="openpyxl")
-    for i in range(min(len(df), 20)):  # Limit scan to first 20 rows
-        row = df.iloc[i]
+    # Scan raw rows; only the first HEADER_SCAN_ROWS rows of the sheet are decoded
+    with open_workbook(path) as session:
+        rows = session.head_rows(0, HEADER_SCAN_ROWS)
+    for i, row in enumerate(rows):
         for val in row:
-            if pd.notna(val) and str(val).strip() == "Module Name":
-                return int(i)
+            if val is not None and str(val).strip() == "Module Name":
+                return i
     return None
 
 
-def parse_excel(filepath: str) -> Tuple[List[dict], int]:
+def parse_excel(filepath: str) -> Tuple[RowTable, int]:
     """
-    Parse Excel file into a list of row dicts and the header row index.
+    Parse Excel file into a RowTable of row dicts and the header row index.
 
     - Uses find_header_row() once to detect header row.
     - Removes column 'Unnamed: 0' if present.
     - Does NOT drop empty rows (they may be HEADER rows for later processing).
     - Adds __row_index__ = Excel sheet row number (1-based): pandas_idx + header_row_index + 2.
-    - Returns (list of row dicts, header_row_index) so callers avoid re-reading the file.
+    - Returns (RowTable(dict) of the rows, header_row_index) so callers avoid re-reading the
+      file; rows are encoded into the table as they are read, no list of dicts is built.
     """
     path = Path(filepath)
     if not path.exists():
         raise FileNotFoundError(f"Excel file not found: {filepath}")
 
-    header_row_index = find_header_row(filepath)
-    if header_row_index is None:
-        raise ValueError(f"No header row containing 'Module Name' found in {filepath}")
-
-    df = pd.read_excel(path, header=header_row_index, engine="openpyxl")
+    with open_workbook(path) as session:
+        header_row_index = find_header_row(filepath)
+        if header_row_index is None:
+            raise ValueError(f"No header row containing 'Module Name' found in {filepath}")
+        df = session.dataframe(0, header=header_row_index)
 
     # Remove index column if present (often exported as 'Unnamed: 0')
     if "Unnamed: 0" in df.columns:
         df = df.drop(columns=["Unnamed: 0"])
 
     # Do not drop empty rows — they can be HEADER rows
-    result: List[dict] = []
-    for pandas_idx, row in df.iterrows():
-        row_dict = row.to_dict()
-        # Excel row number: first data row = header_row_index + 2 (e.g. header at 3 → data at 4)
-        row_dict["__row_index__"] = int(pandas_idx) + header_row_index + 2
-        result.append(row_dict)
-
-    return (result, header_row_index)
+    def records():
+        for pandas_idx, row_dict in enumerate(iter_records(df)):
+            # Excel row number: first data row = header_row_index + 2 (e.g. header at 3 → data at 4)
+            row_dict["__row_index__"] = pandas_idx + header_row_index + 2
+            yield row_dict
+
+    return (RowTable(dict, records()), header_row_index)
 
 
 if __name__ == "__main__":
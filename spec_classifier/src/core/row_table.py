@@ -0,0 +1,439 @@
+"""
+Column-oriented storage for parser and normalizer output (RowTable).
+
+A list of normalized rows keeps one dataclass instance per row (with its own __dict__ and
+boxed values), and a list of parsed rows one dict per row repeating every column key.
+RowTable keeps one column per field instead: a column of ints is an array "q", a column
+of floats an array "d", any other column an array "i" of codes into the column's pool of
+distinct values (strings interned with sys.intern). A column starts with the type of its
+first value and is widened to a pooled column when a value does not fit (and to a plain
+list for unhashable values), so values, including their types, come back as they went in.
+
+RowTable(row_type, rows) holds dataclass rows (NormalizedRow, CiscoNormalizedRow,
+HPENormalizedRow, ...): table[i] and iteration hand out views, instances of a generated
+subclass of row_type whose fields read from (and assign into) the columns. They keep the
+duck-typed NormalizedRow contract: row.module_name, getattr(row, "is_bundle_root", None),
+isinstance(row, HPENormalizedRow), equality with the dataclass row they were built from.
+
+RowTable(dict, rows) holds parsed rows: views are read-only Mappings with the keys of
+the original dict, in its order (rows with different key sets are fine).
+"""
+
+import dataclasses
+import math
+import sys
+from array import array
+from collections.abc import ItemsView, Mapping, Sequence
+from operator import attrgetter
+from typing import Any, Callable, Iterable, Iterator, List, Optional
+
+_Q_MIN, _Q_MAX = -(2 ** 63), 2 ** 63 - 1
+
+
+class _ListValue(tuple):
+    """Pool entry of a list value: stored as a tuple, handed out as a new list."""
+
+    __slots__ = ()
+
+
+def value_key(value):
+    """
+    Dict key for value that tells apart equal values of different types (1, 1.0, True) and
+    -0.0 from 0.0, and gives every float NaN the same key. Raises TypeError if unhashable.
+    """
+    t = type(value)
+    if t is str or value is None:
+        return value
+    if t is float:
+        if value != value:
+            return (float, "nan")
+        if value == 0.0:
+            return (float, math.copysign(1.0, value))  # keep -0.0 apart from 0.0
+        return (float, value)
+    if t is list:
+        return (list, tuple(value))
+    return (t, value)
+
+
+_MISSING = object()
+
+
+def map_distinct(values: Iterable, fn: Callable) -> list:
+    """[fn(v) for v in values], calling fn once per distinct value (by value_key)."""
+    results: dict = {}
+    out = []
+    append = out.append
+    for value in values:
+        if type(value) is str or value is None:
+            key = value  # value_key of a str / None is the value itself
+        else:
+            try:
+                key = value_key(value)
+            except TypeError:
+                append(fn(value))
+                continue
+        result = results.get(key, _MISSING)
+        if result is _MISSING:
+            result = results[key] = fn(value)
+        append(result)
+    return out
+
+
+class _Column:
+    """One column: kind "q" / "d" (typed array), "i" (pool codes) or "o" (list of objects)."""
+
+    __slots__ = ("kind", "data", "pool", "pool_codes")
+
+    def __init__(self):
+        self.kind = None
+        self.data = None
+        self.pool: list = []
+        self.pool_codes: dict = {}
+
+    def append(self, value) -> None:
+        kind = self.kind
+        t = type(value)
+        if kind == "i":
+            # Fast path: a string or None already in the pool (its pool key is the value itself).
+            code = self.pool_codes.get(value) if t is str or value is None else None
+            if code is None:
+                code = self._code(value)
+            if code is not None:
+                self.data.append(code)
+                return
+            self._widen("o")
+        elif kind == "q":
+            if t is int and _Q_MIN <= value <= _Q_MAX:
+                self.data.append(value)
+                return
+            self._widen("i")
+            return self.append(value)
+        elif kind == "d":
+            if t is float:
+                self.data.append(value)
+                return
+            self._widen("i")
+            return self.append(value)
+        elif kind is None:
+            if t is int and _Q_MIN <= value <= _Q_MAX:
+                self.kind, self.data = "q", array("q")
+            elif t is float:
+                self.kind, self.data = "d", array("d")
+            else:
+                self.kind, self.data = "i", array("i")
+            return self.append(value)
+        self.data.append(value)
+
+    def extend(self, values: list) -> None:
+        """append() each value; whole runs of ints / floats / pooled values at C speed."""
+        start = 0
+        if self.kind is None and values:
+            self.append(values[0])
+            start = 1
+        kind = self.kind
+        if kind == "q" and all(type(v) is int for v in values) and _Q_MIN <= min(values) and max(values) <= _Q_MAX:
+            self.data.extend(values[start:])
+            return
+        if kind == "d" and all(type(v) is float for v in values):
+            self.data.extend(values[start:])
+            return
+        if kind == "i":
+            pool_codes, data = self.pool_codes, self.data
+            for i in range(start, len(values)):
+                value = values[i]
+                code = pool_codes.get(value) if type(value) is str or value is None else None
+                if code is None:
+                    code = self._code(value)
+                    if code is None:
+                        start = i
+                        break
+                data.append(code)
+            else:
+                return
+        for value in values[start:]:
+            self.append(value)
+
+    def _code(self, value) -> Optional[int]:
+        """Pool code of value (added to the pool if new); None if value is unhashable."""
+        try:
+            key = value_key(value)
+            code = self.pool_codes.get(key)
+        except TypeError:
+            return None
+        if code is None:
+            code = self.pool_codes[key] = len(self.pool)
+            if type(value) is str:
+                value = sys.intern(value)
+            elif type(value) is list:
+                value = _ListValue(value)
+            self.pool.append(value)
+        return code
+
+    def _widen(self, kind: str) -> None:
+        values = [self[i] for i in range(len(self.data))]
+        self.kind = kind
+        self.data = array("i") if kind == "i" else []
+        self.pool, self.pool_codes = [], {}
+        for value in values:
+            self.append(value)
+
+    def __getitem__(self, index: int):
+        if self.kind == "i":
+            value = self.pool[self.data[index]]
+            return list(value) if type(value) is _ListValue else value
+        return self.data[index]
+
+    def __setitem__(self, index: int, value) -> None:
+        kind = self.kind
+        t = type(value)
+        if (kind == "q" and t is int and _Q_MIN <= value <= _Q_MAX) or (kind == "d" and t is float) or kind == "o":
+            self.data[index] = value
+            return
+        if kind == "i":
+            code = self._code(value)
+            if code is not None:
+                self.data[index] = code
+                return
+            self._widen("o")
+        else:
+            self._widen("i")
+        self[index] = value
+
+    def values(self) -> list:
+        if self.kind == "i" and not any(type(v) is _ListValue for v in self.pool):
+            pool = self.pool
+            return [pool[code] for code in self.data]
+        return [self[i] for i in range(len(self.data))] if self.data is not None else []
+
+    def map(self, fn: Callable) -> list:
+        """[fn(v) for v in self.values()], fn called once per distinct value."""
+        if self.kind == "i":
+            derived = [fn(list(v) if type(v) is _ListValue else v) for v in self.pool]
+            return [derived[code] for code in self.data]
+        return map_distinct(self.values(), fn)
+
+
+# Generated view class per dataclass row type.
+_view_classes: dict = {}
+
+
+def _field_property(name: str) -> property:
+    def fget(self):
+        return self._table._columns[name][self._index]
+
+    def fset(self, value):
+        self._table._columns[name][self._index] = value
+
+    return property(fget, fset, doc=f"{name} (stored in the RowTable column)")
+
+
+def _view_class(row_type: type) -> type:
+    """Subclass of row_type whose fields are properties reading the table's columns."""
+    cls = _view_classes.get(row_type)
+    if cls is not None:
+        return cls
+    names = tuple(f.name for f in dataclasses.fields(row_type))
+
+    def __init__(self, table, index):
+        self._table = table
+        self._index = index
+
+    def __eq__(self, other):
+        if getattr(type(other), "_row_type", type(other)) is not row_type:
+            return NotImplemented
+        return all(getattr(self, n) == getattr(other, n) for n in names)
+
+    def __reduce__(self):
+        return row_type, tuple(getattr(self, n) for n in names)
+
+    namespace = {
+        "__slots__": ("_table", "_index"),
+        "__init__": __init__,
+        "__eq__": __eq__,
+        "__hash__": None,
+        "__reduce__": __reduce__,
+        "__module__": __name__,
+        "_row_type": row_type,
+    }
+    namespace.update((name, _field_property(name)) for name in names)
+    cls = _view_classes[row_type] = type(f"{row_type.__name__}View", (row_type,), namespace)
+    return cls
+
+
+class _RecordItems(ItemsView):
+    """items() of a RecordView, iterated without a key lookup per item."""
+
+    def __iter__(self):
+        view = self._mapping
+        columns, index = view._table._columns, view._index
+        for key in view._keys():
+            yield key, columns[key][index]
+
+
+class RecordView(Mapping):
+    """Read-only Mapping view of one parsed row of a RowTable(dict, ...)."""
+
+    __slots__ = ("_table", "_index")
+
+    def __init__(self, table: "RowTable", index: int):
+        self._table = table
+        self._index = index
+
+    def _keys(self) -> tuple:
+        table = self._table
+        return table._layouts[table._layout_codes[self._index]]
+
+    def __getitem__(self, key):
+        table = self._table
+        if key not in table._layout_sets[table._layout_codes[self._index]]:
+            raise KeyError(key)
+        return table._columns[key][self._index]
+
+    def get(self, key, default=None):
+        table = self._table
+        if key not in table._layout_sets[table._layout_codes[self._index]]:
+            return default
+        return table._columns[key][self._index]
+
+    def __contains__(self, key) -> bool:
+        table = self._table
+        return key in table._layout_sets[table._layout_codes[self._index]]
+
+    def __iter__(self) -> Iterator:
+        return iter(self._keys())
+
+    def __len__(self) -> int:
+        return len(self._keys())
+
+    def items(self) -> ItemsView:
+        return _RecordItems(self)
+
+    def __repr__(self) -> str:
+        return f"RecordView({dict(self)!r})"
+
+    def __reduce__(self):
+        return dict, (dict(self),)
+
+
+class RowTable(Sequence):
+    """
+    Column-oriented list of rows of one type: a dataclass row type, or dict for parsed rows.
+
+    Behaves as a sequence of rows (len, index, slice, iteration, ==) wherever a list of rows
+    is taken; table[i] == rows[i] for the rows it was built from. Rows are encoded on
+    append, so the table can be filled from a generator without the rows ever being held
+    in a list. column(name) decodes one whole column.
+    """
+
+    __slots__ = ("row_type", "_columns", "_size", "_layouts", "_layout_sets", "_layout_codes", "_layout_index")
+
+    def __init__(self, row_type: type = dict, rows: Iterable[Any] = ()):
+        if row_type is not dict and not dataclasses.is_dataclass(row_type):
+            raise ValueError(f"RowTable row_type must be dict or a dataclass, got {row_type!r}")
+        self.row_type = row_type
+        self._size = 0
+        if row_type is dict:
+            self._columns: dict = {}
+            self._layouts: List[tuple] = []
+            self._layout_sets: List[frozenset] = []
+            self._layout_codes = array("i")
+            self._layout_index: dict = {}
+        else:
+            self._columns = {f.name: _Column() for f in dataclasses.fields(row_type)}
+            self._layouts = self._layout_sets = self._layout_codes = self._layout_index = None
+        self.extend(rows)
+
+    def extend(self, rows: Iterable[Any]) -> None:
+        if self.row_type is dict:
+            for row in rows:
+                self._append_record(row)
+            return
+        columns = list(self._columns.values())
+        fields = attrgetter(*self._columns)
+        for row in rows:
+            for column, value in zip(columns, fields(row)):
+                column.append(value)
+            self._size += 1
+
+    def append(self, row) -> None:
+        self.extend((row,))
+
+    @classmethod
+    def from_columns(cls, row_type: type, columns: Mapping[str, Sequence]) -> "RowTable":
+        """Table of dataclass rows from one sequence of values per field, all of one length."""
+        if row_type is dict:
+            raise ValueError("RowTable.from_columns needs a dataclass row type")
+        table = cls(row_type)
+        sizes = {len(columns[name]) for name in table._columns}
+        if len(sizes) > 1:
+            raise ValueError(f"RowTable.from_columns: columns differ in length {sorted(sizes)}")
+        for name, column in table._columns.items():
+            column.extend(list(columns[name]))
+        table._size = sizes.pop() if sizes else 0
+        return table
+
+    def _append_record(self, row: Mapping) -> None:
+        keys = tuple(row)
+        code = self._layout_index.get(keys)
+        if code is None:
+            code = self._layout_index[keys] = len(self._layouts)
+            self._layouts.append(tuple(sys.intern(k) if type(k) is str else k for k in keys))
+            self._layout_sets.append(frozenset(keys))
+            for key in keys:
+                if key not in self._columns:
+                    column = self._columns[key] = _Column()
+                    for _ in range(self._size):
+                        column.append(None)
+        self._layout_codes.append(code)
+        for key, column in self._columns.items():
+            column.append(row[key] if key in row else None)
+        self._size += 1
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return RowTable(self.row_type, (self[i] for i in range(*index.indices(self._size))))
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("RowTable index out of range")
+        if self.row_type is dict:
+            return RecordView(self, index)
+        return _view_class(self.row_type)(self, index)
+
+    def __iter__(self) -> Iterator:
+        view = RecordView if self.row_type is dict else _view_class(self.row_type)
+        for index in range(self._size):
+            yield view(self, index)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, (RowTable, list, tuple)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"RowTable({self.row_type.__name__}, {self._size} rows)"
+
+    @property
+    def column_names(self) -> tuple:
+        """Field names (dataclass rows), or every key seen in the parsed rows in first-seen order."""
+        return tuple(self._columns)
+
+    def column(self, name: str) -> list:
+        """All values of one field (one key of parsed rows: None where a row lacks it)."""
+        if name not in self._columns:
+            raise ValueError(f"Unknown RowTable column: {name}")
+        return self._columns[name].values()
+
+    def map_column(self, name: str, fn: Callable) -> list:
+        """
+        [fn(v) for v in self.column(name)], fn called once per distinct value (once per
+        pool entry of a pooled column, without decoding the column).
+        """
+        if name not in self._columns:
+            raise ValueError(f"Unknown RowTable column: {name}")
+        return self._columns[name].map(fn)
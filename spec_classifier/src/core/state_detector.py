@@ -16,6 +16,119 @@ class State(Enum):
     DISABLED = "DISABLED" # Turned off / disabled
 
 
+class StateDetector:
+    """
+    Compiled state rules (RuleSet.state_detector, built once at load time).
+
+    absent: ordered (regex, State) pairs from absent_keywords — first match wins.
+    overrides: compiled present_override_keywords, consulted only when an ABSENT rule fires.
+    When the patterns allow it, all absent patterns are also joined into one matcher that
+    answers "does any absent rule match?" in a single search — the common PRESENT case —
+    and the overrides into one "does any override match?" matcher.
+    """
+
+    __slots__ = ("absent", "overrides", "_any_absent", "_any_override")
+
+    def __init__(self, absent: tuple, overrides: tuple, combine: bool = True):
+        self.absent = absent
+        self.overrides = overrides
+        self._any_absent = _combine([regex for regex, _ in absent]) if combine and len(absent) > 1 else None
+        self._any_override = _combine(list(overrides)) if combine and len(overrides) > 1 else None
+
+    def detect(self, option_name) -> State:
+        """State of option_name: first matching absent rule (ABSENT unless an override matches), else PRESENT."""
+        if not option_name:
+            return State.PRESENT
+        text = str(option_name).strip()
+        if self._any_absent is not None and self._any_absent(text) is None:
+            return State.PRESENT
+        for regex, state in self.absent:
+            if regex.search(text):
+                if state is State.ABSENT and self._overridden(text):
+                    return State.PRESENT
+                return state
+        return State.PRESENT
+
+    def _overridden(self, text: str) -> bool:
+        if self._any_override is not None:
+            return self._any_override(text) is not None
+        return any(ov.search(text) for ov in self.overrides)
+
+
+# Leading global inline flags, e.g. "(?i)"; inside an alternation they must become scoped "(?i:...)".
+_GLOBAL_FLAGS = re.compile(r"\(\?([aiLmsux]+)\)")
+# Numbered/named back-references and conditionals depend on group numbering: never joined.
+_GROUP_DEPENDENT = re.compile(r"\\[1-9]|\(\?P=|\(\?\(")
+
+
+def _combine(regexes: list):
+    """
+    One search function matching iff any of regexes matches (alternation of the patterns),
+    or None when a pattern cannot be embedded safely (then callers scan them one by one).
+    """
+    parts = []
+    for regex in regexes:
+        pattern = regex.pattern
+        if not isinstance(pattern, str) or _GROUP_DEPENDENT.search(pattern):
+            return None
+        flags = _GLOBAL_FLAGS.match(pattern)
+        if flags:
+            if set(flags.group(1)) & set("aLu"):
+                return None
+            pattern = f"(?{flags.group(1)}:{pattern[flags.end():]})"
+        parts.append(f"(?:{pattern})")
+    try:
+        return re.compile("|".join(parts), re.IGNORECASE).search
+    except re.error:
+        return None
+
+
+def _compile_state_pattern(pattern: str, section: str, rule_id) -> re.Pattern:
+    try:
+        return re.compile(pattern, re.IGNORECASE)
+    except re.error as e:
+        raise ValueError(f"Invalid regex in {section} rule {rule_id!r}: {e} (pattern: {pattern!r})") from e
+
+
+def compile_state_rules(
+    state_rules: Optional[List[dict]],
+    state_override_rules: Optional[List[dict]] = None,
+    profiler=None,
+) -> StateDetector:
+    """
+    Compile absent_keywords and present_override_keywords.
+
+    Rules without pattern/state, or with a state that is not a State value, are dropped:
+    detect_state used to skip them after matching, which has the same outcome.
+    Raises ValueError (with rule_id) on a malformed pattern.
+    profiler: optional RuleProfiler; each pattern is wrapped to count/time its searches
+    (and patterns are not joined, so every rule's searches are counted).
+    """
+    absent = []
+    for index, rule in enumerate(state_rules or []):
+        pattern = rule.get("pattern")
+        state_str = rule.get("state")
+        if not pattern or not state_str:
+            continue
+        try:
+            state = State(state_str)
+        except ValueError:
+            continue
+        section = "state_rules.absent_keywords"
+        regex = _compile_state_pattern(pattern, section, rule.get("rule_id"))
+        if profiler is not None:
+            regex = profiler.wrap(section, rule.get("rule_id") or f"#{index}", regex)
+        absent.append((regex, state))
+    overrides = []
+    for index, ov in enumerate(state_override_rules or []):
+        section = "state_rules.present_override_keywords"
+        regex = _compile_state_pattern(ov.get("pattern") or "", section, ov.get("rule_id"))
+        if profiler is not None:
+            regex = profiler.wrap(section, ov.get("rule_id") or f"#{index}", regex)
+        overrides.append(regex)
+    return StateDetector(tuple(absent), tuple(overrides), combine=profiler is None)
+
+
 def detect_state(option_name: str, state_rules, state_override_rules: Optional[List[dict]] = None) -> State:
     """
     Determine state from option name using regex patterns from state_rules.
@@ -23,25 +136,13 @@ def detect_state(option_name: str, state_rules, state_override_rules: Optional[L
     Each rule is a dict with "pattern" (regex) and "state" (str: ABSENT or DISABLED).
     First matching rule wins; if none match, returns PRESENT.
     If a rule would yield ABSENT and state_override_rules has a matching pattern (e.g. Blank(s)), returns PRESENT.
-    state_rules may be a list (absent rules) or a tuple (absent_list, override_list).
+    state_rules may be a list (absent rules), a tuple (absent_list, override_list),
+    or a StateDetector (RuleSet.state_detector — no per-call compilation).
     """
     if not option_name:
         return State.PRESENT
-    if isinstance(state_rules, tuple) and len(state_rules) == 2:
-        state_rules, state_override_rules = state_rules[0], state_rules[1]
-    text = str(option_name).strip()
-    for rule in state_rules:
-        pattern = rule.get("pattern")
-        state_str = rule.get("state")
-        if not pattern or not state_str:
-            continue
-        if re.search(pattern, text, re.IGNORECASE):
-            if state_str == "ABSENT" and state_override_rules:
-                for ov in state_override_rules:
-                    if re.search(ov.get("pattern") or "", text, re.IGNORECASE):
-                        return State.PRESENT
-            try:
-                return State(state_str)
-            except ValueError:
-                continue
-    return State.PRESENT
+    if not isinstance(state_rules, StateDetector):
+        if isinstance(state_rules, tuple) and len(state_rules) == 2:
+            state_rules, state_override_rules = state_rules[0], state_rules[1]
+        state_rules = compile_state_rules(state_rules, state_override_rules)
+    return state_rules.detect(option_name)
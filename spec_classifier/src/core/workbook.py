@@ -0,0 +1,452 @@
+"""
+WorkbookSession: one opened input workbook shared by can_parse, parse and the annotated export.
+
+The file is read from disk once. Each read mode it is asked for — cached formula values
+(data_only=True, what pandas reads) or stored formulas (data_only=False) — is opened
+once, and each sheet is decoded once, on demand, into row tuples that stay cached for
+the life of the session. reader picks the decoder: "openpyxl" (read_only workbooks) or
+"native" (src/core/xlsx_reader.py: the same values straight from the zip with iterparse;
+a workbook it cannot read falls back to openpyxl).
+
+open_workbook(path) is the entry point: inside `with open_workbook(path):` every nested
+open_workbook(path) call (adapter.can_parse, adapter.parse, annotated_writer, batch_audit)
+gets the same session (unless it asks for another reader); outside of one, it opens a
+session for the duration of the block.
+
+Row and DataFrame views reproduce what the code used to read directly:
+  iter_rows(sheet, max_row)  — openpyxl ws.iter_rows(values_only=True), including its
+                               clipping to the sheet's declared dimensions;
+  dataframe(sheet, header)   — pd.read_excel(path, sheet_name=sheet, header=header,
+                               engine="openpyxl"), assembled by the same rules;
+  head_rows(sheet, count)    — the first count rows of that DataFrame's source, raw, for
+                               header scans that must not decode the whole sheet.
+"""
+
+import hashlib
+import io
+import logging
+from contextlib import contextmanager
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Union
+
+import numpy as np
+import openpyxl
+import pandas as pd
+
+from src.core.xlsx_reader import XlsxReaderError, XlsxWorkbook, XlsxWorksheet
+
+_log = logging.getLogger(__name__)
+
+SheetRef = Union[str, int]
+
+# Row decoders (config.yaml excel_reader); DEFAULT_READER when none is configured.
+READERS = ("openpyxl", "native")
+DEFAULT_READER = "openpyxl"
+
+# iter_records converts this many rows of the frame to Python lists at a time.
+_RECORDS_CHUNK = 4096
+
+
+def excel_reader(config: dict, vendor: str) -> str:
+    """Reader for vendor's input files: config excel_reader.<vendor>, else excel_reader.default."""
+    readers = config.get("excel_reader") or {}
+    return readers.get(vendor) or readers.get("default") or DEFAULT_READER
+
+# Sessions of the enclosing open_workbook() blocks, by resolved path.
+_active: Dict[str, "WorkbookSession"] = {}
+
+
+class _Sheet:
+    """
+    Decoded rows of one worksheet, filled on demand.
+
+    rows are read with the declared dimensions reset (as pandas reads): every row of the
+    sheet XML, as wide as its last cell, missing rows as (). errors: (row, col) of error
+    cells, which pandas reads as NaN. max_row / max_col: the declared dimensions that a
+    plain openpyxl iter_rows() clips to (None when the sheet declares none).
+    """
+
+    __slots__ = ("ws", "rows", "errors", "max_row", "max_col", "_source")
+
+    def __init__(self, ws):
+        self.ws = ws
+        self.rows: List[tuple] = []
+        self.errors: set = set()
+        self.max_row, self.max_col = ws.max_row, ws.max_column
+        ws.reset_dimensions()
+        self._source = _value_rows(ws, self.errors)
+
+    @property
+    def complete(self) -> bool:
+        return self._source is None
+
+    def fill(self, count: Optional[int] = None) -> None:
+        """Decode rows until count rows are cached (None: the whole sheet)."""
+        source = self._source
+        if source is None:
+            return
+        rows = self.rows
+        while count is None or len(rows) < count:
+            row = next(source, None)
+            if row is None:
+                self._source = None
+                return
+            rows.append(row)
+
+
+class WorkbookSession:
+    """
+    One input workbook, read from disk once. Row views come from read_only workbooks
+    (one per data_only mode used) of the chosen reader; editable_copy() loads a full
+    openpyxl workbook from the same bytes for callers that modify and save it (batch_audit).
+    """
+
+    def __init__(self, path: Union[str, Path], reader: str = DEFAULT_READER):
+        if reader not in READERS:
+            raise ValueError(f"Unknown excel reader: {reader!r}. Available: {list(READERS)}")
+        self.path = Path(path)
+        if not self.path.exists():
+            raise FileNotFoundError(f"Excel file not found: {self.path}")
+        self.reader = reader
+        self._data = self.path.read_bytes()
+        self._sha256: Optional[str] = None
+        self._books: dict = {}
+        self._sheets: dict = {}
+        # Results derived from this workbook by a vendor module (e.g. the Lenovo sheet
+        # probe), keyed by that module: computed by can_parse, reused by parse.
+        self.probes: dict = {}
+
+    @property
+    def sha256(self) -> str:
+        """SHA-256 (hex) of the file as read."""
+        if self._sha256 is None:
+            self._sha256 = hashlib.sha256(self._data).hexdigest()
+        return self._sha256
+
+    # ── workbooks ────────────────────────────────────────────────────────────
+
+    def _book(self, data_only: bool):
+        book = self._books.get(data_only)
+        if book is None:
+            if self.reader == "native":
+                try:
+                    # Both modes share one package (manifest, styles, shared strings).
+                    book = XlsxWorkbook(next(iter(self._books.values()), None) or self._data, data_only=data_only)
+                except XlsxReaderError as e:
+                    _log.info("Native xlsx reader unavailable for %s (%s), using openpyxl", self.path.name, e)
+                    self.reader = "openpyxl"
+            if book is None:
+                book = openpyxl.load_workbook(
+                    io.BytesIO(self._data), read_only=True, data_only=data_only, keep_links=False
+                )
+            self._books[data_only] = book
+        return book
+
+    def editable_copy(self):
+        """A new full workbook (openpyxl.load_workbook(path)) to modify and save elsewhere."""
+        return openpyxl.load_workbook(io.BytesIO(self._data))
+
+    @property
+    def sheet_names(self) -> List[str]:
+        """Sheet names in workbook order (from whichever mode is already open)."""
+        book = next(iter(self._books.values()), None) or self._book(data_only=True)
+        return list(book.sheetnames)
+
+    def _sheet(self, sheet: SheetRef, data_only: bool) -> _Sheet:
+        book = self._book(data_only)
+        ws = book.worksheets[sheet] if isinstance(sheet, int) else book[sheet]
+        key = (ws.title, data_only)
+        cached = self._sheets.get(key)
+        if cached is None:
+            cached = self._sheets[key] = _Sheet(ws)
+        return cached
+
+    # ── row views ────────────────────────────────────────────────────────────
+
+    def iter_rows(self, sheet: SheetRef = 0, max_row: Optional[int] = None, data_only: bool = True) -> Iterator[tuple]:
+        """
+        Rows of sheet (name, or index into the worksheets) as value tuples, like openpyxl
+        ws.iter_rows(max_row=max_row, values_only=True) on a read_only workbook: clipped to
+        the declared dimensions unless max_row is given. Rows are decoded only as far as
+        the caller iterates.
+        """
+        s = self._sheet(sheet, data_only)
+        yield from _clipped(_cached_rows(s), max_row or s.max_row, s.max_col)
+
+    def rows(self, sheet: SheetRef = 0, data_only: bool = True) -> List[tuple]:
+        """list(iter_rows(sheet)) — every row of the sheet."""
+        return list(self.iter_rows(sheet, data_only=data_only))
+
+    def stream_rows(self, sheet: SheetRef = 0, data_only: bool = True) -> Iterator[tuple]:
+        """
+        Same rows as iter_rows(sheet), for single-pass readers of large sheets: unless the
+        sheet is already fully cached, rows are decoded by a separate iterator and not kept, so memory stays at one row (a later iter_rows()/dataframe() of the sheet
+        decodes it again).
+        """
+        s = self._sheet(sheet, data_only)
+        rows = iter(s.rows) if s.complete else _value_rows(s.ws)
+        yield from _clipped(rows, s.max_row, s.max_col)
+
+    def head_rows(self, sheet: SheetRef = 0, count: int = 20) -> List[tuple]:
+        """
+        The first count rows of sheet as dataframe(sheet, header=None) numbers them (cached
+        values, declared dimensions ignored), as raw tuples; decodes no further. For header
+        scans: row i here is DataFrame row i.
+        """
+        s = self._sheet(sheet, data_only=True)
+        s.fill(count)
+        return s.rows[:count]
+
+    def dataframe(self, sheet: SheetRef = 0, header: Optional[int] = 0, dtype=None) -> pd.DataFrame:
+        """pd.read_excel(path, sheet_name=sheet, header=header, dtype=dtype, engine="openpyxl")."""
+        s = self._sheet(sheet, data_only=True)
+        s.fill()
+        data = []
+        last_row_with_data = -1
+        errors = s.errors
+        for r, row in enumerate(s.rows):
+            converted = [_pandas_cell(v, errors and (r, c) in errors) for c, v in enumerate(row)]
+            while converted and converted[-1] == "":
+                converted.pop()
+            if converted:
+                last_row_with_data = r
+            data.append(converted)
+        data = data[: last_row_with_data + 1]
+        if not data:
+            return pd.DataFrame()
+        width = max(len(row) for row in data)
+        data = [row + [""] * (width - len(row)) for row in data]
+        return _frame(data, header, dtype)
+
+    def close(self) -> None:
+        for book in self._books.values():
+            book.close()
+        self._books.clear()
+        self._sheets.clear()
+
+
+def _value_rows(ws, errors: Optional[set] = None) -> Iterator[tuple]:
+    """
+    Every row of ws (dimensions reset) as a value tuple; errors, when given, receives the
+    (row, col) of each error cell.
+    """
+    if isinstance(ws, XlsxWorksheet):
+        return ws.iter_values(errors)
+    if errors is None:
+        # (read_only openpyxl yields a missing row as [] — a tuple like every other row)
+        return map(tuple, ws.iter_rows(values_only=True))
+    return _openpyxl_value_rows(ws, errors)
+
+
+def _openpyxl_value_rows(ws, errors: set) -> Iterator[tuple]:
+    for r, cells in enumerate(ws.iter_rows()):
+        for c, cell in enumerate(cells):
+            if cell.data_type == "e":
+                errors.add((r, c))
+        yield tuple(cell.value for cell in cells)
+
+
+def _cached_rows(s: _Sheet) -> Iterator[tuple]:
+    """Rows of s, decoding more as the cache runs out."""
+    i = 0
+    while True:
+        if i >= len(s.rows):
+            s.fill(i + 1)
+            if i >= len(s.rows):
+                return
+        yield s.rows[i]
+        i += 1
+
+
+def _clipped(rows: Iterator[tuple], limit: Optional[int], width: Optional[int]) -> Iterator[tuple]:
+    """rows cut to limit rows and padded/cut to width cells, as a read_only iter_rows() does."""
+    if limit is not None:
+        rows = islice(rows, limit)
+    for row in rows:
+        if width is not None and len(row) != width:
+            row = row[:width] + (None,) * (width - len(row))
+        yield row
+
+
+def _record_values(df: pd.DataFrame):
+    """df as one ndarray, with the values iterrows() would give (common dtype, Timestamps)."""
+    values = df.to_numpy()
+    if values.dtype.kind in "mM":
+        # Datetime-only frame: iterrows yields Timestamps, ndarray.tolist() would give datetimes.
+        values = df.astype(object).to_numpy()
+    return values
+
+
+def iter_records(df: pd.DataFrame) -> Iterator[dict]:
+    """
+    Rows of df as dicts, equal to row.to_dict() for each row of df.iterrows() (same
+    common-dtype upcasting, NaN for empty cells) without building a Series per row.
+    Rows are converted a chunk at a time, so a consumer that does not keep the dicts (e.g.
+    RowTable) never holds the whole frame as lists.
+    """
+    columns = list(df.columns)
+    values = _record_values(df)
+    for start in range(0, len(values), _RECORDS_CHUNK):
+        for row in values[start:start + _RECORDS_CHUNK].tolist():
+            yield dict(zip(columns, row))
+
+
+def frame_columns(df: pd.DataFrame) -> dict:
+    """
+    {column name: list of values} of df, each value as iter_records(df) hands it out (a
+    repeated column name keeps its last column, as in the record dicts).
+    """
+    values = _record_values(df)
+    return {name: values[:, j].tolist() for j, name in enumerate(df.columns)}
+
+
+def _pandas_cell(value, is_error: bool):
+    """
+    A cell as read_excel's openpyxl engine hands it on: empty is "", an error cell NaN, a
+    whole-number float an int.
+    """
+    if value is None:
+        return ""
+    if is_error:
+        return float("nan")
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        as_int = int(value)
+        return as_int if as_int == value else float(value)
+    return value
+
+
+# read_excel's default na_values: a cell holding one of these strings reads as NaN.
+_NA_STRINGS = frozenset({
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND",
+    "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+})
+_TRUE_STRINGS = frozenset({"True", "TRUE", "true"})
+_FALSE_STRINGS = frozenset({"False", "FALSE", "false"})
+
+
+def _frame(data: List[list], header: Optional[int], dtype) -> pd.DataFrame:
+    """
+    The DataFrame read_excel builds from data (rows of _pandas_cell values, all one width):
+    column names from row header, then each column converted as by _column.
+    """
+    if header is None:
+        names = list(range(len(data[0])))
+        body = data
+    else:
+        if header >= len(data):
+            raise ValueError(f"Passed header={header}, but only {len(data)} lines in file")
+        names = _header_names(data[header])
+        body = data[header + 1:]
+    if not body:
+        return pd.DataFrame({name: pd.Series([], dtype=dtype or object) for name in names}, columns=names)
+    columns = {}
+    for j, name in enumerate(names):
+        values = np.empty(len(body), dtype=object)
+        values[:] = [row[j] for row in body]
+        columns[name] = _column(values, dtype)
+    return pd.DataFrame(columns, columns=names, index=pd.RangeIndex(len(body)))
+
+
+def _header_names(row: list) -> list:
+    """
+    Column names from a header row: a blank cell is "Unnamed: i"; a repeated name gets a
+    ".n" suffix (named columns are numbered before unnamed ones).
+    """
+    names = [f"Unnamed: {i}" if v == "" else v for i, v in enumerate(row)]
+    unnamed = [i for i, v in enumerate(row) if v == ""]
+    counts: Dict[object, int] = {}
+    for i in [i for i in range(len(names)) if i not in unnamed] + unnamed:
+        name = base = names[i]
+        count = counts.get(name, 0)
+        while count > 0:
+            counts[base] = count + 1
+            name = f"{base}.{count}"
+            count = count + 1 if name in names else counts.get(name, 0)
+        names[i] = name
+        counts[name] = count + 1
+    return names
+
+
+def _column(values: np.ndarray, dtype) -> np.ndarray:
+    """
+    One column of cell values as read_excel types it: NA strings become NaN; then, with no
+    dtype, an all-numeric column becomes numeric and one of True/False values and blanks
+    bool (object if it has blanks; anything else stays object, for the DataFrame to infer);
+    dtype=str casts each value to str.
+    """
+    cleaned = [np.nan if isinstance(v, str) and v in _NA_STRINGS else v for v in values]
+    if dtype is None:
+        try:
+            numeric = pd.to_numeric(np.array(cleaned, dtype=object))
+        except (ValueError, TypeError):
+            pass
+        else:
+            if numeric.dtype != object or isinstance(numeric[0], int):
+                return numeric
+            # whole numbers past int64 next to other values: left as read
+            return _bool_column(values)
+    # read_excel also collapses equal values of a non-numeric column to the first seen
+    # (a 0 after a False reads as False).
+    seen: dict = {}
+    values[:] = [seen.setdefault(v, v) for v in cleaned]
+    if dtype is not None:
+        dtype = pd.api.types.pandas_dtype(dtype)
+        if isinstance(dtype, pd.api.extensions.ExtensionDtype):
+            return pd.array(values, dtype=dtype)
+        return np.array([v if _is_nan(v) else str(v) for v in values], dtype=object)
+    if isinstance(values[0], int):
+        return values
+    return _bool_column(values)
+
+
+def _bool_column(values: np.ndarray) -> np.ndarray:
+    """values as bools if each is True/False (or its text) or NaN, else values unchanged."""
+    flags = []
+    for v in values:
+        if isinstance(v, bool):
+            flags.append(v)
+        elif isinstance(v, str) and v in _TRUE_STRINGS:
+            flags.append(True)
+        elif isinstance(v, str) and v in _FALSE_STRINGS:
+            flags.append(False)
+        elif _is_nan(v):
+            flags.append(v)
+        else:
+            return values
+    return np.array(flags, dtype=object if any(_is_nan(v) for v in flags) else bool)
+
+
+def _is_nan(value) -> bool:
+    return isinstance(value, float) and value != value
+
+
+def is_open(path: Union[str, Path]) -> bool:
+    """True inside an open_workbook(path) block: its session, and what it cached, outlive the caller."""
+    return str(Path(path).resolve()) in _active
+
+
+@contextmanager
+def open_workbook(path: Union[str, Path], reader: Optional[str] = None) -> Iterator[WorkbookSession]:
+    """
+    The session of an enclosing open_workbook(path) block, or a new one (decoding with
+    reader, DEFAULT_READER when None) that is shared with nested calls and closed when this
+    block exits. A reader given explicitly that differs from the enclosing session's gets a
+    new session for this block (main.py: --vendor auto detects with the default reader, then
+    runs the detected vendor's excel_reader); nested calls without a reader share it.
+    """
+    key = str(Path(path).resolve())
+    outer = _active.get(key)
+    if outer is not None and (reader is None or reader == outer.reader):
+        yield outer
+        return
+    session = WorkbookSession(path, reader=reader or DEFAULT_READER)
+    _active[key] = session
+    try:
+        yield session
+    finally:
+        if outer is None:
+            del _active[key]
+        else:
+            _active[key] = outer
+        session.close()
@@ -0,0 +1,388 @@
+"""
+Native XLSX reader: sheet rows straight from the xlsx zip, without openpyxl's object model.
+
+The package is read with zipfile; sharedStrings.xml and each worksheet XML are streamed with
+xml.etree.ElementTree.iterparse and every row comes out as a plain value tuple. Cell values
+are decoded exactly as a read_only openpyxl workbook decodes them (WorkSheetParser.parse_cell):
+the same number casting, date styles and epoch, booleans, shared and inline strings, error
+strings, and — with data_only=False — the same formula strings (shared formulas translated,
+array / data table formulas as openpyxl's formula objects). Row numbering follows
+ReadOnlyWorksheet._cells_by_row with the dimensions reset: missing rows come out as (),
+each row is as wide as its last cell.
+
+XlsxWorkbook / XlsxWorksheet expose the subset of the read_only workbook API that
+WorkbookSession uses (sheetnames, worksheets, [name], max_row / max_column,
+reset_dimensions(), close()); rows are read with XlsxWorksheet.iter_values().
+A package the reader cannot open (not a zip, missing or malformed parts) raises
+XlsxReaderError from XlsxWorkbook(), and WorkbookSession falls back to openpyxl — which
+reads it or reports the error the way it always has.
+"""
+
+import io
+import posixpath
+import warnings
+import zipfile
+from typing import Dict, Iterator, List, Optional, Set, Union
+from xml.etree.ElementTree import XML, iterparse
+
+from openpyxl.formula.translate import Translator
+from openpyxl.styles.numbers import builtin_format_code, is_date_format, is_timedelta_format
+from openpyxl.utils.cell import column_index_from_string, range_boundaries
+from openpyxl.utils.datetime import CALENDAR_MAC_1904, CALENDAR_WINDOWS_1900, from_excel, from_ISO8601
+from openpyxl.worksheet.formula import ArrayFormula, DataTableFormula
+
+_MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_PKG_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+_CT_NS = "http://schemas.openxmlformats.org/package/2006/content-types"
+
+_ROW = f"{{{_MAIN_NS}}}row"
+_V = f"{{{_MAIN_NS}}}v"
+_F = f"{{{_MAIN_NS}}}f"
+_IS = f"{{{_MAIN_NS}}}is"
+_T = f"{{{_MAIN_NS}}}t"
+_R = f"{{{_MAIN_NS}}}r"
+_SI = f"{{{_MAIN_NS}}}si"
+_DIMENSION = f"{{{_MAIN_NS}}}dimension"
+_SHEET_DATA = f"{{{_MAIN_NS}}}sheetData"
+
+_WORKBOOK_TYPES = (
+    "application/vnd.ms-excel.template.macroEnabled.main+xml",
+    "application/vnd.openxmlformats-officedocument.spreadsheetml.template.main+xml",
+    "application/vnd.ms-excel.sheet.macroEnabled.main+xml",
+    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml",
+)
+_SHARED_STRINGS_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"
+_STYLES_PATH = "xl/styles.xml"
+
+_DIGITS = "0123456789"
+
+
+class XlsxReaderError(ValueError):
+    """The native reader cannot open the package."""
+
+
+class XlsxWorksheet:
+    """One worksheet of an XlsxWorkbook (read_only openpyxl worksheet subset)."""
+
+    def __init__(self, book: "XlsxWorkbook", title: str, path: str):
+        self.book = book
+        self.title = title
+        self._path = path
+        self.max_row: Optional[int] = None
+        self.max_column: Optional[int] = None
+        with book._package.archive.open(path) as src:
+            for _, element in iterparse(src):
+                if element.tag == _DIMENSION:
+                    ref = element.get("ref")
+                    if ref:
+                        _min_col, _min_row, self.max_column, self.max_row = range_boundaries(ref)
+                    break
+                if element.tag == _SHEET_DATA:
+                    break
+                element.clear()
+
+    def reset_dimensions(self) -> None:
+        self.max_row = self.max_column = None
+
+    def iter_values(self, errors: Optional[Set[tuple]] = None) -> Iterator[tuple]:
+        """
+        Every row of the sheet as a value tuple (what iter_rows(values_only=True) yields
+        after reset_dimensions(), a missing row as ()). errors: when given, receives
+        (row, col) — 0-based, as yielded — of every error cell.
+        """
+        data_only = self.book.data_only
+        package = self.book._package
+        strings = package.shared_strings()
+        date_styles, timedelta_styles, epoch = package.date_styles, package.timedelta_styles, package.epoch
+        columns: Dict[str, int] = {}
+        shared_formulae: Dict[str, Translator] = {}
+        row_counter = 0
+        counter = 1
+        r = 0
+        sheet_data = None
+        with package.archive.open(self._path) as src:
+            for event, element in iterparse(src, ("start", "end")):
+                if event == "start":
+                    if sheet_data is None and element.tag == _SHEET_DATA:
+                        sheet_data = element
+                    continue
+                if element.tag != _ROW:
+                    continue
+                if sheet_data is not None:
+                    # Drop the row from sheetData: memory stays at one row, whatever the sheet size.
+                    sheet_data.remove(element)
+                number = element.get("r")
+                if number is not None:
+                    try:
+                        row_counter = int(number)
+                    except ValueError:
+                        as_float = float(number)
+                        if not as_float.is_integer():
+                            raise ValueError(f"{number} is not a valid row number")
+                        row_counter = int(as_float)
+                else:
+                    row_counter += 1
+                while counter < row_counter:
+                    counter += 1
+                    r += 1
+                    yield ()
+                if counter > row_counter:
+                    # (openpyxl skips rows that come out of order)
+                    element.clear()
+                    continue
+                counter += 1
+
+                values: list = []
+                row_errors = None
+                col = 0
+                for cell in element:
+                    ref = cell.get("r")
+                    if ref:
+                        letters = ref.rstrip(_DIGITS)
+                        col = columns.get(letters)
+                        if col is None:
+                            col = columns[letters] = column_index_from_string(letters.replace("$", "").upper())
+                    else:
+                        col += 1
+                    data_type = cell.get("t", "n")
+                    v = formula = inline = None
+                    for child in cell:
+                        tag = child.tag
+                        if tag == _V:
+                            if v is None:
+                                v = child
+                        elif tag == _F:
+                            if formula is None:
+                                formula = child
+                        elif tag == _IS:
+                            if inline is None:
+                                inline = child
+                    value = v.text or None if v is not None and data_type != "inlineStr" else None
+
+                    if not data_only and formula is not None:
+                        data_type = "f"
+                        value = _formula(formula, ref, shared_formulae)
+                    elif value is not None:
+                        if data_type == "n":
+                            value = float(value) if ("." in value or "E" in value or "e" in value) else int(value)
+                            style = cell.get("s")
+                            style = int(style) if style else 0
+                            if style in date_styles:
+                                try:
+                                    value = from_excel(value, epoch, timedelta=style in timedelta_styles)
+                                except (OverflowError, ValueError):
+                                    warnings.warn(
+                                        f"Cell {ref} is marked as a date but the serial value {value} is outside "
+                                        "the limits for dates. The cell will be treated as an error."
+                                    )
+                                    data_type = "e"
+                                    value = "#VALUE!"
+                        elif data_type == "s":
+                            value = strings[int(value)]
+                        elif data_type == "b":
+                            value = bool(int(value))
+                        elif data_type == "d":
+                            value = from_ISO8601(value)
+                    elif data_type == "inlineStr" and inline is not None:
+                        value = _text(inline)
+
+                    n = len(values)
+                    if col > n:
+                        if col > n + 1:
+                            values.extend([None] * (col - n - 1))
+                        values.append(value)
+                    else:
+                        values[col - 1] = value
+                    if errors is not None:
+                        if data_type == "e":
+                            if row_errors is None:
+                                row_errors = set()
+                            row_errors.add(col - 1)
+                        elif row_errors:
+                            row_errors.discard(col - 1)
+                element.clear()
+
+                # A row is as wide as its last cell.
+                if len(values) > col:
+                    del values[col:]
+                if row_errors:
+                    errors.update((r, c) for c in row_errors if c < col)
+                r += 1
+                yield tuple(values)
+
+
+class XlsxWorkbook:
+    """
+    The worksheets of an xlsx package (bytes), read_only openpyxl workbook subset.
+    Shared strings are decoded on first use.
+    """
+
+    def __init__(self, data: Union[bytes, "XlsxWorkbook"], data_only: bool = True):
+        """data: the xlsx bytes, or an XlsxWorkbook of the same file (other data_only mode) to share its package."""
+        self.data_only = data_only
+        if isinstance(data, XlsxWorkbook):
+            self._package = data._package
+        else:
+            self._package = _Package(data)
+        self.worksheets = [
+            XlsxWorksheet(self, name, path) for name, path, chartsheet in self._package.sheets if not chartsheet
+        ]
+
+    @property
+    def sheetnames(self) -> List[str]:
+        return [name for name, _, _ in self._package.sheets]
+
+    def __getitem__(self, name: str) -> XlsxWorksheet:
+        for ws in self.worksheets:
+            if ws.title == name:
+                return ws
+        raise KeyError(f"Worksheet {name} does not exist.")
+
+    def close(self) -> None:
+        self._package.close()
+
+
+class _Package:
+    """Manifest, workbook part, relationships, styles and shared strings of one xlsx file."""
+
+    def __init__(self, data: bytes):
+        try:
+            self.archive = zipfile.ZipFile(io.BytesIO(data))
+        except zipfile.BadZipFile as e:
+            raise XlsxReaderError(f"Not an xlsx package: {e}") from e
+        self._strings: Optional[List[str]] = None
+        names = set(self.archive.namelist())
+        try:
+            manifest = XML(self.archive.read("[Content_Types].xml"))
+            overrides = [(o.get("PartName"), o.get("ContentType")) for o in manifest.iter(f"{{{_CT_NS}}}Override")]
+            workbook_part = _find_part(overrides, _WORKBOOK_TYPES)
+            if workbook_part is None:
+                # (some producers only declare the workbook type as the default content type)
+                defaults = {d.get("ContentType") for d in manifest.iter(f"{{{_CT_NS}}}Default")}
+                if not defaults.intersection(_WORKBOOK_TYPES):
+                    raise XlsxReaderError("No workbook part in the package manifest")
+                workbook_part = "/xl/workbook.xml"
+            strings_part = _find_part(overrides, (_SHARED_STRINGS_TYPE,))
+            self.strings_path = strings_part[1:] if strings_part else None
+
+            workbook_path = workbook_part[1:]
+            workbook = XML(self.archive.read(workbook_path))
+            properties = workbook.find(f"{{{_MAIN_NS}}}workbookPr")
+            date1904 = properties.get("date1904") if properties is not None else None
+            self.epoch = CALENDAR_MAC_1904 if date1904 not in (None, "", "false", "f", "0") else CALENDAR_WINDOWS_1900
+
+            rels = _relationships(self.archive, workbook_path)
+            self.sheets = []
+            for sheet in workbook.iter(f"{{{_MAIN_NS}}}sheet"):
+                rid = sheet.get(f"{{{_REL_NS}}}id")
+                if not rid:
+                    continue
+                rel_type, target = rels[rid]
+                if target not in names:
+                    continue
+                # Chartsheets are listed in sheetnames but are not worksheets (as in openpyxl).
+                self.sheets.append((sheet.get("name"), target, "chartsheet" in rel_type))
+
+            self.date_styles, self.timedelta_styles = _date_styles(self.archive, names)
+        except (KeyError, SyntaxError) as e:
+            # (ElementTree's ParseError is a SyntaxError)
+            raise XlsxReaderError(f"Unreadable package part: {e}") from e
+
+    def shared_strings(self) -> List[str]:
+        """The shared string table, decoded on first use ([] when the package has none)."""
+        if self._strings is None:
+            strings = []
+            if self.strings_path is None:
+                self._strings = strings
+                return strings
+            with self.archive.open(self.strings_path) as src:
+                for _, element in iterparse(src):
+                    if element.tag == _SI:
+                        strings.append(_text(element).replace("x005F_", ""))
+                        element.clear()
+            self._strings = strings
+        return self._strings
+
+    def close(self) -> None:
+        self.archive.close()
+
+
+def _find_part(overrides, content_types) -> Optional[str]:
+    for wanted in content_types:
+        for part_name, content_type in overrides:
+            if content_type == wanted:
+                return part_name
+    return None
+
+
+def _relationships(archive: zipfile.ZipFile, part_path: str) -> Dict[str, tuple]:
+    """{rId: (Type, target path in the archive)} of part_path, like openpyxl get_dependents."""
+    folder, name = posixpath.split(part_path)
+    rels_path = posixpath.join(folder, "_rels", f"{name}.rels")
+    rels = {}
+    for rel in XML(archive.read(rels_path)).iter(f"{{{_PKG_REL_NS}}}Relationship"):
+        target = rel.get("Target")
+        if rel.get("TargetMode") != "External":
+            target = target[1:] if target.startswith("/") else posixpath.normpath(posixpath.join(folder, target))
+        rels[rel.get("Id")] = (rel.get("Type") or "", target)
+    return rels
+
+
+def _date_styles(archive: zipfile.ZipFile, names: set) -> tuple:
+    """Indexes of the cellXfs styles whose number format is a date / a timedelta (openpyxl Stylesheet)."""
+    if _STYLES_PATH not in names:
+        return set(), set()
+    styles = XML(archive.read(_STYLES_PATH))
+    custom = {}
+    num_fmts = styles.find(f"{{{_MAIN_NS}}}numFmts")
+    if num_fmts is not None:
+        for fmt in num_fmts.iter(f"{{{_MAIN_NS}}}numFmt"):
+            custom[int(fmt.get("numFmtId"))] = fmt.get("formatCode")
+    dates, timedeltas = set(), set()
+    cell_xfs = styles.find(f"{{{_MAIN_NS}}}cellXfs")
+    if cell_xfs is None:
+        return dates, timedeltas
+    for idx, xf in enumerate(cell_xfs.iter(f"{{{_MAIN_NS}}}xf")):
+        fmt_id = int(xf.get("numFmtId", 0))
+        fmt = custom[fmt_id] if fmt_id in custom else builtin_format_code(fmt_id)
+        if is_date_format(fmt):
+            dates.add(idx)
+        if is_timedelta_format(fmt):
+            timedeltas.add(idx)
+    return dates, timedeltas
+
+
+def _text(element) -> str:
+    """Text of a string item (<si> / <is>): its plain <t>, then its rich text runs (openpyxl Text.content)."""
+    plain = None
+    runs = []
+    for child in element:
+        if child.tag == _T:
+            plain = child.text
+        elif child.tag == _R:
+            t = child.find(_T)
+            if t is not None and t.text is not None:
+                runs.append(t.text)
+    if plain is not None:
+        runs.insert(0, plain)
+    return "".join(runs)
+
+
+def _formula(formula, ref: Optional[str], shared_formulae: Dict[str, Translator]):
+    """The value of a formula cell with data_only=False (openpyxl WorkSheetParser.parse_formula)."""
+    formula_type = formula.get("t")
+    value = "="
+    if formula.text is not None:
+        value += formula.text
+    if formula_type == "array":
+        value = ArrayFormula(ref=formula.get("ref"), text=value)
+    elif formula_type == "shared":
+        idx = formula.get("si")
+        if idx in shared_formulae:
+            value = shared_formulae[idx].translate_formula(ref)
+        elif value != "=":
+            shared_formulae[idx] = Translator(value, ref)
+    elif formula_type == "dataTable":
+        value = DataTableFormula(**formula.attrib)
+    return value
@@ -0,0 +1,134 @@
+"""
+Batch manifest (<output_root>/.teresa_manifest.json): what each input's artifacts were made from.
+
+After a main.py --incremental batch run every processed input is recorded with its
+fingerprint — the input file's SHA-256 (as its workbook session read it), the vendor, the
+SHA-256 of the rules YAML used (run_summary rules_file_hash), a hash of the effective
+config and the pipeline code version — and the artifact files written to its SPLIT /
+READY folders. The next such run skips an input whose fingerprint is unchanged and whose
+artifacts all still exist; a failed input is dropped from the manifest, so the next run
+processes it again.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sys
+from pathlib import Path
+from typing import Optional
+
+import openpyxl
+import pandas as pd
+
+_log = logging.getLogger(__name__)
+
+MANIFEST_FILENAME = ".teresa_manifest.json"
+MANIFEST_VERSION = 1
+
+_ROOT = Path(__file__).resolve().parent.parent.parent
+# Code that shapes the artifacts: the pipeline package and the CLI entry point.
+_CODE_FILES = ("main.py",)
+
+_pipeline_code_version: Optional[str] = None
+
+
+def file_sha256(path: Path) -> str:
+    """Hex SHA-256 of a file's bytes."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def config_hash(config: dict) -> str:
+    """Hex SHA-256 of the effective config (config.yaml with config.local.yaml applied)."""
+    canonical = json.dumps(config, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def pipeline_code_version() -> str:
+    """Hash of every module under src/, main.py and the Python / pandas / openpyxl versions."""
+    global _pipeline_code_version
+    if _pipeline_code_version is None:
+        h = hashlib.sha256(f"{sys.version}|{pd.__version__}|{openpyxl.__version__}".encode("utf-8"))
+        files = sorted((_ROOT / "src").rglob("*.py")) + [_ROOT / name for name in _CODE_FILES]
+        for module_file in files:
+            h.update(str(module_file.relative_to(_ROOT)).encode("utf-8"))
+            h.update(module_file.read_bytes())
+        _pipeline_code_version = h.hexdigest()
+    return _pipeline_code_version
+
+
+def spec_artifacts(output_root: Path, vendor: str, spec: str) -> list:
+    """Files in <output_root>/{SPLIT,READY}/<vendor>/<spec>/, as sorted paths relative to output_root."""
+    output_root = Path(output_root)
+    found = []
+    for bucket in ("SPLIT", "READY"):
+        folder = output_root / bucket / vendor / spec
+        if folder.is_dir():
+            found.extend(p.relative_to(output_root).as_posix() for p in folder.rglob("*") if p.is_file())
+    return sorted(found)
+
+
+class BatchManifest:
+    """
+    {input path: fingerprint + artifacts} for one output root. is_current() / record() /
+    forget() work in memory; save() writes the file.
+    """
+
+    def __init__(self, output_root: Path, entries: Optional[dict] = None):
+        self.output_root = Path(output_root)
+        self.path = self.output_root / MANIFEST_FILENAME
+        self.entries: dict = entries if entries is not None else {}
+
+    @classmethod
+    def load(cls, output_root: Path) -> "BatchManifest":
+        """The manifest of output_root; empty if there is none or it is unreadable (with a warning)."""
+        path = Path(output_root) / MANIFEST_FILENAME
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return cls(output_root)
+        except (OSError, ValueError) as e:
+            _log.warning("Ignoring unreadable batch manifest %s: %s", path, e)
+            return cls(output_root)
+        if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+            _log.warning("Ignoring batch manifest %s: unsupported version", path)
+            return cls(output_root)
+        return cls(output_root, dict(data.get("inputs") or {}))
+
+    @staticmethod
+    def _key(input_path: Path) -> str:
+        return str(Path(input_path).resolve())
+
+    def get(self, input_path: Path) -> Optional[dict]:
+        return self.entries.get(self._key(input_path))
+
+    def is_current(self, input_path: Path, fingerprint: dict) -> bool:
+        """True when input_path was recorded with this fingerprint and all its artifacts still exist."""
+        entry = self.get(input_path)
+        if entry is None or entry.get("fingerprint") != fingerprint:
+            return False
+        artifacts = entry.get("artifacts") or []
+        return bool(artifacts) and all((self.output_root / a).is_file() for a in artifacts)
+
+    def record(self, input_path: Path, fingerprint: dict, artifacts: list) -> None:
+        self.entries[self._key(input_path)] = {"fingerprint": fingerprint, "artifacts": list(artifacts)}
+
+    def forget(self, input_path: Path) -> None:
+        self.entries.pop(self._key(input_path), None)
+
+    def save(self) -> Path:
+        """Write the manifest atomically (temp file + replace)."""
+        self.output_root.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(
+                {"version": MANIFEST_VERSION, "inputs": dict(sorted(self.entries.items()))},
+                f, indent=2, ensure_ascii=False,
+            )
+        os.replace(tmp, self.path)
+        return self.path
@@ -0,0 +1,97 @@
+"""
+Per-rule profiling (opt-in, main.py --profile-rules): evaluations, hits and cumulative
+regex time for every rule — state rules, entity buckets, device_type and hw_type rules.
+
+RuleSet.load(path, profiler=RuleProfiler()) wraps each compiled pattern; the profile is
+written per run as rule_profile.json and merged across a batch by merge_profiles().
+"Evaluations" are regex searches actually run: rules skipped by the literal prefilter
+or by an earlier match are not counted.
+"""
+
+import json
+import time
+from pathlib import Path
+from typing import List
+
+PROFILE_FILENAME = "rule_profile.json"
+
+
+class _ProfiledPattern:
+    """Stands in for a compiled re.Pattern: search() is timed and counted."""
+
+    __slots__ = ("_search", "pattern", "_counters")
+
+    def __init__(self, regex, counters: list):
+        self._search = regex.search
+        self.pattern = regex.pattern
+        self._counters = counters
+
+    def search(self, string, *args):
+        start = time.perf_counter()
+        match = self._search(string, *args)
+        counters = self._counters
+        counters[2] += time.perf_counter() - start
+        counters[0] += 1
+        if match is not None:
+            counters[1] += 1
+        return match
+
+
+class RuleProfiler:
+    """Collects [evaluations, hits, seconds] per (section, rule_id)."""
+
+    def __init__(self):
+        self._counters: dict = {}
+
+    def wrap(self, section: str, rule_id, regex) -> _ProfiledPattern:
+        """Return a profiled stand-in for regex; every rule is listed, even if never evaluated."""
+        key = (section, str(rule_id))
+        counters = self._counters.setdefault(key, [0, 0, 0.0])
+        return _ProfiledPattern(regex, counters)
+
+    def to_dict(self, **meta) -> dict:
+        """Profile as a JSON-ready dict: meta fields, then rules sorted by cumulative time."""
+        rules = [
+            {
+                "section": section,
+                "rule_id": rule_id,
+                "evaluations": evaluations,
+                "hits": hits,
+                "time_ms": round(seconds * 1000, 3),
+            }
+            for (section, rule_id), (evaluations, hits, seconds) in self._counters.items()
+        ]
+        return _profile(rules, meta)
+
+
+def _profile(rules: List[dict], meta: dict) -> dict:
+    rules = sorted(rules, key=lambda r: (-r["time_ms"], r["section"], r["rule_id"]))
+    return {
+        **meta,
+        "total_evaluations": sum(r["evaluations"] for r in rules),
+        "total_time_ms": round(sum(r["time_ms"] for r in rules), 3),
+        "never_hit": sorted(f"{r['section']}:{r['rule_id']}" for r in rules if r["hits"] == 0),
+        "rules": rules,
+    }
+
+
+def merge_profiles(profiles: List[dict], **meta) -> dict:
+    """Sum per-rule counters of several rule_profile.json dicts (e.g. all files of a batch)."""
+    merged: dict = {}
+    for profile in profiles:
+        for r in profile.get("rules") or []:
+            key = (r["section"], r["rule_id"])
+            acc = merged.setdefault(key, {"section": r["section"], "rule_id": r["rule_id"],
+                                          "evaluations": 0, "hits": 0, "time_ms": 0.0})
+            acc["evaluations"] += r["evaluations"]
+            acc["hits"] += r["hits"]
+            acc["time_ms"] = round(acc["time_ms"] + r["time_ms"], 3)
+    return _profile(list(merged.values()), {**meta, "files": len(profiles)})
+
+
+def save_rule_profile(profile: dict, folder: Path) -> Path:
+    """Write <folder>/rule_profile.json (indent=2, ensure_ascii=False)."""
+    path = Path(folder) / PROFILE_FILENAME
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(profile, f, indent=2, ensure_ascii=False)
+    return path
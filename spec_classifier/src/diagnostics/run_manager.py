@@ -72,6 +72,7 @@ _MANIFEST_CONTENT = """\
 | `unknown_rows.csv` | `SPLIT/<vendor>/<spec>/` | Строки с неопределённым типом сущности |
 | `header_rows.csv` | `SPLIT/<vendor>/<spec>/` | Заголовочные строки из спецификации |
 | `run.log` | `SPLIT/<vendor>/<spec>/` | Лог выполнения классификатора |
+| `rule_profile.json` | `SPLIT/<vendor>/<spec>/`, `SPLIT/<vendor>/` | Профиль правил (только с `--profile-rules`): вычисления, срабатывания и время по каждому rule_id; на уровне вендора — сумма по пакету |
 
 ---
 
@@ -0,0 +1,170 @@
+"""
+Per-stage timings of one input file (run_summary.json "timings") and their batch aggregate
+(batch_metrics.json).
+
+StageTimer.stage(name) measures wall time (time.perf_counter) and CPU time of this process
+(time.process_time) of one pipeline stage; rows gives the stage's row throughput. to_dict()
+adds the process peak RSS (resource.getrusage; None where the resource module is missing,
+e.g. Windows) and, when the timer traces memory, the tracemalloc peak of the file's run.
+aggregate_timings() turns the "timings" blocks of a batch into p50 / p95 per stage, overall
+and per vendor.
+"""
+
+import json
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+BATCH_METRICS_FILENAME = "batch_metrics.json"
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process so far, in MiB; None if unavailable."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in KiB on Linux, in bytes on macOS.
+    return round(peak / (2 ** 20 if sys.platform == "darwin" else 2 ** 10), 1)
+
+
+class StageTimer:
+    """
+    Stages of one input file in run order: with timer.stage("parse") as stage: ...;
+    stage["rows"] = n. trace_memory: trace allocations between start() and stop().
+    """
+
+    def __init__(self, trace_memory: bool = False):
+        self.trace_memory = trace_memory
+        self.stages: dict = {}
+        self._started_tracing = False
+
+    def start(self) -> None:
+        """Start tracing for this file (trace_memory); to_dict() reports the peak since."""
+        if self.trace_memory:
+            if tracemalloc.is_tracing():
+                tracemalloc.reset_peak()
+            else:
+                tracemalloc.start()
+                self._started_tracing = True
+
+    @contextmanager
+    def stage(self, name: str, rows: Optional[int] = None) -> Iterator[dict]:
+        """Time the block as stage name; set ["rows"] on the yielded dict when known only inside it."""
+        record = {"rows": rows}
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield record
+        finally:
+            wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+            entry = self.stages.setdefault(name, {"wall_s": 0.0, "cpu_s": 0.0, "rows": None})
+            entry["wall_s"] += wall
+            entry["cpu_s"] += cpu
+            if record["rows"] is not None:
+                entry["rows"] = record["rows"]
+
+    def stop(self) -> None:
+        """Stop tracemalloc if start() started it."""
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def to_dict(self) -> dict:
+        """The "timings" block of run_summary.json."""
+        stages = {}
+        for name, entry in self.stages.items():
+            rows, wall = entry["rows"], entry["wall_s"]
+            stages[name] = {
+                "wall_s": round(wall, 6),
+                "cpu_s": round(entry["cpu_s"], 6),
+                "rows": rows,
+                "rows_per_s": round(rows / wall, 1) if rows is not None and wall > 0 else None,
+            }
+        timings = {
+            "stages": stages,
+            "total_wall_s": round(sum(e["wall_s"] for e in self.stages.values()), 6),
+            "total_cpu_s": round(sum(e["cpu_s"] for e in self.stages.values()), 6),
+            "peak_rss_mb": peak_rss_mb(),
+        }
+        if self.trace_memory and tracemalloc.is_tracing():
+            timings["tracemalloc_peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 2 ** 20, 1)
+        return timings
+
+
+def _percentile(values: list, q: float) -> float:
+    """q-th percentile (0..100) of values, linear between closest ranks."""
+    ordered = sorted(values)
+    pos = (len(ordered) - 1) * q / 100
+    lo = int(pos)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (pos - lo)
+
+
+def _distribution(values: list) -> dict:
+    return {
+        "total": round(sum(values), 6),
+        "p50": round(_percentile(values, 50), 6),
+        "p95": round(_percentile(values, 95), 6),
+        "max": round(max(values), 6),
+    }
+
+
+def _stage_metrics(timings: list) -> dict:
+    per_stage: dict = {}
+    for t in timings:
+        for name, entry in t.get("stages", {}).items():
+            per_stage.setdefault(name, []).append(entry)
+    metrics = {}
+    for name, entries in per_stage.items():
+        throughput = [e["rows_per_s"] for e in entries if e.get("rows_per_s") is not None]
+        metrics[name] = {
+            "files": len(entries),
+            "wall_s": _distribution([e["wall_s"] for e in entries]),
+            "cpu_s": _distribution([e["cpu_s"] for e in entries]),
+            "rows_per_s": {
+                "p50": round(_percentile(throughput, 50), 1),
+                "p95": round(_percentile(throughput, 95), 1),
+            } if throughput else None,
+        }
+    return metrics
+
+
+def _group_metrics(timings: list) -> dict:
+    peaks = [t["peak_rss_mb"] for t in timings if t.get("peak_rss_mb") is not None]
+    traced = [t["tracemalloc_peak_mb"] for t in timings if t.get("tracemalloc_peak_mb") is not None]
+    metrics = {
+        "files": len(timings),
+        "total_wall_s": _distribution([t.get("total_wall_s", 0.0) for t in timings]),
+        "stages": _stage_metrics(timings),
+        "peak_rss_mb": max(peaks) if peaks else None,
+    }
+    if traced:
+        metrics["tracemalloc_peak_mb"] = {"p50": round(_percentile(traced, 50), 1), "max": max(traced)}
+    return metrics
+
+
+def aggregate_timings(files: Iterable[Tuple[str, dict]]) -> dict:
+    """batch_metrics.json from (vendor, run_summary "timings") of each processed file."""
+    files = list(files)
+    by_vendor: dict = {}
+    for vendor, timings in files:
+        by_vendor.setdefault(vendor, []).append(timings)
+    metrics = _group_metrics([timings for _, timings in files]) if files else {"files": 0, "stages": {}}
+    metrics["by_vendor"] = {vendor: _group_metrics(timings) for vendor, timings in sorted(by_vendor.items())}
+    return metrics
+
+
+def save_batch_metrics(metrics: dict, output_dir: Path) -> Path:
+    """Write <output_dir>/batch_metrics.json (indent=2)."""
+    path = Path(output_dir) / BATCH_METRICS_FILENAME
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(metrics, f, indent=2, ensure_ascii=False)
+    return path
@@ -5,10 +5,10 @@ Collect and persist run statistics (counts by entity_type, state, rules).
 import hashlib
 import json
 from pathlib import Path
-from typing import List
+from typing import Sequence
 
 from src.core.normalizer import RowKind
-from src.core.classifier import ClassificationResult, EntityType
+from src.core.classifier import ClassificationResult, ClassificationTable, EntityType
 
 
 def compute_file_hash(filepath: str, algorithm: str = "sha256") -> str:
@@ -23,68 +23,41 @@ def compute_file_hash(filepath: str, algorithm: str = "sha256") -> str:
     return h.hexdigest()
 
 
-def collect_stats(classification_results: List[ClassificationResult]) -> dict:
+def collect_stats(classification_results: Sequence[ClassificationResult]) -> dict:
     """
     Build stats dict: total_rows, header_rows_count, item_rows_count,
     entity_type_counts (ITEM only), state_counts (ITEM only), unknown_count, rules_stats.
+    Counts are taken on the code columns of a ClassificationTable (a list is converted first).
     """
-    total_rows = len(classification_results)
-    header_rows_count = sum(1 for r in classification_results if r.row_kind == RowKind.HEADER)
-    item_rows_count = sum(1 for r in classification_results if r.row_kind == RowKind.ITEM)
+    table = classification_results
+    if not isinstance(table, ClassificationTable):
+        table = ClassificationTable(classification_results)
+    row_kinds = table.codes("row_kind")
+    item = table.code("row_kind", RowKind.ITEM)
+    header = table.code("row_kind", RowKind.HEADER)
 
-    entity_type_counts = {}
-    state_counts = {}
-    for r in classification_results:
-        if r.row_kind != RowKind.ITEM:
-            continue
-        if r.entity_type is not None:
-            key = r.entity_type.value
-            entity_type_counts[key] = entity_type_counts.get(key, 0) + 1
-        if r.state is not None:
-            key = r.state.value
-            state_counts[key] = state_counts.get(key, 0) + 1
-
-    unknown_count = sum(
-        1 for r in classification_results
-        if r.row_kind == RowKind.ITEM and r.entity_type == EntityType.UNKNOWN
-    )
-
-    rules_stats = {}
-    for r in classification_results:
-        rid = r.matched_rule_id
-        rules_stats[rid] = rules_stats.get(rid, 0) + 1
-
-    device_type_counts = {}
-    for r in classification_results:
-        if r.row_kind != RowKind.ITEM or not getattr(r, "device_type", None):
-            continue
-        dt = r.device_type
-        if dt:
-            device_type_counts[dt] = device_type_counts.get(dt, 0) + 1
-
-    hw_type_counts = {}
-    for r in classification_results:
-        if r.row_kind != RowKind.ITEM or not getattr(r, "hw_type", None):
-            continue
-        ht = r.hw_type
-        if ht:
-            hw_type_counts[ht] = hw_type_counts.get(ht, 0) + 1
+    entity_type_counts = {
+        e.value: n for e, n in table.value_counts("entity_type", item_only=True).items() if e is not None
+    }
+    state_counts = {s.value: n for s, n in table.value_counts("state", item_only=True).items() if s is not None}
+    device_type_counts = {dt: n for dt, n in table.value_counts("device_type", item_only=True).items() if dt}
+    hw_type_counts = {ht: n for ht, n in table.value_counts("hw_type", item_only=True).items() if ht}
 
+    hw = table.code("entity_type", EntityType.HW)
+    no_hw_type = {-1, table.code("hw_type", "")}
     hw_type_null_count = sum(
-        1 for r in classification_results
-        if r.row_kind == RowKind.ITEM
-        and r.entity_type == EntityType.HW
-        and not getattr(r, "hw_type", None)
+        1 for kind, entity, hw_type in zip(row_kinds, table.codes("entity_type"), table.codes("hw_type"))
+        if kind == item and entity == hw and hw_type in no_hw_type
     )
 
     return {
-        "total_rows": total_rows,
-        "header_rows_count": header_rows_count,
-        "item_rows_count": item_rows_count,
+        "total_rows": len(table),
+        "header_rows_count": row_kinds.count(header),
+        "item_rows_count": row_kinds.count(item),
         "entity_type_counts": entity_type_counts,
         "state_counts": state_counts,
-        "unknown_count": unknown_count,
-        "rules_stats": rules_stats,
+        "unknown_count": entity_type_counts.get(EntityType.UNKNOWN.value, 0),
+        "rules_stats": table.value_counts("matched_rule_id"),
         "device_type_counts": device_type_counts,
         "hw_type_counts": hw_type_counts,
         "hw_type_null_count": hw_type_null_count,
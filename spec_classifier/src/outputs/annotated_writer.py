@@ -4,18 +4,17 @@ All rows preserved; no rows removed.
 """
 
 from pathlib import Path
-from typing import List, Optional
-
-import pandas as pd
+from typing import List, Optional, Sequence
 
 from src.core.normalizer import NormalizedRow, RowKind
 from src.core.classifier import ClassificationResult
+from src.core.workbook import open_workbook
 
 
 def generate_annotated_source_excel(
     raw_rows: List[dict],
     normalized_rows: List,
-    classification_results: List[ClassificationResult],
+    classification_results: Sequence[ClassificationResult],
     original_excel_path: Path,
     run_folder: Path,
     header_row_index: Optional[int] = None,
@@ -37,7 +36,8 @@ def generate_annotated_source_excel(
         raise FileNotFoundError(f"Original Excel not found: {path}")
 
     _sheet = sheet_name if sheet_name is not None else 0
-    df = pd.read_excel(path, header=None, engine="openpyxl", sheet_name=_sheet)
+    with open_workbook(path) as session:
+        df = session.dataframe(_sheet, header=None)
     # header_row_index=None is valid (format has no header row): use row 0 for labels, no highlight/freeze
     label_row = header_row_index if header_row_index is not None else 0
 
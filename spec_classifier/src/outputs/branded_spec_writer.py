@@ -4,7 +4,7 @@ Output mirrors client-brand format with company brand colors.
 """
 
 from pathlib import Path
-from typing import List
+from typing import List, Sequence
 import logging
 
 import openpyxl
@@ -150,7 +150,7 @@ def _write_data_row(ws, row: int, skus: List[str], option_name: str, qty, option
 
 def generate_branded_spec(
     normalized_rows: List[NormalizedRow],
-    classification_results: List[ClassificationResult],
+    classification_results: Sequence[ClassificationResult],
     source_filename: str,
     output_path: Path,
 ) -> Path:
@@ -3,7 +3,7 @@ Generate cleaned spec Excel: only ITEM rows of included types and (optionally) P
 """
 
 from pathlib import Path
-from typing import List
+from typing import List, Sequence
 
 import pandas as pd
 
@@ -43,7 +43,7 @@ HPE_EXTRA_COLUMNS = [
 
 def generate_cleaned_spec(
     normalized_rows: List[NormalizedRow],
-    classification_results: List[ClassificationResult],
+    classification_results: Sequence[ClassificationResult],
     config: dict,
     run_folder: Path,
 ) -> Path:
@@ -4,13 +4,31 @@ Save pipeline artifacts: raw rows, normalized rows, classification (JSON/JSONL),
 
 import csv
 import json
+from collections.abc import Mapping
+from itertools import islice
 from pathlib import Path
-from typing import List, Optional, Union
+from typing import Iterable, List, Optional, Sequence, Union
 
 from src.core.normalizer import NormalizedRow, RowKind
 from src.core.classifier import ClassificationResult, EntityType
 
 
+def _dump_json_list(items: Iterable, f, chunk: int = 1024) -> None:
+    """json.dump(list(items), f, indent=2, ensure_ascii=False), serializing chunk items at a time."""
+    it = iter(items)
+    first = True
+    while True:
+        batch = list(islice(it, chunk))
+        if not batch:
+            break
+        # '[\n  {...},\n  {...}\n]' without its brackets is the slice of the whole list's dump.
+        text = json.dumps(batch, indent=2, ensure_ascii=False)[2:-2]
+        f.write("[\n" if first else ",\n")
+        f.write(text)
+        first = False
+    f.write("[]" if first else "\n]")
+
+
 def _normalized_row_to_dict(row) -> dict:
     """Serialize NormalizedRow or compatible duck-type to dict.
     Core fields always present. Vendor-specific fields added if semantically present."""
@@ -58,7 +76,7 @@ def _classification_result_to_dict(
         "entity_type": result.entity_type.value if result.entity_type else None,
         "state": result.state.value if result.state else None,
         "matched_rule_id": result.matched_rule_id,
-        "warnings": result.warnings,
+        "warnings": list(result.warnings),
     }
     is_classified = (
         result.row_kind.value == "ITEM"
@@ -70,8 +88,8 @@ def _classification_result_to_dict(
     return out
 
 
-def save_rows_raw(rows: List[dict], run_folder: Path) -> None:
-    """Write raw parsed rows to rows_raw.json. float NaN replaced with null."""
+def save_rows_raw(rows: Sequence[Mapping], run_folder: Path) -> None:
+    """Write raw parsed rows (dicts or RowTable record views) to rows_raw.json. float NaN replaced with null."""
     path = Path(run_folder) / "rows_raw.json"
 
     def _sanitize_nan(obj):
@@ -85,19 +103,18 @@ def save_rows_raw(rows: List[dict], run_folder: Path) -> None:
         return obj
 
     with open(path, "w", encoding="utf-8") as f:
-        json.dump(_sanitize_nan(rows), f, indent=2, ensure_ascii=False)
+        _dump_json_list((_sanitize_nan(dict(row.items())) for row in rows), f)
 
 
 def save_rows_normalized(rows: List[NormalizedRow], run_folder: Path) -> None:
     """Write normalized rows to rows_normalized.json (including row_kind)."""
     path = Path(run_folder) / "rows_normalized.json"
-    data = [_normalized_row_to_dict(r) for r in rows]
     with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+        _dump_json_list((_normalized_row_to_dict(r) for r in rows), f)
 
 
 def save_classification(
-    results: List[ClassificationResult],
+    results: Sequence[ClassificationResult],
     normalized_rows_or_run_folder: Union[List[NormalizedRow], Path],
     run_folder: Optional[Path] = None,
 ) -> None:
@@ -137,7 +154,7 @@ def save_classification(
 
 def save_unknown_rows(
     normalized_rows: List[NormalizedRow],
-    classification_results: List[ClassificationResult],
+    classification_results: Sequence[ClassificationResult],
     run_folder: Path,
 ) -> None:
     """Write only ITEM rows classified as UNKNOWN to unknown_rows.csv (utf-8-sig for Excel)."""
@@ -0,0 +1,276 @@
+"""
+Dead / shadowed rule analysis for a vendor rules YAML.
+
+Runs every rule of each bucket a corpus row actually reaches (state rules, entity
+buckets up to the one that matched, device_type and hw_type regex passes when the
+classifier runs them) and reports:
+
+  zero_hits       — rules that match no reached row at all;
+  shadowed        — rules that match, but always after a higher-priority rule of the
+                    same bucket matched first (first-match-wins: they never fire);
+  golden_removable — rules whose removal leaves every golden row unchanged
+                    (entity_type, state, matched_rule_id, device_type, hw_type);
+  prune           — zero_hits + shadowed: never fire on the corpus, so removing them
+                    changes no result on it (golden rows included) and shortens the scan.
+
+Corpus: rows_normalized.json files of earlier runs; golden/<stem>_expected.jsonl rows are
+matched to them by (stem, source_row_index), stem being the run folder name.
+
+Usage (from spec_classifier/):
+    python -m src.rules.rule_analysis --vendor dell --output-dir "C:/.../OUTPUT"
+    python -m src.rules.rule_analysis --vendor hpe --rows "D:/runs/*/rows_normalized.json" --report prune_hpe.json
+"""
+
+import argparse
+import copy
+import glob
+import json
+import re
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import yaml
+
+from src.core.classifier import (
+    _ENTITY_PASSES,
+    _hw_type_from_maps,
+    _needs_device_type,
+    _needs_hw_type,
+    classify_row,
+)
+from src.core.normalizer import RowKind
+from src.core.state_detector import State
+from src.rules.rules_engine import RuleSet, match_view
+
+# Section → path of its rule list inside the YAML data.
+_SECTION_PATHS = {
+    "state_rules.absent_keywords": ("state_rules", "absent_keywords"),
+    **{attr: (attr,) for attr, _, _ in _ENTITY_PASSES},
+    "device_type_rules": ("device_type_rules", "rules"),
+    "hw_type_rules": ("hw_type_rules", "rules"),
+}
+_STATES = frozenset(s.value for s in State)
+_GOLDEN_FIELDS = ("entity_type", "state", "matched_rule_id", "device_type", "hw_type")
+
+
+class CorpusRow:
+    """A row of rows_normalized.json with the attributes rules read (duck-types NormalizedRow)."""
+
+    __slots__ = (
+        "stem", "source_row_index", "row_kind", "module_name", "option_name",
+        "option_id", "skus", "is_bundle_root", "service_duration_months",
+    )
+
+    def __init__(self, stem: str, d: dict):
+        self.stem = stem
+        self.source_row_index = d.get("source_row_index")
+        self.row_kind = RowKind(d.get("row_kind") or "ITEM")
+        self.module_name = d.get("module_name") or ""
+        self.option_name = d.get("option_name") or ""
+        self.option_id = d.get("option_id")
+        self.skus = d.get("skus") or []
+        self.is_bundle_root = d.get("is_bundle_root")
+        self.service_duration_months = d.get("service_duration_months")
+
+
+def load_corpus(paths: List[Path]) -> List[CorpusRow]:
+    """Read rows_normalized.json files; each row is tagged with its run folder name (the input stem)."""
+    rows: List[CorpusRow] = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            rows.extend(CorpusRow(Path(path).parent.name, d) for d in json.load(f))
+    return rows
+
+
+def load_golden(golden_dir: Path, stems) -> Dict[tuple, dict]:
+    """{(stem, source_row_index): golden row} for every stem that has <stem>_expected.jsonl."""
+    golden: Dict[tuple, dict] = {}
+    for stem in sorted(set(stems)):
+        path = Path(golden_dir) / f"{stem}_expected.jsonl"
+        if not path.exists():
+            continue
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    g = json.loads(line)
+                    golden[(stem, g["source_row_index"])] = g
+    return golden
+
+
+def _reached_sections(result, ruleset: RuleSet) -> List[str]:
+    """Rule sections the classifier evaluates for this (ITEM) row, in order."""
+    sections = ["state_rules.absent_keywords"]
+    for attr, entity_type, _ in _ENTITY_PASSES:
+        sections.append(attr)
+        if result.entity_type == entity_type:
+            break
+    entity_type, rule_id = result.entity_type, result.matched_rule_id
+    if _needs_device_type(entity_type, rule_id, ruleset):
+        sections.append("device_type_rules")
+    if _needs_hw_type(entity_type, rule_id, ruleset) and _hw_type_from_maps(result.device_type, rule_id, ruleset) is None:
+        sections.append("hw_type_rules")
+    return sections
+
+
+def _label(rule: dict, index: int) -> str:
+    """rule_id, or #<position> for rules without one (e.g. hw_type rules), as in rule_profile.json."""
+    return str(rule.get("rule_id") or f"#{index}")
+
+
+def _section_matches(section: str, view, ruleset: RuleSet) -> List[str]:
+    """Labels of every rule in section that matches the row, in priority order."""
+    if section == "state_rules.absent_keywords":
+        return [
+            _label(rule, index) for index, rule in enumerate(ruleset.get_state_rules()[0])
+            if rule.get("pattern") and rule.get("state") in _STATES
+            and re.search(rule["pattern"], view.state_text, re.IGNORECASE)
+        ]
+    rule_list = getattr(ruleset, section)
+    return [_label(e.rule, e.index) for e in rule_list.entries if e.regex.search(view.values[e.field])]
+
+
+def _golden_equal(result, golden: dict) -> bool:
+    actual = {
+        "entity_type": result.entity_type.value if result.entity_type else None,
+        "state": result.state.value if result.state else None,
+        "matched_rule_id": result.matched_rule_id,
+        "device_type": result.device_type,
+        "hw_type": result.hw_type,
+    }
+    return all(actual[k] == golden.get(k) for k in _GOLDEN_FIELDS)
+
+
+def _section_rules(data: dict, section: str) -> list:
+    node = data
+    for key in _SECTION_PATHS[section]:
+        node = node.get(key) if isinstance(node, dict) else None
+    return node if isinstance(node, list) else []
+
+
+def _without_rule(data: dict, section: str, index: int) -> dict:
+    reduced = copy.deepcopy(data)
+    del _section_rules(reduced, section)[index]
+    return reduced
+
+
+def analyze_rules(data: dict, corpus: List[CorpusRow], golden: Optional[Dict[tuple, dict]] = None) -> dict:
+    """
+    Analyze the rules in data (parsed YAML) against corpus rows; golden as from load_golden().
+    Returns the report dict described in the module docstring.
+    """
+    golden = golden or {}
+    ruleset = RuleSet(data)
+    matched: Counter = Counter()
+    fired: Counter = Counter()
+    preceded_by: Dict[str, Counter] = {}
+    fired_on_golden: Dict[str, list] = {}
+    items = 0
+
+    for row in corpus:
+        if row.row_kind != RowKind.ITEM:
+            continue
+        items += 1
+        view = match_view(row)
+        result = classify_row(row, ruleset)
+        is_golden = (row.stem, row.source_row_index) in golden
+        for section in _reached_sections(result, ruleset):
+            hits = [f"{section}:{rule_id}" for rule_id in _section_matches(section, view, ruleset)]
+            if not hits:
+                continue
+            fired[hits[0]] += 1
+            if is_golden:
+                fired_on_golden.setdefault(hits[0], []).append(row)
+            for key in hits:
+                matched[key] += 1
+            for key in hits[1:]:
+                preceded_by.setdefault(key, Counter())[hits[0]] += 1
+
+    positions = {}  # "section:label" → (section, index in the YAML list)
+    for section in _SECTION_PATHS:
+        for index, rule in enumerate(_section_rules(data, section)):
+            if rule.get("pattern"):
+                positions.setdefault(f"{section}:{_label(rule, index)}", (section, index))
+    all_rules = list(positions)
+
+    zero_hits = [k for k in all_rules if matched[k] == 0]
+    shadowed = [
+        {"rule": k, "matched": matched[k], "preceded_by": dict(preceded_by[k].most_common(3))}
+        for k in all_rules if matched[k] > 0 and fired[k] == 0
+    ]
+
+    golden_removable = []
+    for key in all_rules:
+        rows = fired_on_golden.get(key)
+        if rows:
+            reduced = RuleSet(_without_rule(data, *positions[key]))
+            if not all(_golden_equal(classify_row(r, reduced), golden[(r.stem, r.source_row_index)]) for r in rows):
+                continue
+        golden_removable.append(key)
+
+    return {
+        "rules_total": len(all_rules),
+        "corpus_item_rows": items,
+        "golden_rows": len(golden),
+        "fired": dict(fired.most_common()),
+        "zero_hits": zero_hits,
+        "shadowed": shadowed,
+        "golden_removable": golden_removable,
+        "prune": zero_hits + [s["rule"] for s in shadowed],
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.rules.rule_analysis",
+        description="Report dead and shadowed rules of a vendor rules YAML against historical rows.",
+    )
+    parser.add_argument("--vendor", required=True, help="Vendor key in config vendor_rules (dell, hpe, ...)")
+    parser.add_argument("--config", default="config.yaml", help="Path to config YAML (default: config.yaml)")
+    parser.add_argument("--rules", default=None, help="Rules YAML (default: config vendor_rules[vendor])")
+    parser.add_argument("--output-dir", default=None, help="Output root of earlier runs: reads SPLIT/<vendor>/*/rows_normalized.json")
+    parser.add_argument("--rows", action="append", default=[], help="Glob of rows_normalized.json files (repeatable)")
+    parser.add_argument("--golden-dir", default="golden", help="Directory with <stem>_expected.jsonl (default: golden)")
+    parser.add_argument("--report", default=None, help="Write the full report as JSON to this path")
+    args = parser.parse_args(argv)
+
+    with open(args.config, encoding="utf-8") as f:
+        config = yaml.safe_load(f) or {}
+    rules_path = args.rules or (config.get("vendor_rules") or {}).get(args.vendor)
+    if not rules_path or not Path(rules_path).exists():
+        print(f"Error: Rules file not found for vendor {args.vendor!r}: {rules_path}", file=sys.stderr)
+        return 1
+
+    patterns = list(args.rows)
+    if args.output_dir:
+        patterns.append(str(Path(args.output_dir) / "SPLIT" / args.vendor / "*" / "rows_normalized.json"))
+    paths = sorted({Path(p) for pattern in patterns for p in glob.glob(pattern)})
+    if not paths:
+        print("Error: no rows_normalized.json found (use --output-dir or --rows)", file=sys.stderr)
+        return 1
+
+    with open(rules_path, encoding="utf-8") as f:
+        data = yaml.safe_load(f) or {}
+    corpus = load_corpus(paths)
+    golden = load_golden(Path(args.golden_dir), (r.stem for r in corpus))
+    report = analyze_rules(data, corpus, golden)
+    report = {"vendor": args.vendor, "rules_file": str(rules_path), "files": len(paths), **report}
+
+    print(f"{args.vendor}: {report['rules_total']} rules, {report['corpus_item_rows']} ITEM rows "
+          f"from {len(paths)} files, {report['golden_rows']} golden rows")
+    print(f"  zero hits: {len(report['zero_hits'])}")
+    print(f"  shadowed: {len(report['shadowed'])}")
+    print(f"  removable without golden change: {len(report['golden_removable'])}")
+    print(f"  prune list: {len(report['prune'])}")
+    for key in report["prune"]:
+        print(f"    {key}")
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"Report: {args.report}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
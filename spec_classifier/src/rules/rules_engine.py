@@ -2,17 +2,38 @@
 Rules engine: load classification rules from YAML and match rows against entity rules.
 """
 
+import hashlib
+import json
 import logging
+import os
+import pickle
 import re
+import sys
 from pathlib import Path
 from typing import List, Optional
 
 import yaml
 
+try:  # Python 3.11+: sre_parse/sre_constants are deprecated aliases of re._parser/re._constants
+    from re import _constants as _sre_constants
+    from re import _parser as _sre_parse
+except ImportError:  # pragma: no cover - older interpreters
+    import sre_constants as _sre_constants
+    import sre_parse as _sre_parse
+
+from src.core import state_detector
 from src.core.normalizer import NormalizedRow
+from src.core.state_detector import compile_state_rules
 
 _log = logging.getLogger(__name__)
 
+# libyaml's loader when PyYAML was built with it (~10x faster on the large rules files).
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# RuleSet.load(..., snapshot_dir=...) pickles the built RuleSet to <snapshot_dir>/<yaml sha256>.pickle.
+SNAPSHOT_SUFFIX = ".pickle"
+_snapshot_code_version: Optional[str] = None
+
 _KNOWN_FIELDS = frozenset({
     "module_name", "option_name", "option_id", "sku",
     "is_bundle_root", "service_duration_months",
@@ -48,26 +69,450 @@ def _get_field_value(row, field: str):
         return None
 
 
-def match_rule(row: NormalizedRow, rules: List[dict]) -> Optional[dict]:
+class RowMatchView:
     """
-    Match a normalized row against a list of entity rules (field + regex).
+    Field values of one row as the rules see them, computed once per row.
 
-    Uses field (module_name or option_name), matches pattern case-insensitively.
-    Returns the first matching rule dict (with rule_id, entity_type, etc.) or None.
+    values maps every field in _KNOWN_FIELDS to the same string _get_field_value returns;
+    state_text is option_name stripped, as detect_state reads it. classify_row builds one
+    view and passes it to every match_* call and to detect_state, instead of re-deriving
+    the strings for each bucket.
     """
-    if not rules:
+
+    __slots__ = ("row", "values", "state_text")
+
+    def __init__(self, row):
+        self.row = row
+        option_name = str(row.option_name or "")
+        is_bundle_root = getattr(row, "is_bundle_root", None)
+        duration = getattr(row, "service_duration_months", None)
+        self.values = {
+            "module_name": str(row.module_name or ""),
+            "option_name": option_name,
+            "option_id": str(getattr(row, "option_id", None) or ""),
+            "sku": str(row.skus[0]) if row.skus else "",
+            "is_bundle_root": "" if is_bundle_root is None else ("true" if is_bundle_root else "false"),
+            "service_duration_months": str(duration) if duration is not None else "",
+        }
+        self.state_text = option_name.strip()
+
+
+def match_view(row) -> RowMatchView:
+    """Return the RowMatchView for row (row itself if it already is one)."""
+    if isinstance(row, RowMatchView):
+        return row
+    return RowMatchView(row)
+
+
+class CompiledRule:
+    """One rule dict with its pattern compiled once (case-insensitive, like re.search before)."""
+
+    __slots__ = ("index", "rule", "rule_id", "field", "regex", "literals")
+
+    def __init__(self, index: int, rule: dict, field: str, regex: re.Pattern):
+        self.index = index  # position in the bucket: lower index = higher priority
+        self.rule = rule
+        self.rule_id = rule.get("rule_id")
+        self.field = field
+        self.regex = regex
+        # Every match contains one of these lowercase literals (None: rule is always a candidate).
+        self.literals = required_literals(regex.pattern)
+
+
+# Shortest literal worth indexing; shorter ones select almost every row.
+_MIN_LITERAL_LEN = 3
+# A requirement "one of these literals" with more alternatives than this is not worth indexing.
+_MAX_LITERAL_ALTERNATIVES = 8
+
+
+def _best_requirement(options: list) -> Optional[tuple]:
+    """Pick the most selective any-of literal set: longest shortest-literal, then fewest alternatives."""
+    options = [o for o in options if o and len(o) <= _MAX_LITERAL_ALTERNATIVES]
+    if not options:
         return None
-    for rule in rules:
+    return max(options, key=lambda o: (min(len(x) for x in o), -len(o)))
+
+
+def _literal_char(op, av) -> Optional[str]:
+    """Lowercase ASCII char for a LITERAL node or a one-letter set like [Rr]; None otherwise."""
+    c = _sre_constants
+    ch = None
+    if op is c.LITERAL:
+        ch = chr(av)
+    elif op is c.IN:
+        chars = {chr(a).lower() for o, a in av if o is c.LITERAL}
+        if len(chars) == 1 and all(o is c.LITERAL for o, _ in av):
+            ch = chars.pop()
+    return ch.lower() if ch is not None and ch.isascii() else None
+
+
+def _leading_run(subpattern) -> str:
+    run = []
+    for op, av in subpattern:
+        ch = _literal_char(op, av)
+        if ch is None:
+            break
+        run.append(ch)
+    return "".join(run)
+
+
+def _requirement(subpattern) -> Optional[tuple]:
+    """
+    Any-of set of lowercase ASCII literals one of which every match of subpattern contains.
+
+    Walks the parsed pattern: consecutive literal chars form runs; groups, positive
+    lookarounds and repeats with min >= 1 are required; a branch is required only if every
+    alternative has a requirement (the parser factors a common prefix out of alternatives,
+    so that prefix is glued back onto each alternative's leading run). Optional repeats,
+    negative lookarounds and classes contribute nothing.
+    """
+    c = _sre_constants
+    options: list = []
+    current: list = []
+
+    def flush():
+        if len(current) >= _MIN_LITERAL_LEN:
+            options.append(("".join(current),))
+        current.clear()
+
+    for op, av in subpattern:
+        ch = _literal_char(op, av)
+        if ch is not None:
+            current.append(ch)
+            continue
+        prefix = "".join(current)
+        flush()
+        if op is c.SUBPATTERN:
+            options.append(_requirement(av[-1]))
+        elif op is c.ASSERT:
+            options.append(_requirement(av[1]))
+        elif op in (c.MAX_REPEAT, c.MIN_REPEAT) and av[0] >= 1:
+            options.append(_requirement(av[2]))
+        elif op is c.BRANCH:
+            alternatives = []
+            for branch in av[1]:
+                glued = prefix + _leading_run(branch)
+                alternatives.append((glued,) if len(glued) >= _MIN_LITERAL_LEN else _requirement(branch))
+            if all(alternatives):
+                options.append(tuple(sorted({lit for alt in alternatives for lit in alt})))
+    flush()
+    return _best_requirement(options)
+
+
+def required_literals(pattern: str) -> Optional[tuple]:
+    """
+    Lowercase ASCII literals such that every match of pattern contains at least one of them.
+
+    Used as a prefilter only: when none of them occurs in the (ASCII, lowercased) field value
+    the rule cannot match, so its regex is not run. None = no usable literal (always run).
+    Any parse surprise also yields None.
+    """
+    try:
+        return _requirement(_sre_parse.parse(pattern))
+    except Exception:
+        return None
+
+
+class LiteralIndex:
+    """
+    Literal prefilter shared by all rule lists of a RuleSet, one scanner per field.
+
+    hits(field, value) returns the set of registered literals occurring in value.lower(),
+    found in one regex pass (lookahead alternation of all literals, longest first). Literals
+    that are substrings of a found one are implied, which covers overlaps at one position.
+    The last value per field is memoized: the buckets of one row query the same value in turn.
+    Returns None for non-ASCII values — IGNORECASE folds some non-ASCII chars onto ASCII
+    letters, so the prefilter is skipped there and every rule stays a candidate.
+    """
+
+    def __init__(self):
+        self._literals: dict = {}
+        self._scanners: dict = {}
+        self._last: dict = {}
+
+    def register(self, field: str, literals) -> None:
+        known = self._literals.setdefault(field, set())
+        if not known.issuperset(literals):
+            known.update(literals)
+            self._scanners.pop(field, None)
+            self._last.pop(field, None)
+
+    def _scanner(self, field: str):
+        literals = sorted(self._literals.get(field) or (), key=len, reverse=True)
+        if not literals:
+            return None
+        implied = {a: frozenset(b for b in literals if b in a) for a in literals}
+        finditer = re.compile("(?=(" + "|".join(re.escape(lit) for lit in literals) + "))").finditer
+        scanner = (finditer, implied)
+        self._scanners[field] = scanner
+        return scanner
+
+    def hits(self, field: str, value: str) -> Optional[frozenset]:
+        last = self._last.get(field)
+        if last is not None and last[0] == value:
+            return last[1]
+        if not value.isascii():
+            result = None
+        else:
+            scanner = self._scanners.get(field) or self._scanner(field)
+            if scanner is None:
+                result = frozenset()
+            else:
+                finditer, implied = scanner
+                found = set()
+                for m in finditer(value.lower()):
+                    found |= implied[m.group(1)]
+                result = frozenset(found)
+        self._last[field] = (value, result)
+        return result
+
+
+class _FieldScan:
+    """
+    Rules of one bucket that read the same field, in list order, with their literal requirements.
+
+    candidates(value) returns the entries that can possibly match value: rules without a
+    literal requirement, plus rules with at least one literal present in value (LiteralIndex).
+    """
+
+    __slots__ = ("field", "entries", "first_index", "_index", "_always", "_by_literal")
+
+    def __init__(self, field: str, entries: list, index: LiteralIndex):
+        self.field = field
+        self.entries = tuple((e.index, e.regex.search, e.rule) for e in entries)
+        self.first_index = entries[0].index
+        self._index = index
+        self._always = tuple((e.index, e.regex.search, e.rule) for e in entries if e.literals is None)
+        by_literal: dict = {}
+        for e in entries:
+            for lit in e.literals or ():
+                by_literal.setdefault(lit, []).append((e.index, e.regex.search, e.rule))
+        self._by_literal = {lit: tuple(v) for lit, v in by_literal.items()}
+        index.register(field, self._by_literal)
+
+    def candidates(self, value: str):
+        if not self._by_literal:
+            return self.entries
+        hits = self._index.hits(self.field, value)
+        if hits is None:
+            return self.entries
+        found = {e[0]: e for lit in hits.intersection(self._by_literal) for e in self._by_literal[lit]}
+        if not found:
+            return self._always
+        for e in self._always:
+            found[e[0]] = e
+        return [found[i] for i in sorted(found)]
+
+
+class CompiledRuleList:
+    """
+    Ordered rule list (first match wins) together with the compiled form of each rule.
+
+    Behaves like the original list of rule dicts (iteration, len, indexing, truthiness),
+    so RuleSet.<section>_rules can still be treated as a plain list by callers and tests.
+    Rules without field or pattern are kept in the list but have no compiled entry,
+    exactly as the matchers skipped them before.
+
+    Entries are also grouped per field (groups): first_match() reads each field once,
+    runs the regex only for literal-prefiltered candidates (see _FieldScan) and resolves
+    the lowest-index hit across fields, which is the same rule the plain top-to-bottom
+    scan returns.
+    """
+
+    __slots__ = ("section", "rules", "entries", "groups", "literal_index")
+
+    def __init__(
+        self,
+        rules: Optional[List[dict]],
+        section: str = "rules",
+        literal_index: Optional[LiteralIndex] = None,
+        profiler=None,
+    ):
+        self.section = section
+        self.rules: List[dict] = list(rules or [])
+        self.entries: tuple = tuple(_compile_entries(self.rules, section, profiler))
+        by_field: dict = {}
+        for entry in self.entries:
+            by_field.setdefault(entry.field, []).append(entry)
+        if literal_index is None:
+            literal_index = LiteralIndex()
+        self.literal_index = literal_index
+        self.groups: tuple = tuple(_FieldScan(field, entries, literal_index) for field, entries in by_field.items())
+
+    def first_match(self, row) -> Optional[dict]:
+        """
+        Return the first rule (in list order) whose pattern matches its field on row, or None.
+        row may be a NormalizedRow (or duck-type) or a RowMatchView.
+        """
+        values = match_view(row).values
+        best_index = len(self.rules)
+        best_rule = None
+        for group in self.groups:
+            if group.first_index > best_index:
+                continue
+            value = values[group.field]
+            for index, search, rule in group.candidates(value):
+                if index > best_index:
+                    break
+                if search(value):
+                    best_index, best_rule = index, rule
+                    break
+        return best_rule
+
+    def first_matches(self, columns: "RowColumns", positions) -> dict:
+        """
+        first_match for many rows at once: {position: rule} for every position (index into
+        columns.views) whose row matches a rule of this list; unmatched positions are absent.
+
+        Works rule by rule in list order over the distinct values of the rule's field
+        among the still unresolved rows, so each (rule, distinct value) pair is searched
+        at most once and a row keeps the lowest-index rule that matches it — the same
+        result as first_match(row) for each row.
+        """
+        resolved: dict = {}
+        pending: dict = {}
+        for entry in self.entries:
+            if len(resolved) == len(positions):
+                break
+            values = pending.get(entry.field)
+            if values is None:
+                values = pending[entry.field] = columns.distinct(entry.field, positions)
+            if not values:
+                continue
+            if entry.literals is None:
+                candidates = list(values)
+            else:
+                candidates = columns.candidates(entry.field, entry.literals, self.literal_index)
+            search = entry.regex.search
+            rule = entry.rule
+            for value in candidates:
+                rows = values.get(value)
+                if rows is None:
+                    continue
+                live = [p for p in rows if p not in resolved]
+                if not live:
+                    del values[value]
+                    continue
+                if search(value):
+                    for p in live:
+                        resolved[p] = rule
+                    del values[value]
+        return resolved
+
+    def __iter__(self):
+        return iter(self.rules)
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def __getitem__(self, index):
+        return self.rules[index]
+
+    def __bool__(self) -> bool:
+        return bool(self.rules)
+
+    def __repr__(self) -> str:
+        return f"CompiledRuleList({self.section!r}, {len(self.rules)} rules)"
+
+
+class RowColumns:
+    """
+    Rule-visible fields of many rows as columns (one RowMatchView per row), for
+    CompiledRuleList.first_matches.
+
+    distinct(field, positions) groups positions by field value; candidates() returns the
+    distinct values of a field that contain one of a rule's literals (plus values the
+    prefilter cannot judge), computed from one LiteralIndex scan per distinct value.
+    """
+
+    __slots__ = ("views", "_hits")
+
+    def __init__(self, views: list):
+        self.views = views
+        self._hits: dict = {}
+
+    def distinct(self, field: str, positions) -> dict:
+        values: dict = {}
+        views = self.views
+        for p in positions:
+            values.setdefault(views[p].values[field], []).append(p)
+        return values
+
+    def candidates(self, field: str, literals: tuple, index: "LiteralIndex"):
+        by_literal, unjudged = self._literal_map(field, index)
+        if len(literals) == 1:
+            return by_literal.get(literals[0], ()) + unjudged
+        found: dict = {}
+        for lit in literals:
+            for value in by_literal.get(lit, ()):
+                found[value] = None
+        return list(found) + list(unjudged)
+
+    def _literal_map(self, field: str, index: "LiteralIndex"):
+        cached = self._hits.get((field, id(index)))
+        if cached is not None:
+            return cached
+        by_literal: dict = {}
+        unjudged = []
+        for value in dict.fromkeys(view.values[field] for view in self.views):
+            hits = index.hits(field, value)
+            if hits is None:
+                unjudged.append(value)
+                continue
+            for lit in hits:
+                by_literal.setdefault(lit, []).append(value)
+        cached = ({lit: tuple(v) for lit, v in by_literal.items()}, tuple(unjudged))
+        self._hits[(field, id(index))] = cached
+        return cached
+
+
+def compile_pattern(pattern: str, section: str, rule_id) -> re.Pattern:
+    """Compile a rule pattern with re.IGNORECASE; malformed regex → ValueError naming the rule."""
+    try:
+        return re.compile(pattern, re.IGNORECASE)
+    except re.error as e:
+        raise ValueError(f"Invalid regex in {section} rule {rule_id!r}: {e} (pattern: {pattern!r})") from e
+
+
+def _compile_entries(rules: List[dict], section: str, profiler=None):
+    for index, rule in enumerate(rules):
         field = rule.get("field")
         pattern = rule.get("pattern")
         if not field or not pattern:
             continue
-        value = _get_field_value(row, field)
-        if value is None:
+        if field not in _KNOWN_FIELDS:
+            # Reported once here; the rule has no compiled entry and can never match.
+            _log.warning("Unknown field in %s rule %r: %s — rule will be skipped", section, rule.get("rule_id"), field)
             continue
-        if re.search(pattern, str(value), re.IGNORECASE):
-            return rule
-    return None
+        regex = compile_pattern(str(pattern), section, rule.get("rule_id"))
+        if profiler is not None:
+            regex = profiler.wrap(section, rule.get("rule_id") or f"#{index}", regex)
+        yield CompiledRule(index, rule, field, regex)
+
+
+def _as_compiled(rules) -> CompiledRuleList:
+    """Accept a CompiledRuleList (RuleSet path) or a plain list of rule dicts (ad-hoc callers)."""
+    if isinstance(rules, CompiledRuleList):
+        return rules
+    return CompiledRuleList(rules)
+
+
+def _first_match(row, rules) -> Optional[dict]:
+    if not rules:
+        return None
+    return _as_compiled(rules).first_match(row)
+
+
+def match_rule(row: NormalizedRow, rules: List[dict]) -> Optional[dict]:
+    """
+    Match a normalized row against a list of entity rules (field + regex).
+
+    Uses field (module_name or option_name), matches pattern case-insensitively.
+    Returns the first matching rule dict (with rule_id, entity_type, etc.) or None.
+    row may be a RowMatchView (see match_view) to share field values across calls.
+    rules may be a CompiledRuleList from RuleSet (patterns compiled at load) or a plain list.
+    """
+    return _first_match(row, rules)
 
 
 def match_device_type_rule(row: NormalizedRow, rules: List[dict]) -> Optional[dict]:
@@ -75,71 +520,56 @@ def match_device_type_rule(row: NormalizedRow, rules: List[dict]) -> Optional[di
     Match a normalized row against device_type_rules (same field + regex).
     Returns the first matching rule dict (device_type, rule_id) or None.
     """
-    if not rules:
-        return None
-    for rule in rules:
-        field = rule.get("field")
-        pattern = rule.get("pattern")
-        if not field or not pattern:
-            continue
-        value = _get_field_value(row, field)
-        if value is None:
-            continue
-        if re.search(pattern, str(value), re.IGNORECASE):
-            return rule
-    return None
+    return _first_match(row, rules)
 
 
 def match_hw_type_rule(row: NormalizedRow, rules: List[dict]) -> Optional[dict]:
     """Match row against hw_type regex rules. First match wins."""
-    if not rules:
-        return None
-    for rule in rules:
-        field = rule.get("field")
-        pattern = rule.get("pattern")
-        if not field or not pattern:
-            continue
-        value = _get_field_value(row, field)
-        if value is None:
-            continue
-        if re.search(pattern, str(value), re.IGNORECASE):
-            return rule
-    return None
+    return _first_match(row, rules)
 
 
 class RuleSet:
     """
     Loaded classification rules from a vendor YAML file.
     Exposes state_rules list and entity rule lists (base_rules, service_rules, ...).
+    Rule lists are CompiledRuleList objects: patterns are compiled once at load time.
     """
 
-    def __init__(self, data: dict):
+    def __init__(self, data: dict, source_hash: Optional[str] = None, profiler=None):
         self._data = data
+        # SHA-256 of the YAML file (RuleSet.load), same value as run_summary rules_file_hash.
+        self._source_hash = source_hash
         sr = self._data.get("state_rules") or {}
         self._state_rules_list: List[dict] = sr.get("absent_keywords") or []
         self._state_override_list: List[dict] = sr.get("present_override_keywords") or []
-        self.base_rules: List[dict] = self._data.get("base_rules") or []
-        self.service_rules: List[dict] = self._data.get("service_rules") or []
-        self.logistic_rules: List[dict] = self._data.get("logistic_rules") or []
-        self.software_rules: List[dict] = self._data.get("software_rules") or []
-        self.note_rules: List[dict] = self._data.get("note_rules") or []
-        self.config_rules: List[dict] = self._data.get("config_rules") or []
-        self.hw_rules: List[dict] = self._data.get("hw_rules") or []
+        # Every pattern is compiled here, once per load: a malformed regex fails now
+        # (ValueError naming the rule_id) instead of in the middle of a run.
+        # profiler (RuleProfiler, --profile-rules) wraps every pattern to count and time its searches.
+        self.state_detector = compile_state_rules(self._state_rules_list, self._state_override_list, profiler)
+        # One literal prefilter per field, shared by every bucket (see LiteralIndex).
+        literals = LiteralIndex()
+        self.base_rules = CompiledRuleList(self._data.get("base_rules"), "base_rules", literals, profiler)
+        self.service_rules = CompiledRuleList(self._data.get("service_rules"), "service_rules", literals, profiler)
+        self.logistic_rules = CompiledRuleList(self._data.get("logistic_rules"), "logistic_rules", literals, profiler)
+        self.software_rules = CompiledRuleList(self._data.get("software_rules"), "software_rules", literals, profiler)
+        self.note_rules = CompiledRuleList(self._data.get("note_rules"), "note_rules", literals, profiler)
+        self.config_rules = CompiledRuleList(self._data.get("config_rules"), "config_rules", literals, profiler)
+        self.hw_rules = CompiledRuleList(self._data.get("hw_rules"), "hw_rules", literals, profiler)
 
         dtr = self._data.get("device_type_rules") or {}
-        self.device_type_rules: List[dict] = dtr.get("rules") or []
+        self.device_type_rules = CompiledRuleList(dtr.get("rules"), "device_type_rules", literals, profiler)
         applies = dtr.get("applies_to") or []
         self.device_type_applies_to = set(applies) if isinstance(applies, list) else set()
 
         htr = self._data.get("hw_type_rules") or {}
-        self.hw_type_rules: List[dict] = htr.get("rules") or []
+        self.hw_type_rules = CompiledRuleList(htr.get("rules"), "hw_type_rules", literals, profiler)
         self.hw_type_device_type_map: dict = htr.get("device_type_map") or {}
         self.hw_type_rule_id_map: dict = htr.get("rule_id_map") or {}
         ht_applies = htr.get("applies_to") or []
         self.hw_type_applies_to = set(ht_applies) if isinstance(ht_applies, list) else set()
 
     def get_state_rules(self):
-        """Return (absent_keywords, present_override_keywords) for detect_state."""
+        """Return (absent_keywords, present_override_keywords) for detect_state (raw YAML dicts)."""
         return (self._state_rules_list, self._state_override_list)
 
     def get_state_override_rules(self) -> List[dict]:
@@ -149,15 +579,83 @@ class RuleSet:
     def version(self) -> str:
         return self._data.get("version") or "0.0.0"
 
+    @property
+    def fingerprint(self) -> str:
+        """
+        Hex SHA-256 identifying these rules: the YAML file hash when loaded from disk,
+        otherwise a hash of the rules data. Caches of classification results key on it.
+        """
+        if self._source_hash is None:
+            canonical = json.dumps(self._data, sort_keys=True, ensure_ascii=False, default=str)
+            self._source_hash = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+        return self._source_hash
+
     @classmethod
-    def load(cls, filepath: str) -> "RuleSet":
-        """Load rules from a YAML file (UTF-8)."""
+    def load(cls, filepath: str, profiler=None, snapshot_dir=None) -> "RuleSet":
+        """
+        Load rules from a YAML file (UTF-8). profiler: optional RuleProfiler (see RuleSet.__init__).
+
+        snapshot_dir: directory of compiled snapshots. The RuleSet built from a YAML file is
+        pickled there under the file's SHA-256 and reused while the file (and this code) is
+        unchanged, skipping YAML parsing and rule preparation. Not used with a profiler.
+        """
         path = Path(filepath)
         if not path.is_absolute():
             # Allow relative to cwd or to package
             path = path.resolve()
-        with open(path, encoding="utf-8") as f:
-            data = yaml.safe_load(f)
+        with open(path, "rb") as f:
+            raw = f.read()
+        source_hash = hashlib.sha256(raw).hexdigest()
+        snapshot = None
+        if snapshot_dir is not None and profiler is None:
+            snapshot = Path(snapshot_dir) / f"{source_hash}{SNAPSHOT_SUFFIX}"
+            ruleset = _read_snapshot(snapshot)
+            if ruleset is not None:
+                return ruleset
+        data = yaml.load(raw.decode("utf-8"), Loader=_YamlLoader)
         if not data:
             data = {}
-        return cls(data)
+        ruleset = cls(data, source_hash=source_hash, profiler=profiler)
+        if snapshot is not None:
+            _write_snapshot(snapshot, ruleset)
+        return ruleset
+
+
+def _code_version() -> str:
+    """Hash of the modules whose classes a snapshot pickles; a code change invalidates snapshots."""
+    global _snapshot_code_version
+    if _snapshot_code_version is None:
+        h = hashlib.sha256(sys.version.encode("utf-8"))
+        for module_file in (__file__, state_detector.__file__):
+            with open(module_file, "rb") as f:
+                h.update(f.read())
+        _snapshot_code_version = h.hexdigest()
+    return _snapshot_code_version
+
+
+def _read_snapshot(path: Path) -> Optional[RuleSet]:
+    """RuleSet from a snapshot written by this code version; None if missing, stale or unreadable."""
+    try:
+        with open(path, "rb") as f:
+            code_version, ruleset = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        _log.debug("Ignoring unreadable rules snapshot %s: %s", path, e)
+        return None
+    if code_version != _code_version() or not isinstance(ruleset, RuleSet):
+        return None
+    return ruleset
+
+
+def _write_snapshot(path: Path, ruleset: RuleSet) -> None:
+    """Write the snapshot atomically (temp file + replace); failures only cost the next load its speedup."""
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp, "wb") as f:
+            pickle.dump((_code_version(), ruleset), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    except (OSError, pickle.PicklingError) as e:
+        _log.warning("Cannot write rules snapshot %s: %s", path, e)
+        tmp.unlink(missing_ok=True)
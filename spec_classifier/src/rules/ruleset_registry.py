@@ -0,0 +1,51 @@
+"""
+Per-process registry of loaded RuleSets (batch mode: one load per rules file, not per input).
+
+Entries are keyed by the resolved path and validated against the file's mtime and size on
+every get(): a rules YAML edited in the middle of a batch is loaded again for the next file.
+The file's SHA-256 travels with the RuleSet (RuleSet.fingerprint == run_summary rules_file_hash).
+"""
+
+import logging
+import os
+from pathlib import Path
+from typing import Optional
+
+from src.rules.rules_engine import RuleSet
+
+_log = logging.getLogger(__name__)
+
+
+class RuleSetRegistry:
+    """{resolved rules path: ((mtime_ns, size), RuleSet)}; get() loads on first use or after a change."""
+
+    def __init__(self):
+        self._entries: dict = {}
+        self.loads = 0
+        self.reuses = 0
+
+    def get(self, path, snapshot_dir: Optional[Path] = None) -> RuleSet:
+        """RuleSet for path, reused while the file is unchanged. snapshot_dir: see RuleSet.load."""
+        key = str(Path(path).resolve())
+        # stat before reading: a change during the load leaves a stale stamp, so the next get() reloads.
+        st = os.stat(key)
+        stamp = (st.st_mtime_ns, st.st_size)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == stamp:
+            self.reuses += 1
+            return entry[1]
+        if entry is not None:
+            _log.info("Rules file changed, reloading: %s", key)
+        ruleset = RuleSet.load(key, snapshot_dir=snapshot_dir)
+        self._entries[key] = (stamp, ruleset)
+        self.loads += 1
+        return ruleset
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.loads = 0
+        self.reuses = 0
+
+
+# Process-wide registry: main.py shares it across every file of a batch.
+ruleset_registry = RuleSetRegistry()
@@ -1,7 +1,8 @@
-import openpyxl
+from src.core.row_table import RowTable
+from src.core.workbook import open_workbook
 from src.vendors.base import VendorAdapter
 from src.vendors.cisco.parser import parse_excel
-from src.vendors.cisco.normalizer import normalize_cisco_rows
+from src.vendors.cisco.normalizer import CiscoNormalizedRow, normalize_cisco_rows
 
 
 class CiscoAdapter(VendorAdapter):
@@ -9,17 +10,14 @@ class CiscoAdapter(VendorAdapter):
         self._config = config or {}
 
     def can_parse(self, path: str) -> bool:
-        wb = openpyxl.load_workbook(path, read_only=True)
-        try:
-            return "Price Estimate" in wb.sheetnames
-        finally:
-            wb.close()
+        with open_workbook(path) as session:
+            return "Price Estimate" in session.sheet_names
 
     def parse(self, filepath: str):
         return parse_excel(filepath)
 
     def normalize(self, raw_rows):
-        return normalize_cisco_rows(raw_rows)
+        return RowTable(CiscoNormalizedRow, normalize_cisco_rows(raw_rows))
 
     def get_rules_file(self):
         vendor_rules = self._config.get("vendor_rules", {})
@@ -7,11 +7,16 @@ import pandas as pd
 from pathlib import Path
 from typing import List, Tuple
 
+from src.core.workbook import iter_records, open_workbook
+
+# Rows scanned for the 'Line Number' + 'Part Number' header row.
+HEADER_SCAN_ROWS = 100
+
 
 def find_header_row(filepath: str) -> int:
     """
     Читает лист 'Price Estimate' (строго, без fallback).
-    Сканирует строки 0..99.
+    Сканирует строки 0..HEADER_SCAN_ROWS-1 (остальной лист не декодируется).
     Возвращает 0-based индекс строки где ОДНОВРЕМЕННО
     присутствуют "Line Number" И "Part Number" среди ячеек строки.
     Raises ValueError если sheet отсутствует (сообщение включает список доступных sheets)
@@ -21,19 +26,17 @@ def find_header_row(filepath: str) -> int:
     if not path.exists():
         raise FileNotFoundError(f"Excel file not found: {filepath}")
 
-    xl = pd.ExcelFile(path, engine="openpyxl")
-    if "Price Estimate" not in xl.sheet_names:
-        raise ValueError(
-            f"Sheet 'Price Estimate' not found in {filepath}. "
-            f"Available sheets: {xl.sheet_names}"
-        )
-
-    df = pd.read_excel(path, sheet_name="Price Estimate", header=None, engine="openpyxl")
-    for i in range(min(len(df), 100)):
-        row = df.iloc[i]
-        cells = [str(v).strip() for v in row if pd.notna(v)]
+    with open_workbook(path) as session:
+        if "Price Estimate" not in session.sheet_names:
+            raise ValueError(
+                f"Sheet 'Price Estimate' not found in {filepath}. "
+                f"Available sheets: {session.sheet_names}"
+            )
+        rows = session.head_rows("Price Estimate", HEADER_SCAN_ROWS)
+    for i, row in enumerate(rows):
+        cells = [str(v).strip() for v in row if v is not None]
         if "Line Number" in cells and "Part Number" in cells:
-            return int(i)
+            return i
     raise ValueError(f"Header row (Line Number + Part Number) not found in sheet 'Price Estimate' in {filepath}")
 
 
@@ -63,7 +66,7 @@ def parse_excel(filepath: str) -> Tuple[List[dict], int]:
     2. find_header_row() → header_row_index
     3. Прочитать DataFrame с header=header_row_index
     4. find_data_end() → количество строк данных
-    5. Для каждой строки данных: dict из row.to_dict() + '__row_index__'
+    5. Для каждой строки данных: dict (как row.to_dict(), см. iter_records) + '__row_index__'
     6. __row_index__ = pandas_idx + header_row_index + 2 (1-based Excel row number)
     7. Вернуть (rows, header_row_index)
     """
@@ -71,18 +74,17 @@ def parse_excel(filepath: str) -> Tuple[List[dict], int]:
     if not path.exists():
         raise FileNotFoundError(f"Excel file not found: {filepath}")
 
-    header_row_index = find_header_row(filepath)
-    df = pd.read_excel(path, sheet_name="Price Estimate", header=header_row_index, engine="openpyxl")
+    with open_workbook(path) as session:
+        header_row_index = find_header_row(filepath)
+        df = session.dataframe("Price Estimate", header=header_row_index)
 
     n_data = find_data_end(df)
     if n_data <= 0:
         return ([], header_row_index)
 
     rows: List[dict] = []
-    for pandas_idx in range(n_data):
-        row = df.iloc[pandas_idx]
-        row_dict = row.to_dict()
-        row_dict["__row_index__"] = int(pandas_idx) + header_row_index + 2
+    for pandas_idx, row_dict in enumerate(iter_records(df.iloc[:n_data])):
+        row_dict["__row_index__"] = pandas_idx + header_row_index + 2
         rows.append(row_dict)
 
     return (rows, header_row_index)
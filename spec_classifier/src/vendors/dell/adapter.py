@@ -1,7 +1,8 @@
-import openpyxl
 from src.vendors.base import VendorAdapter
 from src.core.parser import parse_excel
-from src.core.normalizer import normalize_row
+from src.core.normalizer import NormalizedRow, normalize_row, normalize_table
+from src.core.row_table import RowTable
+from src.core.workbook import open_workbook
 
 
 class DellAdapter(VendorAdapter):
@@ -10,24 +11,23 @@ class DellAdapter(VendorAdapter):
 
     def can_parse(self, path: str) -> bool:
         """Positive signature: first sheet contains 'Module Name' in first 20 rows."""
-        wb = openpyxl.load_workbook(path, read_only=True)
-        try:
-            if not wb.sheetnames:
+        with open_workbook(path) as session:
+            if not session.sheet_names:
                 return False
-            ws = wb[wb.sheetnames[0]]
-            for row in ws.iter_rows(max_row=20, values_only=True):
+            for row in session.iter_rows(0, max_row=20):
                 for val in row:
                     if val is not None and str(val).strip() == "Module Name":
                         return True
             return False
-        finally:
-            wb.close()
 
     def parse(self, filepath: str):
         return parse_excel(filepath)
 
     def normalize(self, raw_rows):
-        return [normalize_row(r) for r in raw_rows]
+        if isinstance(raw_rows, RowTable):
+            # parse_excel output is columnar already: normalize column by column.
+            return normalize_table(raw_rows)
+        return RowTable(NormalizedRow, (normalize_row(r) for r in raw_rows))
 
     def get_rules_file(self):
         vendor_rules = self._config.get("vendor_rules", {})
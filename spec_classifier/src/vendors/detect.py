@@ -0,0 +1,38 @@
+"""
+Vendor detection from the workbook itself (main.py --vendor auto).
+
+detect_vendor(path, adapters) evaluates every adapter's can_parse signature inside one
+open_workbook() session: the file is read from disk once, and the rows the signatures
+look at — sheet names (Cisco), BOM row 1 (HPE), AllInOne rows 1-9 (Huawei, xFusion),
+the first 30 rows of each candidate sheet (Lenovo), the first 20 rows of the first sheet
+(Dell) — are decoded once and shared. Huawei and xFusion read the same cached AllInOne
+rows; the Lenovo sheet probe stays on the session for parse() in the same block.
+"""
+
+import logging
+from pathlib import Path
+from typing import Mapping, Optional, Union
+
+from src.core.workbook import open_workbook
+from src.vendors.base import VendorAdapter
+
+_log = logging.getLogger(__name__)
+
+# Most specific signature first: a workbook matching several signatures is assigned to the
+# first of them (Dell's "Module Name" anywhere in the first rows is the loosest).
+DETECTION_ORDER = ("cisco", "hpe", "huawei", "xfusion", "lenovo", "dell")
+
+
+def detect_vendor(path: Union[str, Path], adapters: Mapping[str, VendorAdapter]) -> Optional[str]:
+    """
+    The vendor (key of adapters) whose can_parse(path) holds, or None when no signature
+    matches. All signatures are evaluated; when several match, DETECTION_ORDER decides
+    and a warning is logged. Errors reading the file propagate (as from can_parse).
+    """
+    order = {vendor: i for i, vendor in enumerate(DETECTION_ORDER)}
+    vendors = sorted(adapters, key=lambda v: order.get(v, len(order)))
+    with open_workbook(path):
+        matches = [vendor for vendor in vendors if adapters[vendor].can_parse(str(path))]
+    if len(matches) > 1:
+        _log.warning("%s matches several vendor signatures %s; using %s", Path(path).name, matches, matches[0])
+    return matches[0] if matches else None
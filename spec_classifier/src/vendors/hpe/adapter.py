@@ -1,7 +1,8 @@
-import openpyxl
+from src.core.row_table import RowTable
+from src.core.workbook import open_workbook
 from src.vendors.base import VendorAdapter
 from src.vendors.hpe.parser import parse_excel
-from src.vendors.hpe.normalizer import normalize_hpe_rows
+from src.vendors.hpe.normalizer import HPENormalizedRow, normalize_hpe_rows
 
 
 class HPEAdapter(VendorAdapter):
@@ -14,22 +15,18 @@ class HPEAdapter(VendorAdapter):
         1. Sheet "BOM" present in workbook.
         2. Row 1 contains both "Product #" and "Product Description".
         """
-        wb = openpyxl.load_workbook(path, read_only=True)
-        try:
-            if "BOM" not in wb.sheetnames:
+        with open_workbook(path) as session:
+            if "BOM" not in session.sheet_names:
                 return False
-            ws = wb["BOM"]
-            row1 = next(ws.iter_rows(max_row=1, values_only=True), ())
+            row1 = next(session.iter_rows("BOM", max_row=1), ())
             cells = {str(v).strip() for v in row1 if v is not None}
             return "Product #" in cells and "Product Description" in cells
-        finally:
-            wb.close()
 
     def parse(self, filepath: str):
         return parse_excel(filepath)
 
     def normalize(self, raw_rows):
-        return normalize_hpe_rows(raw_rows)
+        return RowTable(HPENormalizedRow, normalize_hpe_rows(raw_rows))
 
     def get_rules_file(self):
         vendor_rules = self._config.get("vendor_rules", {})
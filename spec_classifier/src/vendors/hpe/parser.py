@@ -4,10 +4,11 @@ Sheet 'BOM', header row 0 (no preamble).
 Columns determined by name via col_map (not by index — columns are unstable across files).
 """
 
-import openpyxl
 from pathlib import Path
 from typing import List, Tuple
 
+from src.core.workbook import open_workbook
+
 
 def parse_excel(filepath: str) -> Tuple[List[dict], int]:
     """
@@ -25,15 +26,13 @@ def parse_excel(filepath: str) -> Tuple[List[dict], int]:
     if not path.exists():
         raise FileNotFoundError(f"Excel file not found: {filepath}")
 
-    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
-    try:
-        if "BOM" not in wb.sheetnames:
+    with open_workbook(path) as session:
+        if "BOM" not in session.sheet_names:
             raise ValueError(
                 f"Sheet 'BOM' not found in {filepath}. "
-                f"Available sheets: {wb.sheetnames}"
+                f"Available sheets: {session.sheet_names}"
             )
-        ws = wb["BOM"]
-        rows_iter = ws.iter_rows(values_only=True)
+        rows_iter = session.iter_rows("BOM")
 
         # Row 0: header (header_row_index = 0)
         header_row = next(rows_iter, None)
@@ -71,5 +70,3 @@ def parse_excel(filepath: str) -> Tuple[List[dict], int]:
             excel_row_number += 1
 
         return (rows, 0)
-    finally:
-        wb.close()
@@ -1,7 +1,8 @@
-import openpyxl
+from src.core.row_table import RowTable
+from src.core.workbook import open_workbook
 from src.vendors.base import VendorAdapter
 from src.vendors.huawei.parser import parse_excel
-from src.vendors.huawei.normalizer import normalize_huawei_rows
+from src.vendors.huawei.normalizer import HuaweiNormalizedRow, iter_normalize_huawei_rows
 
 
 class HuaweiAdapter(VendorAdapter):
@@ -21,12 +22,10 @@ class HuaweiAdapter(VendorAdapter):
         See VENDOR_FORMAT_SPEC.md (xfusion) §3.2 for the discrimination rationale
         and §3.5 for the 15-fixture verification matrix (5 hu + 10 xf, disjoint).
         """
-        wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
-        try:
-            if "AllInOne" not in wb.sheetnames:
+        with open_workbook(path) as session:
+            if "AllInOne" not in session.sheet_names:
                 return False
-            ws = wb["AllInOne"]
-            rows = list(ws.iter_rows(min_row=1, max_row=9, values_only=True))
+            rows = list(session.iter_rows("AllInOne", max_row=9))
             if len(rows) < 9:
                 return False
             r0, r8 = rows[0], rows[8]
@@ -37,17 +36,15 @@ class HuaweiAdapter(VendorAdapter):
             if r8c8 and ("FOB" in r8c8.upper() or "HONG KONG" in r8c8.upper()):
                 return True
             # Branch B: hidden prices — absence of xFusion sidecar implies Huawei
-            if not r8c8 and "Main Equipment Statistic" not in wb.sheetnames:
+            if not r8c8 and "Main Equipment Statistic" not in session.sheet_names:
                 return True
             return False
-        finally:
-            wb.close()
 
     def parse(self, filepath: str):
         return parse_excel(filepath)
 
     def normalize(self, raw_rows):
-        return normalize_huawei_rows(raw_rows)
+        return RowTable(HuaweiNormalizedRow, iter_normalize_huawei_rows(raw_rows))
 
     def get_rules_file(self):
         vendor_rules = self._config.get("vendor_rules", {})
@@ -7,7 +7,7 @@ resets module_name; mid-level (depth 2) sets module_name; leaf rows
 """
 
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Iterable, Iterator, List, Optional
 
 from src.core.normalizer import NormalizedRow, RowKind
 
@@ -31,11 +31,11 @@ class HuaweiNormalizedRow(NormalizedRow):
     eos:            str   = ""
 
 
-def normalize_huawei_rows(raw_rows: List[dict]) -> List[HuaweiNormalizedRow]:
-    if not raw_rows:
-        return []
-
-    result: List[HuaweiNormalizedRow] = []
+def iter_normalize_huawei_rows(raw_rows: Iterable[dict]) -> Iterator[HuaweiNormalizedRow]:
+    """
+    Normalize raw Huawei AllInOne rows one at a time, in a single pass (the rollup
+    context is carried from row to row), so raw_rows may be a generator.
+    """
     current_group_name: Optional[str] = None
     current_module_name: str = ""
 
@@ -108,26 +108,27 @@ def normalize_huawei_rows(raw_rows: List[dict]) -> List[HuaweiNormalizedRow]:
         option_id = part_number if is_leaf else None
         skus = [part_number] if is_leaf else []
 
-        result.append(
-            HuaweiNormalizedRow(
-                source_row_index=source_row_index,
-                row_kind=row_kind,
-                group_name=current_group_name if current_group_name else None,
-                group_id=None,
-                product_name=product_name,
-                module_name=current_module_name,
-                option_name=option_name,
-                option_id=option_id,
-                skus=skus,
-                qty=qty,
-                option_price=option_price,
-                position_no=position_no,
-                unit_qty=unit_qty,
-                total_price=total_price,
-                lead_time_days=lead_time_days,
-                eom=eom_val,
-                eos=eos_val,
-            )
+        yield HuaweiNormalizedRow(
+            source_row_index=source_row_index,
+            row_kind=row_kind,
+            group_name=current_group_name if current_group_name else None,
+            group_id=None,
+            product_name=product_name,
+            module_name=current_module_name,
+            option_name=option_name,
+            option_id=option_id,
+            skus=skus,
+            qty=qty,
+            option_price=option_price,
+            position_no=position_no,
+            unit_qty=unit_qty,
+            total_price=total_price,
+            lead_time_days=lead_time_days,
+            eom=eom_val,
+            eos=eos_val,
         )
 
-    return result
+
+def normalize_huawei_rows(raw_rows: Iterable[dict]) -> List[HuaweiNormalizedRow]:
+    """List form of iter_normalize_huawei_rows() (adapter.normalize / batch callers)."""
+    return list(iter_normalize_huawei_rows(raw_rows))
@@ -11,9 +11,11 @@ shape (≤12 alnum chars, no whitespace); descriptive subcategory text is
 nulled so downstream normalizer treats the row as HEADER.
 """
 
-import openpyxl
 from pathlib import Path
-from typing import List, Tuple
+from typing import Iterator, Tuple
+
+from src.core.row_table import RowTable
+from src.core.workbook import open_workbook
 
 
 _SHEET_NAME = "AllInOne"
@@ -57,38 +59,36 @@ def _find_col_index(header_row_values: tuple, name: str, partial: bool = False)
     return -1
 
 
-def parse_excel(filepath: str) -> Tuple[List[dict], int]:
+def iter_excel_rows(filepath: str) -> Iterator[dict]:
     """
-    Parse Huawei eDeal AllInOne sheet.
+    Parse Huawei eDeal AllInOne sheet, one row dict at a time.
 
-    Returns (rows, header_row_index=8).
+    Single pass over the sheet's rows (header row 8 resolves the optional
+    header-lookup columns, data from row 9); only the current row is held.
     Each row dict contains fixed-index columns plus optional header-lookup
     columns (production_lt_days, eom, eos) and __row_index__ (1-based Excel row).
+    FileNotFoundError / ValueError are raised on the first next().
     """
     path = Path(filepath)
     if not path.exists():
         raise FileNotFoundError(f"Excel file not found: {filepath}")
 
-    wb = openpyxl.load_workbook(path, read_only=True, data_only=False)
-    try:
-        if _SHEET_NAME not in wb.sheetnames:
+    with open_workbook(path) as session:
+        if _SHEET_NAME not in session.sheet_names:
             raise ValueError(
                 f"Sheet '{_SHEET_NAME}' not found in {filepath}. "
-                f"Available sheets: {wb.sheetnames}"
+                f"Available sheets: {session.sheet_names}"
             )
-        ws = wb[_SHEET_NAME]
-        all_rows = list(ws.iter_rows(values_only=True))
-
-        # Resolve optional header-lookup column indices
-        header_values = all_rows[_HEADER_ROW] if len(all_rows) > _HEADER_ROW else ()
-        lt_col_idx = _find_col_index(header_values, "Production LT", partial=True)
-        eom_col_idx = _find_col_index(header_values, "EOM", partial=False)
-        eos_col_idx = _find_col_index(header_values, "EOS", partial=False)
 
-        rows: List[dict] = []
-
-        for i in range(_DATA_START_ROW, len(all_rows)):
-            raw = all_rows[i]
+        for i, raw in enumerate(session.stream_rows(_SHEET_NAME, data_only=False)):
+            if i < _HEADER_ROW:
+                continue
+            if i == _HEADER_ROW:
+                # Resolve optional header-lookup column indices
+                lt_col_idx = _find_col_index(raw, "Production LT", partial=True)
+                eom_col_idx = _find_col_index(raw, "EOM", partial=False)
+                eos_col_idx = _find_col_index(raw, "EOS", partial=False)
+                continue
             excel_row_1based = i + 1
 
             col0 = raw[0] if len(raw) > 0 else None
@@ -139,8 +139,15 @@ def parse_excel(filepath: str) -> Tuple[List[dict], int]:
                 "eos":                  eos_val if eos_val is not None else "",
                 "__row_index__":        excel_row_1based,
             }
-            rows.append(row_dict)
+            yield row_dict
+
 
-        return (rows, _HEADER_ROW)
-    finally:
-        wb.close()
+def parse_excel(filepath: str) -> Tuple[RowTable, int]:
+    """
+    Parse Huawei eDeal AllInOne sheet.
+
+    Returns (RowTable(dict) of iter_excel_rows(filepath), header_row_index=8):
+    rows are encoded into the table as they are read, no list of dicts is built.
+    FileNotFoundError / ValueError as iter_excel_rows.
+    """
+    return (RowTable(dict, iter_excel_rows(filepath)), _HEADER_ROW)
@@ -1,19 +1,21 @@
-from typing import Optional
+import threading
 
+from src.core.row_table import RowTable
 from src.vendors.base import VendorAdapter
 from src.vendors.lenovo.parser import (
     parse_excel_with_sheet,
     workbook_has_lenovo_dcsc_header,
 )
-from src.vendors.lenovo.normalizer import normalize_lenovo_rows
+from src.vendors.lenovo.normalizer import LenovoNormalizedRow, normalize_lenovo_rows
 
 
 class LenovoAdapter(VendorAdapter):
     def __init__(self, config: dict = None):
         self._config = config or {}
-        # Sheet name actually used by the most recent parse() call; consumed by
-        # get_source_sheet_name() so annotated_writer reads from the same sheet.
-        self._last_source_sheet: Optional[str] = None
+        # Sheet name actually used by the most recent parse() call in each thread; consumed
+        # by get_source_sheet_name() so annotated_writer reads from the same sheet. Per
+        # thread, so an adapter shared by concurrent runs never hands out another file's sheet.
+        self._parse_state = threading.local()
 
     def can_parse(self, path: str) -> bool:
         """
@@ -24,13 +26,13 @@ class LenovoAdapter(VendorAdapter):
         return workbook_has_lenovo_dcsc_header(path)
 
     def parse(self, filepath: str):
-        self._last_source_sheet = None
+        self._parse_state.source_sheet = None
         rows, header_row_index, chosen_sheet = parse_excel_with_sheet(filepath)
-        self._last_source_sheet = chosen_sheet
+        self._parse_state.source_sheet = chosen_sheet
         return (rows, header_row_index)
 
     def normalize(self, raw_rows):
-        return normalize_lenovo_rows(raw_rows)
+        return RowTable(LenovoNormalizedRow, normalize_lenovo_rows(raw_rows))
 
     def get_rules_file(self):
         vendor_rules = self._config.get("vendor_rules", {})
@@ -52,11 +54,11 @@ class LenovoAdapter(VendorAdapter):
 
     def get_source_sheet_name(self) -> str | None:
         """
-        Sheet name actually used by the most recent parse() call. Returns None if
-        parse() has not run yet -- callers (annotated_writer) treat None as "use
+        Sheet name actually used by the most recent parse() call in this thread. Returns
+        None if parse() has not run yet -- callers (annotated_writer) treat None as "use
         sheet index 0", which matches the legacy default.
         """
-        return self._last_source_sheet
+        return getattr(self._parse_state, "source_sheet", None)
 
     def get_extra_cols(self) -> list[tuple[str, str]]:
         return [("export_control", "export_control")]
@@ -3,7 +3,9 @@ Lenovo DCSC (Data Center Solution Configurator) Excel parser.
 
 Sheet selection: try "Quote", then "Quote w availability", then other sheets
 (in workbook order), skipping DCSC utility sheets. The first sheet whose first
-30 rows contain the marker header row wins.
+30 rows contain the marker header row wins. Only those 30 rows of each candidate
+are decoded; the result is cached on the workbook session (probe_dcsc_sheet), so
+can_parse and parse of the same file probe once.
 
 Header row: found by scanning for all of Part number, Product Description,
 Qty, Price, Export Control (exact names, stripped). Columns are read via
@@ -14,12 +16,17 @@ data_only=False keeps formula objects in Total Part Price if that column is
 read later; we do not expose it in output.
 """
 
-import openpyxl
+from itertools import islice
 from pathlib import Path
 from typing import Dict, List, Optional, Sequence, Tuple
 
+from src.core.workbook import open_workbook
+
 _STOP_SENTINEL = "terms and conditions"
 
+# WorkbookSession.probes key of the probe_dcsc_sheet() result.
+_PROBE_KEY = "lenovo.dcsc_sheet"
+
 HEADER_MARKERS: Tuple[str, ...] = (
     "Part number",
     "Product Description",
@@ -79,25 +86,34 @@ def find_lenovo_header_in_rows(
     return None
 
 
+def probe_dcsc_sheet(filepath: str) -> Optional[Tuple[str, int, Dict[str, int]]]:
+    """
+    First candidate sheet with the marker header in its first 30 rows, as
+    (sheet name, 0-based header row index, col_map); None if no sheet has it.
+
+    Reads only the first 30 rows of each candidate. Cached on the open_workbook()
+    session, so can_parse and parse inside one session probe once.
+    """
+    with open_workbook(filepath) as session:
+        if _PROBE_KEY in session.probes:
+            return session.probes[_PROBE_KEY]
+        hit = None
+        for name in ordered_sheet_candidates(session.sheet_names):
+            head = list(islice(session.iter_rows(name, data_only=False), _header_scan_limit()))
+            header_hit = find_lenovo_header_in_rows(head)
+            if header_hit is not None:
+                hit = (name, header_hit[0], header_hit[1])
+                break
+        session.probes[_PROBE_KEY] = hit
+        return hit
+
+
 def workbook_has_lenovo_dcsc_header(filepath: str) -> bool:
     """True if any non-excluded sheet has the marker header in its first 30 rows."""
     path = Path(filepath)
     if not path.exists():
         return False
-    wb = openpyxl.load_workbook(path, read_only=True, data_only=False)
-    try:
-        for name in ordered_sheet_candidates(wb.sheetnames):
-            ws = wb[name]
-            chunk: List[Tuple] = []
-            for j, row in enumerate(ws.iter_rows(values_only=True)):
-                chunk.append(tuple(row))
-                if j >= _header_scan_limit() - 1:
-                    break
-            if find_lenovo_header_in_rows(chunk) is not None:
-                return True
-        return False
-    finally:
-        wb.close()
+    return probe_dcsc_sheet(filepath) is not None
 
 
 def _first_nonempty_stripped(raw_row: Sequence) -> str:
@@ -140,63 +156,29 @@ def parse_excel_with_sheet(filepath: str) -> Tuple[List[dict], int, str]:
     if not path.exists():
         raise FileNotFoundError(f"Excel file not found: {filepath}")
 
-    wb = openpyxl.load_workbook(path, read_only=True, data_only=False)
-    try:
-        sheetnames = wb.sheetnames
-        chosen: Optional[str] = None
-        all_rows: Optional[List[Tuple]] = None
-        header_row_index: int = 0
-        col_map: Dict[str, int] = {}
-
-        for name in ordered_sheet_candidates(sheetnames):
-            ws = wb[name]
-            rows = list(ws.iter_rows(values_only=True))
-            header_hit = find_lenovo_header_in_rows(rows[: _header_scan_limit()])
-            if header_hit is None:
-                continue
-            header_row_index, _ = header_hit
-            header_tuple = rows[header_row_index]
-            col_map = {}
-            for idx, val in enumerate(header_tuple):
-                if val is not None:
-                    col_map[str(val).strip()] = idx
-            missing = [m for m in HEADER_MARKERS if m not in col_map]
-            if missing:
-                raise ValueError(
-                    f"Lenovo header row missing columns {missing} in sheet {name!r} "
-                    f"of {filepath}. Found headers: {sorted(col_map.keys())}"
-                )
-            chosen = name
-            all_rows = rows
-            break
-
-        if chosen is None or all_rows is None:
+    with open_workbook(path) as session:
+        probe = probe_dcsc_sheet(filepath)
+        if probe is None:
             raise ValueError(
                 f"No Lenovo DCSC header row found (need all markers {HEADER_MARKERS}) "
-                f"in any sheet of {filepath}. Sheets: {sheetnames}"
+                f"in any sheet of {filepath}. Sheets: {session.sheet_names}"
             )
+        chosen, header_row_index, col_map = probe
 
+        # One pass over the chosen sheet: skip to the first row with a Part number
+        # after the header, then read until the Terms and Conditions sentinel.
         pn_idx = col_map["Part number"]
-        data_start = len(all_rows)
-        for i in range(header_row_index + 1, len(all_rows)):
-            if _part_number_nonempty(all_rows[i], pn_idx):
-                data_start = i
-                break
-
         rows_out: List[dict] = []
         seen_data = False
 
-        for i in range(data_start, len(all_rows)):
-            raw = all_rows[i]
-            excel_row_1based = i + 1
-
+        for i, raw in enumerate(session.iter_rows(chosen, data_only=False)):
+            if i <= header_row_index:
+                continue
+            if not seen_data and not _part_number_nonempty(raw, pn_idx):
+                continue
             if _first_nonempty_stripped(raw).lower().startswith(_STOP_SENTINEL):
                 break
-
-            if not seen_data:
-                if not _part_number_nonempty(raw, pn_idx):
-                    continue
-                seen_data = True
+            seen_data = True
 
             rows_out.append(
                 {
@@ -205,13 +187,11 @@ def parse_excel_with_sheet(filepath: str) -> Tuple[List[dict], int, str]:
                     "Qty": _cell_at(raw, col_map["Qty"]),
                     "Price": _cell_at(raw, col_map["Price"]),
                     "Export Control": _cell_at(raw, col_map["Export Control"]),
-                    "__row_index__": excel_row_1based,
+                    "__row_index__": i + 1,
                 }
             )
 
         return (rows_out, header_row_index, chosen)
-    finally:
-        wb.close()
 
 
 def parse_excel(filepath: str) -> Tuple[List[dict], int]:
@@ -1,7 +1,8 @@
-import openpyxl
+from src.core.row_table import RowTable
+from src.core.workbook import open_workbook
 from src.vendors.base import VendorAdapter
 from src.vendors.xfusion.parser import parse_excel
-from src.vendors.xfusion.normalizer import normalize_xfusion_rows
+from src.vendors.xfusion.normalizer import XFusionNormalizedRow, iter_normalize_xfusion_rows
 
 
 class XFusionAdapter(VendorAdapter):
@@ -31,12 +32,10 @@ class XFusionAdapter(VendorAdapter):
         formula that resolves differently for Huawei vs xFusion based on the
         injected default for the QF_SYS_TRADETERMDESC1 named range.
         """
-        wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
-        try:
-            if "AllInOne" not in wb.sheetnames:
+        with open_workbook(path) as session:
+            if "AllInOne" not in session.sheet_names:
                 return False
-            ws = wb["AllInOne"]
-            rows = list(ws.iter_rows(min_row=1, max_row=9, values_only=True))
+            rows = list(session.iter_rows("AllInOne", max_row=9))
             if len(rows) < 9:
                 return False
             r0, r8 = rows[0], rows[8]
@@ -47,17 +46,15 @@ class XFusionAdapter(VendorAdapter):
             if r8c8 and "FOB" not in r8c8.upper() and "HONG KONG" not in r8c8.upper():
                 return True
             # Branch B: hidden prices — sidecar sheet is xFusion-only
-            if not r8c8 and "Main Equipment Statistic" in wb.sheetnames:
+            if not r8c8 and "Main Equipment Statistic" in session.sheet_names:
                 return True
             return False
-        finally:
-            wb.close()
 
     def parse(self, filepath: str):
         return parse_excel(filepath)
 
     def normalize(self, raw_rows):
-        return normalize_xfusion_rows(raw_rows)
+        return RowTable(XFusionNormalizedRow, iter_normalize_xfusion_rows(raw_rows))
 
     def get_rules_file(self):
         vendor_rules = self._config.get("vendor_rules", {})
@@ -27,7 +27,7 @@ Reset rules (CC Q7 — module_name is group-local):
 """
 
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Iterable, Iterator, List, Optional
 
 from src.core.normalizer import NormalizedRow, RowKind
 from src.vendors.xfusion.parser import _is_sku_shape
@@ -62,15 +62,12 @@ def _strip_site_suffix(name: str) -> str:
     return s
 
 
-def normalize_xfusion_rows(raw_rows: List[dict]) -> List[XFusionNormalizedRow]:
+def iter_normalize_xfusion_rows(raw_rows: Iterable[dict]) -> Iterator[XFusionNormalizedRow]:
     """
-    Normalize raw xFusion AllInOne rows into XFusionNormalizedRow objects.
+    Normalize raw xFusion AllInOne rows into XFusionNormalizedRow objects, one at a
+    time in a single pass (raw_rows may be a generator).
     See module docstring for the level taxonomy.
     """
-    if not raw_rows:
-        return []
-
-    result: List[XFusionNormalizedRow] = []
     current_group_name:   Optional[str] = None
     current_product_name: Optional[str] = None
     current_module_name:  str           = ""
@@ -121,25 +118,23 @@ def normalize_xfusion_rows(raw_rows: List[dict]) -> List[XFusionNormalizedRow]:
         is_item = (not position_no) and _is_sku_shape(part_number) and bool(description)
 
         if is_item:
-            result.append(
-                XFusionNormalizedRow(
-                    source_row_index=source_row_index,
-                    row_kind=RowKind.ITEM,
-                    group_name=current_group_name,
-                    group_id=None,
-                    product_name=current_product_name,
-                    module_name=current_module_name,
-                    option_name=description,
-                    option_id=part_number,
-                    skus=[part_number],
-                    qty=qty,
-                    option_price=option_price,
-                    position_no=position_no,
-                    model=model_str,
-                    unit_qty=unit_qty,
-                    total_price=total_price,
-                    lead_time_days=lead_time_days,
-                )
+            yield XFusionNormalizedRow(
+                source_row_index=source_row_index,
+                row_kind=RowKind.ITEM,
+                group_name=current_group_name,
+                group_id=None,
+                product_name=current_product_name,
+                module_name=current_module_name,
+                option_name=description,
+                option_id=part_number,
+                skus=[part_number],
+                qty=qty,
+                option_price=option_price,
+                position_no=position_no,
+                model=model_str,
+                unit_qty=unit_qty,
+                total_price=total_price,
+                lead_time_days=lead_time_days,
             )
             continue
 
@@ -158,25 +153,26 @@ def normalize_xfusion_rows(raw_rows: List[dict]) -> List[XFusionNormalizedRow]:
         elif position_no.count(".") >= 2:
             current_module_name = part_number
 
-        result.append(
-            XFusionNormalizedRow(
-                source_row_index=source_row_index,
-                row_kind=RowKind.HEADER,
-                group_name=current_group_name,
-                group_id=None,
-                product_name=current_product_name,
-                module_name=current_module_name,
-                option_name=description,
-                option_id=None,
-                skus=[],
-                qty=qty,
-                option_price=option_price,
-                position_no=position_no,
-                model=model_str,
-                unit_qty=unit_qty,
-                total_price=total_price,
-                lead_time_days=lead_time_days,
-            )
+        yield XFusionNormalizedRow(
+            source_row_index=source_row_index,
+            row_kind=RowKind.HEADER,
+            group_name=current_group_name,
+            group_id=None,
+            product_name=current_product_name,
+            module_name=current_module_name,
+            option_name=description,
+            option_id=None,
+            skus=[],
+            qty=qty,
+            option_price=option_price,
+            position_no=position_no,
+            model=model_str,
+            unit_qty=unit_qty,
+            total_price=total_price,
+            lead_time_days=lead_time_days,
         )
 
-    return result
+
+def normalize_xfusion_rows(raw_rows: Iterable[dict]) -> List[XFusionNormalizedRow]:
+    """List form of iter_normalize_xfusion_rows() (adapter.normalize / batch callers)."""
+    return list(iter_normalize_xfusion_rows(raw_rows))
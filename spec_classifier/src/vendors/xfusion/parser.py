@@ -20,9 +20,11 @@ No stop sentinel — read until end of sheet, skipping fully-empty separator
 rows (col2 AND col3 both empty).
 """
 
-import openpyxl
 from pathlib import Path
-from typing import List, Tuple
+from typing import Iterator, Tuple
+
+from src.core.row_table import RowTable
+from src.core.workbook import is_open, open_workbook
 
 
 _SHEET_NAME = "AllInOne"
@@ -54,33 +56,37 @@ def _is_sku_shape(value) -> bool:
     return all(c.isalnum() or c in "-_" for c in s)
 
 
-def parse_excel(filepath: str) -> Tuple[List[dict], int]:
+def iter_excel_rows(filepath: str) -> Iterator[dict]:
     """
-    Parse xFusion eDeal AllInOne sheet → (rows, header_row_index=8).
+    Parse xFusion eDeal AllInOne sheet, one row dict at a time (single pass).
+
+    Standalone, rows are streamed and only the current one is held. Inside an
+    enclosing open_workbook(filepath) block (main.py) the sheet is decoded
+    through the session cache instead, so the annotated export that reads it
+    next does not decode it a second time.
 
     Each row dict carries fixed-index columns plus __row_index__ (1-based).
     Fully-empty separator rows (col2 AND col3 both empty) are skipped — they
-    do NOT survive into the result list (normalizer therefore never has to
+    do NOT survive into the result (normalizer therefore never has to
     decide whether to reset rollup on them).
+    FileNotFoundError / ValueError are raised on the first next().
     """
     path = Path(filepath)
     if not path.exists():
         raise FileNotFoundError(f"Excel file not found: {filepath}")
 
-    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
-    try:
-        if _SHEET_NAME not in wb.sheetnames:
+    shared = is_open(path)
+    with open_workbook(path) as session:
+        if _SHEET_NAME not in session.sheet_names:
             raise ValueError(
                 f"Sheet '{_SHEET_NAME}' not found in {filepath}. "
-                f"Available sheets: {wb.sheetnames}"
+                f"Available sheets: {session.sheet_names}"
             )
-        ws = wb[_SHEET_NAME]
-        all_rows = list(ws.iter_rows(values_only=True))
 
-        rows: List[dict] = []
-
-        for i in range(_DATA_START_ROW, len(all_rows)):
-            raw = all_rows[i]
+        rows = session.iter_rows(_SHEET_NAME) if shared else session.stream_rows(_SHEET_NAME)
+        for i, raw in enumerate(rows):
+            if i < _DATA_START_ROW:
+                continue
             excel_row_1based = i + 1
 
             col2 = raw[2]  if len(raw) >  2 else None
@@ -113,8 +119,12 @@ def parse_excel(filepath: str) -> Tuple[List[dict], int]:
                 "production_lt_days":  col10 if col10 is not None else "",
                 "__row_index__":       excel_row_1based,
             }
-            rows.append(row_dict)
+            yield row_dict
 
-        return (rows, _HEADER_ROW)
-    finally:
-        wb.close()
+
+def parse_excel(filepath: str) -> Tuple[RowTable, int]:
+    """
+    Parse xFusion eDeal AllInOne sheet → (RowTable(dict) of iter_excel_rows(filepath),
+    header_row_index=8); no list of dicts is built.
+    """
+    return (RowTable(dict, iter_excel_rows(filepath)), _HEADER_ROW)
@@ -1,20 +1,33 @@
 """
-Shared test helpers for pipeline execution. Imported by test_regression.py and test_unknown_threshold.py.
+Shared test helpers for pipeline execution. Imported by test_regression.py and test_unknown_threshold.py;
+save_hpe_xlsx builds small HPE inputs for the batch CLI tests (test_cli.py, test_batch_manifest.py).
 """
 
 from pathlib import Path
 from typing import Optional, Union
 
+import openpyxl
 import pandas as pd
 
 from src.rules.rules_engine import RuleSet
-from src.core.classifier import classify_row
+from src.core.classifier import classify_rows
 
 
 # Required column labels to identify the data table header in annotated Excel (may have preamble).
 ANNOTATED_HEADER_REQUIRED = ("Option ID", "Entity Type")
 
 
+def save_hpe_xlsx(path: Union[Path, str], description: str = "Intel Xeon CPU") -> None:
+    """Write a minimal HPE BOM workbook (sheet "BOM": header, a CPU row with description, a memory row)."""
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "BOM"
+    ws.append(["Product #", "Product Description", "Qty", "Unit Price (USD)", "Config Name"])
+    ws.append(["P123 ABC", description, 2, 1500.0, "Server A"])
+    ws.append(["X999", "16GB DDR5", 4, 120.0, "Server A"])
+    wb.save(path)
+
+
 def find_annotated_header_row(
     filepath: Union[Path, str], max_rows: int = 60
 ) -> Optional[int]:
@@ -65,7 +78,7 @@ def run_pipeline_in_memory(
     raw_rows, _ = adapter.parse(str(input_path))
     normalized = adapter.normalize(raw_rows)
     ruleset = RuleSet.load(str(rules_path))
-    results = [classify_row(r, ruleset) for r in normalized]
+    results = classify_rows(normalized, ruleset)
     return (normalized, results)
 
 
@@ -0,0 +1,107 @@
+"""
+Tests for the batch manifest (src/diagnostics/batch_manifest.py) and main.py --incremental.
+"""
+
+import json
+import subprocess
+import sys
+
+from conftest import project_root
+from tests.helpers import save_hpe_xlsx
+from src.diagnostics.batch_manifest import (
+    MANIFEST_FILENAME, BatchManifest, config_hash, file_sha256, spec_artifacts,
+)
+
+
+def _fingerprint(**changes):
+    fingerprint = {"input_sha256": "a" * 64, "vendor": "hpe", "rules_file_hash": "r" * 64, "config_hash": "c" * 64,
+                   "code_version": "v" * 64, "profile_rules": False}
+    fingerprint.update(changes)
+    return fingerprint
+
+
+def test_is_current_needs_same_fingerprint_and_artifacts(tmp_path):
+    split = tmp_path / "SPLIT" / "hpe" / "hp1"
+    split.mkdir(parents=True)
+    (split / "run_summary.json").write_text("{}", encoding="utf-8")
+    artifacts = spec_artifacts(tmp_path, "hpe", "hp1")
+    assert artifacts == ["SPLIT/hpe/hp1/run_summary.json"]
+
+    manifest = BatchManifest(tmp_path)
+    manifest.record(tmp_path / "in" / "hp1.xlsx", _fingerprint(), artifacts)
+    manifest.save()
+    loaded = BatchManifest.load(tmp_path)
+    assert loaded.is_current(tmp_path / "in" / "hp1.xlsx", _fingerprint())
+    assert not loaded.is_current(tmp_path / "in" / "hp1.xlsx", _fingerprint(rules_file_hash="s" * 64))
+    assert not loaded.is_current(tmp_path / "in" / "hp2.xlsx", _fingerprint())
+    (split / "run_summary.json").unlink()
+    assert not loaded.is_current(tmp_path / "in" / "hp1.xlsx", _fingerprint())
+
+    loaded.forget(tmp_path / "in" / "hp1.xlsx")
+    assert loaded.get(tmp_path / "in" / "hp1.xlsx") is None
+
+
+def test_unreadable_manifest_is_empty(tmp_path):
+    (tmp_path / MANIFEST_FILENAME).write_text("{not json", encoding="utf-8")
+    assert BatchManifest.load(tmp_path).entries == {}
+    (tmp_path / MANIFEST_FILENAME).write_text(json.dumps({"version": 0, "inputs": {"x": {}}}), encoding="utf-8")
+    assert BatchManifest.load(tmp_path).entries == {}
+    assert config_hash({"a": 1, "b": [2]}) == config_hash({"b": [2], "a": 1}) != config_hash({"a": 2, "b": [2]})
+
+
+def test_cli_incremental_skips_unchanged_inputs(tmp_path):
+    root = project_root()
+    batch_dir = tmp_path / "in"
+    batch_dir.mkdir()
+    for i in range(3):
+        save_hpe_xlsx(batch_dir / f"hp_{i}.xlsx", f"Intel Xeon CPU {i}")
+    output_dir = tmp_path / "out"
+
+    def run(vendor="hpe", incremental=True):
+        result = subprocess.run(
+            [
+                sys.executable, "main.py",
+                "--batch-dir", str(batch_dir),
+                "--vendor", vendor,
+                "--config", str(root / "config.yaml"),
+                "--output-dir", str(output_dir),
+                "--no-cache",
+            ] + (["--incremental"] if incremental else []),
+            cwd=str(root),
+            capture_output=True,
+            text=True,
+            timeout=120,
+        )
+        assert result.returncode == 0, f"CLI failed: stderr={result.stderr!r}"
+        return result.stdout
+
+    metrics_path = output_dir / "batch_metrics.json"
+    # Without --incremental the manifest is neither read nor written.
+    assert "3 processed, 0 skipped, 0 failed" in run(incremental=False)
+    assert not (output_dir / MANIFEST_FILENAME).exists()
+    assert "3 processed, 0 skipped, 0 failed, 0 unchanged" in run()
+    first = json.loads(metrics_path.read_text(encoding="utf-8"))
+    assert "0 processed, 0 skipped, 0 failed, 3 unchanged" in run()
+    # Unchanged files are counted, but their (earlier run's) timings are not aggregated.
+    metrics = json.loads(metrics_path.read_text(encoding="utf-8"))
+    assert (first["processed"], first["unchanged"], first["files"]) == (3, 0, 3)
+    assert (metrics["processed"], metrics["unchanged"], metrics["files"]) == (0, 3, 0)
+    assert metrics["stages"] == {} and metrics["by_vendor"] == {}
+    # Nothing processed or unchanged (every input skipped): batch_metrics.json is left as is.
+    before = metrics_path.read_bytes()
+    assert "0 processed, 3 skipped, 0 failed, 0 unchanged" in run("dell")
+    assert metrics_path.read_bytes() == before
+
+    save_hpe_xlsx(batch_dir / "hp_0.xlsx", "Intel Xeon CPU changed")
+    (output_dir / "SPLIT" / "hpe" / "hp_2" / "cleaned_spec.xlsx").unlink()
+    stdout = run()
+    assert "2 processed, 0 skipped, 0 failed, 1 unchanged" in stdout
+    metrics = json.loads(metrics_path.read_text(encoding="utf-8"))
+    assert (metrics["processed"], metrics["unchanged"], metrics["files"]) == (2, 1, 2)
+    assert metrics["by_vendor"]["hpe"]["files"] == 2
+    assert (output_dir / "SPLIT" / "hpe" / "hp_2" / "cleaned_spec.xlsx").exists()
+    manifest = json.loads((output_dir / MANIFEST_FILENAME).read_text(encoding="utf-8"))
+    assert sorted(entry["fingerprint"]["vendor"] for entry in manifest["inputs"].values()) == ["hpe"] * 3
+    assert manifest["inputs"][str((batch_dir / "hp_0.xlsx").resolve())]["fingerprint"]["input_sha256"] == (
+        file_sha256(batch_dir / "hp_0.xlsx")
+    )
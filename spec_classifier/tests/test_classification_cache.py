@@ -0,0 +1,101 @@
+"""
+Tests for ClassificationCache (on-disk classification cache behind ClassificationMemo).
+"""
+
+import pytest
+
+from conftest import project_root
+from src.core.classification_cache import CACHE_FILENAME, ClassificationCache
+from src.core.classifier import ClassificationMemo, classify_row
+from src.core.normalizer import NormalizedRow, RowKind
+from src.rules.rules_engine import RuleSet
+
+
+def _row(module_name, option_name, source_row_index=1):
+    return NormalizedRow(
+        source_row_index=source_row_index,
+        row_kind=RowKind.ITEM,
+        group_name=None,
+        group_id=None,
+        product_name=None,
+        module_name=module_name,
+        option_name=option_name,
+        option_id=None,
+        skus=[],
+        qty=1,
+        option_price=0.0,
+    )
+
+
+ROWS = [
+    _row("Base", "PowerEdge R760 Server"),
+    _row("Rack Rails", "ReadyRails Sliding Rails With Cable Management Arm"),
+    _row("Hard Drives", "No Hard Drive"),
+    _row("Something", "Totally unmatched text"),
+]
+
+
+@pytest.fixture
+def ruleset():
+    return RuleSet.load(str(project_root() / "rules" / "dell_rules.yaml"))
+
+
+def test_cache_persists_results_between_processes(tmp_path, ruleset):
+    cache = ClassificationCache.open(tmp_path)
+    memo = ClassificationMemo(store=cache)
+    expected = [memo.classify(r, ruleset) for r in ROWS]
+    cache.close()
+    assert (tmp_path / CACHE_FILENAME).exists()
+
+    cache = ClassificationCache.open(tmp_path)
+    memo = ClassificationMemo(store=cache)
+    assert [memo.classify(r, ruleset) for r in ROWS] == expected
+    assert expected == [classify_row(r, ruleset) for r in ROWS]
+    assert cache.stats()["hits"] == len(ROWS)
+    assert cache.stats()["misses"] == 0
+
+
+def test_cache_invalidated_when_rules_file_changes(tmp_path, ruleset):
+    cache = ClassificationCache.open(tmp_path)
+    cache.bind_rules("rules/dell_rules.yaml", "old-hash")
+    cache.put("old-hash", (RowKind.ITEM, "Base", "x"), classify_row(ROWS[0], ruleset))
+    cache.flush()
+    assert cache.get("old-hash", (RowKind.ITEM, "Base", "x")) is not None
+
+    cache.bind_rules("rules/dell_rules.yaml", "new-hash")
+    assert cache.get("old-hash", (RowKind.ITEM, "Base", "x")) is None
+    assert cache.get("new-hash", (RowKind.ITEM, "Base", "x")) is None
+
+
+def test_cache_evicts_least_recently_used(tmp_path, ruleset):
+    cache = ClassificationCache.open(tmp_path, max_entries=2)
+    result = classify_row(ROWS[0], ruleset)
+    cache.put("h", ("a",), result)
+    cache.flush()
+    cache.put("h", ("b",), result)
+    cache.flush()
+    assert cache.get("h", ("a",)) is not None  # a is now more recent than b
+    cache.put("h", ("c",), result)
+    cache.flush()
+    assert cache.get("h", ("b",)) is None
+    assert cache.get("h", ("a",)) is not None
+    assert cache.get("h", ("c",)) is not None
+
+
+def test_cache_rejects_non_positive_size(tmp_path):
+    with pytest.raises(ValueError):
+        ClassificationCache(tmp_path / CACHE_FILENAME, max_entries=0)
+
+
+def test_cache_drops_results_of_other_classifier_code(tmp_path, ruleset, monkeypatch):
+    from src.core import classification_cache
+
+    cache = ClassificationCache.open(tmp_path)
+    cache.put("h", ("a",), classify_row(ROWS[0], ruleset))
+    cache.close()
+
+    monkeypatch.setattr(classification_cache, "_classifier_code_version", "other-code")
+    cache = ClassificationCache.open(tmp_path)
+    assert cache.get("h", ("a",)) is None
+    assert cache._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0] == 0
+    cache.close()
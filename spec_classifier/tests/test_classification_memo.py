@@ -0,0 +1,106 @@
+"""
+Tests for ClassificationMemo (LRU memo in front of classify_row).
+"""
+
+import dataclasses
+
+import pytest
+
+from conftest import project_root
+from src.core.classifier import ClassificationMemo, classify_row, classify_rows
+from src.core.normalizer import NormalizedRow, RowKind
+from src.rules.rules_engine import RuleSet
+
+
+def _row(module_name="", option_name="", skus=None, row_kind=RowKind.ITEM, source_row_index=1):
+    return NormalizedRow(
+        source_row_index=source_row_index,
+        row_kind=row_kind,
+        group_name=None,
+        group_id=None,
+        product_name=None,
+        module_name=module_name,
+        option_name=option_name,
+        option_id=None,
+        skus=skus or [],
+        qty=1,
+        option_price=0.0,
+    )
+
+
+@pytest.fixture
+def ruleset():
+    return RuleSet.load(str(project_root() / "rules" / "dell_rules.yaml"))
+
+
+def test_memo_results_equal_classify_row(ruleset):
+    rows = [
+        _row("Base", "PowerEdge R760 Server", ["210-BDZY"]),
+        _row("Rack Rails", "ReadyRails Sliding Rails With Cable Management Arm"),
+        _row("Hard Drives", "No Hard Drive"),
+        _row("Something", "Totally unmatched text"),
+        _row(row_kind=RowKind.HEADER),
+    ]
+    memo = ClassificationMemo()
+    for _ in range(2):
+        for row in rows:
+            assert memo.classify(row, ruleset) == classify_row(row, ruleset)
+    stats = memo.stats()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (5, 5, 5)
+    assert stats["hit_rate"] == 0.5
+
+
+def test_memo_hit_shares_immutable_result(ruleset):
+    memo = ClassificationMemo()
+    row = _row("Something", "Totally unmatched text")
+    first = memo.classify(row, ruleset)
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        first.warnings = ("mutated by caller",)
+    second = memo.classify(row, ruleset)
+    assert second is first
+    assert second.warnings == ("No matching rule found",)
+
+
+def test_memo_keyed_on_ruleset_fingerprint(ruleset):
+    memo = ClassificationMemo()
+    row = _row("Rack Rails", "ReadyRails Sliding Rails")
+    other = RuleSet({"version": ruleset.version, "hw_rules": [
+        {"field": "module_name", "pattern": "(?i)rails", "rule_id": "HW-TEST"},
+    ]})
+    assert memo.classify(row, ruleset).matched_rule_id != "HW-TEST"
+    assert memo.classify(row, other).matched_rule_id == "HW-TEST"
+    assert memo.stats()["misses"] == 2
+
+
+def test_memo_is_bounded_lru(ruleset):
+    memo = ClassificationMemo(maxsize=2)
+    a, b, c = _row("A", "a"), _row("B", "b"), _row("C", "c")
+    memo.classify(a, ruleset)
+    memo.classify(b, ruleset)
+    memo.classify(a, ruleset)  # a is now most recently used
+    memo.classify(c, ruleset)  # evicts b
+    assert memo.stats()["size"] == 2
+    before = memo.stats()
+    memo.classify(a, ruleset)
+    memo.classify(b, ruleset)
+    assert memo.stats(since=before)["hits"] == 1
+    assert memo.stats(since=before)["misses"] == 1
+
+
+def test_memo_rejects_non_positive_size():
+    with pytest.raises(ValueError):
+        ClassificationMemo(maxsize=0)
+
+
+def test_memo_classify_rows_matches_row_by_row(ruleset):
+    rows = [
+        _row("Base", "PowerEdge R760 Server", ["210-BDZY"]),
+        _row("Rack Rails", "ReadyRails Sliding Rails"),
+        _row("Rack Rails", "ReadyRails Sliding Rails"),
+        _row(row_kind=RowKind.HEADER),
+    ]
+    memo = ClassificationMemo()
+    assert memo.classify_rows(rows, ruleset) == classify_rows(rows, ruleset)
+    assert (memo.stats()["hits"], memo.stats()["misses"]) == (1, 3)
+    assert memo.classify_rows(rows, ruleset) == [classify_row(r, ruleset) for r in rows]
+    assert memo.stats()["hits"] == 5
@@ -0,0 +1,96 @@
+"""
+Tests for the immutable ClassificationResult and the columnar ClassificationTable.
+"""
+
+import dataclasses
+import json
+
+import pytest
+
+from conftest import project_root
+from src.core.classifier import ClassificationResult, ClassificationTable, EntityType, classify_rows
+from src.core.normalizer import NormalizedRow, RowKind
+from src.core.state_detector import State
+from src.diagnostics.stats_collector import collect_stats
+from src.outputs.json_writer import save_classification
+from src.rules.rules_engine import RuleSet
+
+
+def _row(module_name="", option_name="", row_kind=RowKind.ITEM, source_row_index=1):
+    return NormalizedRow(
+        source_row_index=source_row_index,
+        row_kind=row_kind,
+        group_name=None,
+        group_id=None,
+        product_name=None,
+        module_name=module_name,
+        option_name=option_name,
+        option_id=None,
+        skus=[],
+        qty=1,
+        option_price=0.0,
+    )
+
+
+RESULTS = [
+    ClassificationResult(RowKind.HEADER, None, None, "HEADER-SKIP"),
+    ClassificationResult(RowKind.ITEM, EntityType.BASE, State.PRESENT, "BASE-001", "server", "server"),
+    ClassificationResult(RowKind.ITEM, EntityType.HW, State.ABSENT, "HW-002", "drive", None,
+                         ("hw_type unresolved for HW row",)),
+    ClassificationResult(RowKind.ITEM, EntityType.HW, State.PRESENT, "HW-002", "drive", "storage_drive"),
+    ClassificationResult(RowKind.ITEM, EntityType.UNKNOWN, State.PRESENT, "UNKNOWN-000",
+                         warnings=("No matching rule found",)),
+]
+
+
+def test_result_is_frozen_with_shared_empty_warnings():
+    result = RESULTS[1]
+    assert not hasattr(result, "__dict__")
+    assert result.warnings == () and type(result.warnings) is tuple
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        result.hw_type = "cpu"
+
+
+def test_table_round_trips_results():
+    table = ClassificationTable(RESULTS)
+    assert len(table) == len(RESULTS)
+    assert list(table) == RESULTS
+    assert [table[i] for i in range(len(table))] == RESULTS
+    assert table[-1] == RESULTS[-1]
+    assert list(table[1:3]) == RESULTS[1:3]
+
+
+def test_table_interns_repeated_values():
+    table = ClassificationTable(RESULTS * 100)
+    assert table.codes("row_kind").itemsize == 1
+    assert table.value_counts("matched_rule_id")["HW-002"] == 200
+    assert table.value_counts("hw_type", item_only=True)[None] == 200
+    assert table.code("hw_type", "storage_drive") is not None
+    assert table.code("hw_type", "cpu") is None
+    with pytest.raises(ValueError):
+        table.codes("qty")
+
+
+def test_collect_stats_same_for_table_and_list():
+    assert collect_stats(ClassificationTable(RESULTS)) == collect_stats(RESULTS)
+    stats = collect_stats(RESULTS)
+    assert stats["header_rows_count"] == 1
+    assert stats["entity_type_counts"] == {"BASE": 1, "HW": 2, "UNKNOWN": 1}
+    assert stats["hw_type_null_count"] == 1
+    assert stats["hw_type_counts"] == {"server": 1, "storage_drive": 1}
+
+
+def test_classify_rows_shares_results_of_equal_rows():
+    ruleset = RuleSet.load(str(project_root() / "rules" / "dell_rules.yaml"))
+    rows = [_row("Rack Rails", "ReadyRails Sliding Rails", source_row_index=i) for i in range(3)]
+    results = classify_rows(rows, ruleset)
+    assert results[0] is results[1] is results[2]
+
+
+def test_save_classification_accepts_table(tmp_path):
+    rows = [_row(source_row_index=i + 1) for i in range(len(RESULTS))]
+    save_classification(ClassificationTable(RESULTS), rows, tmp_path)
+    lines = [json.loads(line) for line in (tmp_path / "classification.jsonl").read_text(encoding="utf-8").splitlines()]
+    assert [d["matched_rule_id"] for d in lines] == [r.matched_rule_id for r in RESULTS]
+    assert lines[2]["warnings"] == ["hw_type unresolved for HW row"]
+    assert lines[1]["warnings"] == []
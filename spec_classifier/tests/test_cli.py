@@ -3,6 +3,7 @@ CLI smoke test: run main.py via subprocess and assert exit code, stdout, and art
 Uses tmp_path for output so the repo stays code-only.
 """
 
+import json
 import subprocess
 import sys
 from pathlib import Path
@@ -10,6 +11,7 @@ from pathlib import Path
 import pytest
 
 from conftest import project_root, get_input_root_dell
+from tests.helpers import save_hpe_xlsx
 
 
 def test_cli_exit_code_stdout_artifacts(tmp_path):
@@ -42,3 +44,55 @@ def test_cli_exit_code_stdout_artifacts(tmp_path):
     assert split_folder.is_dir(), f"SPLIT/dell/dl1 folder must exist under {output_dir}"
     assert (split_folder / "cleaned_spec.xlsx").exists(), f"cleaned_spec.xlsx missing in {split_folder}"
     assert (split_folder / "run_summary.json").exists(), f"run_summary.json missing in {split_folder}"
+
+
+def test_cli_batch_jobs_matches_sequential(tmp_path):
+    """--jobs 2: same artifacts, stdout in file order, counts and run.log per file as with one process."""
+    root = project_root()
+    batch_dir = tmp_path / "in"
+    batch_dir.mkdir()
+    for i in range(3):
+        save_hpe_xlsx(batch_dir / f"hp_{i}.xlsx", f"Intel Xeon CPU {i}")
+    (batch_dir / "broken.xlsx").write_bytes(b"not a workbook")
+
+    runs = {}
+    for jobs in ("1", "2"):
+        output_dir = tmp_path / f"out{jobs}"
+        result = subprocess.run(
+            [
+                sys.executable, "main.py",
+                "--batch-dir", str(batch_dir),
+                "--vendor", "hpe",
+                "--config", str(root / "config.yaml"),
+                "--output-dir", str(output_dir),
+                "--no-cache",
+                "--jobs", jobs,
+            ],
+            cwd=str(root),
+            capture_output=True,
+            text=True,
+            timeout=120,
+        )
+        assert result.returncode == 1, f"broken.xlsx must fail the batch: stderr={result.stderr!r}"
+        assert "3 processed, 0 skipped, 1 failed" in result.stdout
+        runs[jobs] = (result.stdout.replace(str(output_dir), "<out>"), output_dir, result.stderr)
+
+    assert runs["1"][0] == runs["2"][0]
+    # Worker console logs are captured per file and printed in file order.
+    processing = {
+        jobs: [line.split("processing ")[1] for line in stderr.splitlines() if "--- Batch: processing" in line]
+        for jobs, (_, _, stderr) in runs.items()
+    }
+    assert processing["2"] == processing["1"] == [f"hp_{i}.xlsx ---" for i in range(3)]
+    for i in range(3):
+        split = [out / "SPLIT" / "hpe" / f"hp_{i}" for _, out, _ in runs.values()]
+        for name in ("rows_normalized.json", "classification.jsonl"):
+            assert (split[0] / name).read_bytes() == (split[1] / name).read_bytes()
+        summary = json.loads((split[1] / "run_summary.json").read_text(encoding="utf-8"))
+        assert {"can_parse", "parse", "classify", "cleaned_spec"} <= set(summary["timings"]["stages"])
+        run_log = (split[1] / "run.log").read_text(encoding="utf-8")
+        assert f"hp_{i}.xlsx" in run_log
+        assert not any(f"hp_{j}.xlsx" in run_log for j in range(3) if j != i)
+    metrics = json.loads((runs["2"][1] / "batch_metrics.json").read_text(encoding="utf-8"))
+    assert metrics["jobs"] == 2 and metrics["files"] == 3 and metrics["by_vendor"]["hpe"]["files"] == 3
+    assert set(metrics["stages"]["classify"]["wall_s"]) == {"total", "p50", "p95", "max"}
@@ -1,6 +1,7 @@
 """Tests for Lenovo DCSC parser (no external input files)."""
 
 import sys
+import threading
 from pathlib import Path
 
 import openpyxl
@@ -294,3 +295,48 @@ def test_get_source_sheet_name_resets_on_parse_error(tmp_path):
     with pytest.raises(ValueError, match="No Lenovo DCSC header"):
         adapter.parse(str(p_bad))
     assert adapter.get_source_sheet_name() is None
+
+
+def test_get_source_sheet_name_per_thread(tmp_path):
+    """An adapter shared by concurrent runs reports each thread's own parsed sheet."""
+    p_quote = tmp_path / "quote.xlsx"
+    _make_lenovo_xlsx(p_quote, [["BYW4", None, "CPU", None, 1, 10.0, None, None]], include_terms=False)
+    p_bom = tmp_path / "bom.xlsx"
+    _make_lenovo_xlsx(p_bom, [["BYW4", None, "CPU", None, 1, 10.0, None, None]],
+                      include_terms=False, sheet_title="BOM")
+    adapter = LenovoAdapter()
+    adapter.parse(str(p_quote))
+    seen = []
+    worker = threading.Thread(target=lambda: (adapter.parse(str(p_bom)), seen.append(adapter.get_source_sheet_name())))
+    worker.start()
+    worker.join()
+    assert seen == ["BOM"]
+    assert adapter.get_source_sheet_name() == "Quote"
+
+
+def test_probe_shared_by_can_parse_and_parse(tmp_path, monkeypatch):
+    """Inside one workbook session the sheet probe runs once; earlier sheets decode only 30 rows."""
+    from src.core.workbook import open_workbook
+    from src.vendors.lenovo import parser as lenovo_parser
+
+    p = tmp_path / "late.xlsx"
+    _make_lenovo_xlsx(p, [["BYW4", None, "CPU", None, 1, 10.0, None, None]],
+                      include_terms=False, sheet_title="BOM")
+    wb = openpyxl.load_workbook(p)
+    filler = wb.create_sheet("Notes", 0)
+    for i in range(200):
+        filler.append([f"note {i}"])
+    wb.save(p)
+
+    scans = []
+    real_find = lenovo_parser.find_lenovo_header_in_rows
+    monkeypatch.setattr(lenovo_parser, "find_lenovo_header_in_rows",
+                        lambda rows: scans.append(len(rows)) or real_find(rows))
+    adapter = LenovoAdapter()
+    with open_workbook(p) as session:
+        assert adapter.can_parse(str(p))
+        rows, _ = adapter.parse(str(p))
+        assert len(session._sheet("Notes", data_only=False).rows) == 30
+    assert scans == [30, 9]
+    assert adapter.get_source_sheet_name() == "BOM"
+    assert [r["Part number"] for r in rows] == ["BYW4"]
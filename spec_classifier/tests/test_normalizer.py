@@ -3,13 +3,19 @@ Unit tests for row normalizer and row_kind detection.
 """
 
 import math
+
+import pandas as pd
 import pytest
 from src.core.normalizer import (
     RowKind,
     NormalizedRow,
     detect_row_kind,
+    normalize_dataframe,
     normalize_row,
+    normalize_table,
 )
+from src.core.row_table import RowTable
+from src.core.workbook import iter_records
 
 
 # --- detect_row_kind: HEADER cases (2-3 tests) ---
@@ -152,3 +158,44 @@ def test_normalize_row_empty_qty_defaults_to_one():
     }
     row = normalize_row(raw)
     assert row.qty == 1
+
+
+# --- column-wise normalization: same rows as normalize_row ---
+
+_MIXED_ROWS = [
+    {"__row_index__": 4, "Group ID": 1, "Module Name": "Base", "Option Name": " R760 ", "SKUs": "210-BDZY, ,338-CHSG",
+     "Qty": 2.0, "Option List Price": -0.0},
+    {"__row_index__": 5, "Group ID": 1.0, "Module Name": math.nan, "Option Name": "", "SKUs": None,
+     "Qty": "n/a", "Option List Price": "free"},
+    {"__row_index__": 6, "Group ID": "1", "Module Name": "  ", "Option Name": math.nan, "SKUs": "",
+     "Qty": math.nan, "Option List Price": 0},
+    {"__row_index__": 7, "Group ID": True, "Module Name": "Base", "Option Name": "R760", "SKUs": "210-BDZY",
+     "Qty": "", "Option List Price": "12.5"},
+]
+
+
+def test_normalize_table_matches_normalize_row():
+    """Distinct values are normalized once, yet 1 / 1.0 / "1" / True and -0.0 / 0 stay apart."""
+    table = normalize_table(RowTable(dict, _MIXED_ROWS * 3))
+    expected = [normalize_row(r) for r in _MIXED_ROWS * 3]
+    assert isinstance(table, RowTable) and table == expected
+    assert [r.group_id for r in table[:4]] == ["1", "1.0", "1", "True"]
+    assert [r.qty for r in table[:4]] == [2, 0, 1, 1]
+    assert math.copysign(1.0, table[0].option_price) == -1.0
+    assert table[2].row_kind == RowKind.HEADER and table[0].skus == ["210-BDZY", "338-CHSG"]
+
+
+def test_normalize_dataframe_matches_normalize_row():
+    """Missing columns read as None (defaults), like raw_row.get."""
+    df = pd.DataFrame({
+        "Module Name": ["Base", None, "Memory"],
+        "Option Name": ["R760", None, "64GB"],
+        "Qty": [1.0, None, 4.0],
+        "__row_index__": [2, 3, 4],
+    })
+    table = normalize_dataframe(df)
+    assert table == [normalize_row(r) for r in iter_records(df)]
+    assert [r.qty for r in table] == [1, 1, 4] and [r.option_price for r in table] == [0.0] * 3
+    assert normalize_dataframe(df.iloc[:0]) == []
+    with pytest.raises(KeyError):
+        normalize_dataframe(df.drop(columns="__row_index__"))
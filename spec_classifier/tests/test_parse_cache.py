@@ -0,0 +1,110 @@
+"""
+Tests for ParseCache (parsed and normalized rows reused across runs, src/core/parse_cache.py).
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import openpyxl
+import pytest
+
+from conftest import project_root
+from src.core import parse_cache
+from src.core.parse_cache import ParseCache, ParsedInput
+from src.core.workbook import WorkbookSession
+from src.vendors.dell.adapter import DellAdapter
+from src.vendors.hpe.adapter import HPEAdapter
+
+
+@pytest.fixture
+def hpe_xlsx(tmp_path):
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "BOM"
+    ws.append(["Product #", "Product Description", "Qty", "Unit Price (USD)", "Config Name"])
+    ws.append(["P123 ABC", "Intel Xeon CPU", 2, 1500.0, "Server A"])
+    ws.append(["X999", "16GB DDR5", 4, 120.0, "Server A"])
+    ws.append(["Total", None, None, None, None])
+    path = tmp_path / "in" / "hp_cache.xlsx"
+    path.parent.mkdir()
+    wb.save(path)
+    return path
+
+
+def _parsed(adapter, path):
+    raw_rows, header_row_index = adapter.parse(str(path))
+    return ParsedInput(raw_rows, header_row_index, adapter.get_source_sheet_name(), adapter.normalize(raw_rows))
+
+
+def test_roundtrip_and_key(hpe_xlsx, tmp_path):
+    cache = ParseCache(tmp_path / "parsed")
+    adapter = HPEAdapter()
+    sha = WorkbookSession(hpe_xlsx).sha256
+    assert cache.get(sha, adapter) is None
+    entry = _parsed(adapter, hpe_xlsx)
+    cache.put(sha, adapter, entry)
+    assert cache.get(sha, adapter) == entry
+    assert cache.get("0" * 64, adapter) is None
+    assert cache.get(sha, DellAdapter()) is None
+    assert cache.stats() == {"path": str(tmp_path / "parsed"), "hits": 1, "misses": 3}
+
+
+def test_parser_code_change_is_a_miss(hpe_xlsx, tmp_path, monkeypatch):
+    cache = ParseCache(tmp_path / "parsed")
+    adapter = HPEAdapter()
+    cache.put("a" * 64, adapter, _parsed(adapter, hpe_xlsx))
+    monkeypatch.setattr(parse_cache, "parser_code_version", lambda adapter: "other code")
+    assert cache.get("a" * 64, adapter) is None
+
+
+def test_eviction_by_total_size(hpe_xlsx, tmp_path):
+    adapter = HPEAdapter()
+    entry = _parsed(adapter, hpe_xlsx)
+    probe = ParseCache(tmp_path / "probe")
+    probe.put("p" * 64, adapter, entry)
+    size = next((tmp_path / "probe").iterdir()).stat().st_size
+
+    cache = ParseCache(tmp_path / "parsed", max_bytes=2 * size)
+    for i, sha in enumerate(("a" * 64, "b" * 64)):
+        cache.put(sha, adapter, entry)
+        path = cache._path(sha, adapter)
+        os.utime(path, ns=(i * 10**9, i * 10**9))
+    assert cache.get("a" * 64, adapter) is not None  # refreshes "a"
+    cache.put("c" * 64, adapter, entry)
+    assert cache.get("b" * 64, adapter) is None
+    assert cache.get("a" * 64, adapter) is not None
+    assert cache.get("c" * 64, adapter) is not None
+
+    with pytest.raises(ValueError):
+        ParseCache(tmp_path / "x", max_bytes=0)
+
+
+def test_cli_rerun_uses_parse_cache(hpe_xlsx, tmp_path):
+    root = project_root()
+    summaries = []
+    artifacts = []
+    for run in range(2):
+        output_dir = tmp_path / f"out{run}"
+        result = subprocess.run(
+            [
+                sys.executable, "main.py",
+                "--input", str(hpe_xlsx),
+                "--vendor", "hpe",
+                "--config", str(root / "config.yaml"),
+                "--output-dir", str(output_dir),
+                "--cache-dir", str(tmp_path / "cache"),
+            ],
+            cwd=str(root),
+            capture_output=True,
+            text=True,
+            timeout=60,
+        )
+        assert result.returncode == 0, f"CLI failed: stderr={result.stderr!r}"
+        split_folder = output_dir / "SPLIT" / "hpe" / "hp_cache"
+        with open(split_folder / "run_summary.json", encoding="utf-8") as f:
+            summaries.append(json.load(f))
+        artifacts.append([(split_folder / name).read_bytes() for name in ("rows_raw.json", "rows_normalized.json", "classification.jsonl")])
+    assert [s["parse_cache"]["hits"] for s in summaries] == [0, 1]
+    assert artifacts[0] == artifacts[1]
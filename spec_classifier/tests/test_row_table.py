@@ -0,0 +1,142 @@
+"""
+Tests for RowTable (columnar parser / normalizer output, src/core/row_table.py).
+"""
+
+import json
+import math
+import pickle
+
+import pytest
+
+from src.core.normalizer import NormalizedRow, RowKind
+from src.core.row_table import RowTable
+from src.outputs.json_writer import save_rows_raw
+from src.vendors.cisco.normalizer import CiscoNormalizedRow
+from src.vendors.hpe.normalizer import HPENormalizedRow
+
+
+def _row(i, module_name="Processor", skus=None, qty=1, price=0.0):
+    return NormalizedRow(
+        source_row_index=i,
+        row_kind=RowKind.ITEM if module_name else RowKind.HEADER,
+        group_name="G1",
+        group_id=None,
+        product_name="PowerEdge R760",
+        module_name=module_name,
+        option_name=f"Option {i % 3}",
+        option_id=None,
+        skus=["338-CHSG"] if skus is None else skus,
+        qty=qty,
+        option_price=price,
+    )
+
+
+def test_views_equal_the_rows_they_were_built_from():
+    rows = [_row(1), _row(2, "", skus=[]), _row(3, qty=2, price=-0.0), _row(4, price=float("inf"))]
+    table = RowTable(NormalizedRow, iter(rows))
+    assert len(table) == 4
+    assert table == rows
+    assert [r == t for r, t in zip(rows, table)] == [True] * 4
+    assert table[-1] == rows[-1]
+    assert table[1:3] == rows[1:3]
+    assert isinstance(table[0], NormalizedRow)
+    assert math.copysign(1.0, table[2].option_price) == -1.0
+    assert table[0].skus == ["338-CHSG"] and table[0].skus is not table[0].skus
+    assert table.column("row_kind") == [RowKind.ITEM, RowKind.HEADER, RowKind.ITEM, RowKind.ITEM]
+    with pytest.raises(IndexError):
+        table[4]
+
+
+def test_repeated_strings_are_pooled_once():
+    table = RowTable(NormalizedRow, (_row(i) for i in range(1000)))
+    column = table._columns["product_name"]
+    assert column.kind == "i" and column.pool == ["PowerEdge R760"]
+    assert len(table._columns["option_name"].pool) == 3
+    assert table._columns["source_row_index"].kind == "q"
+    assert table[0].product_name is table[999].product_name
+
+
+def test_columns_keep_value_types():
+    # qty 1 and option_price 1.0 / True must not share a pool entry; mixed columns widen.
+    rows = [_row(1, qty=1, price=1.0), _row(2, qty=True, price=1), _row(3, qty=2 ** 70, price="n/a")]
+    table = RowTable(NormalizedRow, rows)
+    assert [type(v) for v in table.column("qty")] == [int, bool, int]
+    assert [type(v) for v in table.column("option_price")] == [float, int, str]
+    assert table.column("qty")[2] == 2 ** 70
+
+
+def test_vendor_row_type_and_duck_typed_fields():
+    hpe = RowTable(HPENormalizedRow, [HPENormalizedRow(
+        1, RowKind.ITEM, "Server A", None, None, "", "CPU", None, ["P1"], 1, 10.0, config_name="Server A",
+    )])
+    assert isinstance(hpe[0], HPENormalizedRow)
+    assert hpe[0].config_name == "Server A"
+    assert getattr(hpe[0], "is_bundle_root", None) is None
+
+    cisco = RowTable(CiscoNormalizedRow, [CiscoNormalizedRow(line_number="1.0", is_bundle_root=True)])
+    assert cisco[0].is_bundle_root is True
+    assert cisco[0] != hpe[0]
+
+
+def test_assignment_writes_into_the_column():
+    table = RowTable(NormalizedRow, [_row(1), _row(2)])
+    view = table[1]
+    view.qty = 2.5
+    view.module_name = "Memory"
+    assert table[1].qty == 2.5 and table[1].module_name == "Memory"
+    assert table[0].qty == 1 and table[0].module_name == "Processor"
+
+
+def test_pickle_roundtrip():
+    table = RowTable(NormalizedRow, [_row(1), _row(2, "", skus=[])])
+    assert pickle.loads(pickle.dumps(table)) == table
+    row = pickle.loads(pickle.dumps(table[0]))
+    assert type(row) is NormalizedRow and row == _row(1)
+
+
+def test_record_views_keep_keys_and_order():
+    nan = float("nan")
+    raw = [
+        {"Module Name": "Base", "Qty": 1.0, "__row_index__": 4},
+        {"Qty": nan, "Module Name": None, "SKUs": "210-AAAA", "__row_index__": 5},
+    ]
+    table = RowTable(dict, raw)
+    assert table[0] == raw[0]
+    assert {k: v for k, v in table[1].items() if k != "Qty"} == {k: v for k, v in raw[1].items() if k != "Qty"}
+    assert list(table[1]) == ["Qty", "Module Name", "SKUs", "__row_index__"]
+    assert "SKUs" not in table[0] and table[0].get("SKUs", "-") == "-"
+    with pytest.raises(KeyError):
+        table[0]["SKUs"]
+    assert math.isnan(table[1]["Qty"])
+    assert table.column("SKUs") == [None, "210-AAAA"]
+    assert pickle.loads(pickle.dumps(table))[0] == raw[0]
+
+    with pytest.raises(ValueError):
+        RowTable(list)
+
+
+def test_save_rows_raw_layout_unchanged(tmp_path):
+    raw = [{"a": 1, "b": float("nan"), "c": "é\nx"}, {"a": [1, {"d": None}]}]
+    save_rows_raw(RowTable(dict, raw), tmp_path)
+    expected = json.dumps([{"a": 1, "b": None, "c": "é\nx"}, {"a": [1, {"d": None}]}], indent=2, ensure_ascii=False)
+    assert (tmp_path / "rows_raw.json").read_text(encoding="utf-8") == expected
+    save_rows_raw([], tmp_path)
+    assert (tmp_path / "rows_raw.json").read_text(encoding="utf-8") == "[]"
+
+
+def test_from_columns_and_map_column():
+    rows = [_row(1), _row(2, "", skus=[]), _row(3)]
+    fields = RowTable(NormalizedRow).column_names
+    table = RowTable.from_columns(NormalizedRow, {f: [getattr(r, f) for r in rows] for f in fields})
+    assert table == rows
+    calls = []
+    upper = table.map_column("option_name", lambda v: calls.append(v) or v.upper())
+    assert upper == ["OPTION 1", "OPTION 2", "OPTION 0"]
+    assert sorted(calls) == ["Option 0", "Option 1", "Option 2"]
+    assert table.map_column("skus", len) == [1, 0, 1]
+    with pytest.raises(ValueError):
+        RowTable.from_columns(NormalizedRow, {f: [] for f in table.column_names} | {"qty": [1]})
+    with pytest.raises(ValueError):
+        RowTable.from_columns(dict, {})
+    with pytest.raises(ValueError):
+        table.map_column("nope", len)
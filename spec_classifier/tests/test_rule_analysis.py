@@ -0,0 +1,81 @@
+"""
+Tests for the dead/shadowed rule analyzer (src/rules/rule_analysis.py).
+"""
+
+import json
+
+from src.rules.rule_analysis import analyze_rules, load_corpus, load_golden, main
+
+RULES = {
+    "hw_rules": [
+        {"field": "option_name", "pattern": "(?i)rails?", "entity_type": "HW", "rule_id": "HW-RAIL"},
+        {"field": "option_name", "pattern": "(?i)sliding rails", "entity_type": "HW", "rule_id": "HW-SLIDING"},
+        {"field": "option_name", "pattern": "(?i)quantum", "entity_type": "HW", "rule_id": "HW-QUANTUM"},
+        {"field": "option_name", "pattern": "(?i)ssd", "entity_type": "HW", "rule_id": "HW-SSD"},
+    ],
+    "device_type_rules": {
+        "applies_to": ["HW"],
+        "rules": [
+            {"field": "option_name", "pattern": "(?i)sliding", "device_type": "rail", "rule_id": "DT-SLIDING"},
+            {"field": "option_name", "pattern": "(?i)rails?", "device_type": "rail", "rule_id": "DT-RAIL"},
+        ],
+    },
+}
+
+
+def _write_run(tmp_path, stem, rows):
+    folder = tmp_path / "SPLIT" / "dell" / stem
+    folder.mkdir(parents=True)
+    path = folder / "rows_normalized.json"
+    path.write_text(json.dumps([
+        {"source_row_index": i, "row_kind": "ITEM", "module_name": "", "option_name": text, "skus": []}
+        for i, text in enumerate(rows, start=1)
+    ]), encoding="utf-8")
+    return path
+
+
+def test_zero_hit_and_shadowed_rules(tmp_path):
+    path = _write_run(tmp_path, "s1", ["ReadyRails Sliding Rails", "Static Rails", "1.92TB SSD"])
+    report = analyze_rules(RULES, load_corpus([path]))
+    assert report["corpus_item_rows"] == 3
+    assert "hw_rules:HW-QUANTUM" in report["zero_hits"]
+    shadowed = {s["rule"]: s for s in report["shadowed"]}
+    assert shadowed["hw_rules:HW-SLIDING"]["preceded_by"] == {"hw_rules:HW-RAIL": 1}
+    assert set(report["prune"]) == {"hw_rules:HW-QUANTUM", "hw_rules:HW-SLIDING"}
+    assert report["fired"]["device_type_rules:DT-SLIDING"] == 1
+
+
+def test_golden_removable(tmp_path):
+    path = _write_run(tmp_path, "s1", ["ReadyRails Sliding Rails", "1.92TB SSD"])
+    golden_dir = tmp_path / "golden"
+    golden_dir.mkdir()
+    golden_rows = [
+        {"source_row_index": 1, "entity_type": "HW", "state": "PRESENT", "matched_rule_id": "HW-RAIL",
+         "device_type": "rail", "hw_type": None},
+        {"source_row_index": 2, "entity_type": "HW", "state": "PRESENT", "matched_rule_id": "HW-SSD",
+         "device_type": None, "hw_type": None},
+    ]
+    (golden_dir / "s1_expected.jsonl").write_text("\n".join(json.dumps(g) for g in golden_rows), encoding="utf-8")
+    corpus = load_corpus([path])
+    golden = load_golden(golden_dir, [r.stem for r in corpus])
+    report = analyze_rules(RULES, corpus, golden)
+    assert report["golden_rows"] == 2
+    # DT-SLIDING fires, but DT-RAIL would give the same device_type; HW-RAIL decides matched_rule_id.
+    assert "device_type_rules:DT-SLIDING" in report["golden_removable"]
+    assert "hw_rules:HW-RAIL" not in report["golden_removable"]
+    assert "hw_rules:HW-SSD" not in report["golden_removable"]
+
+
+def test_cli_writes_report(tmp_path, capsys):
+    _write_run(tmp_path, "s1", ["Static Rails"])
+    rules_path = tmp_path / "rules.yaml"
+    rules_path.write_text(json.dumps(RULES), encoding="utf-8")
+    report_path = tmp_path / "report.json"
+    code = main([
+        "--vendor", "dell", "--rules", str(rules_path), "--output-dir", str(tmp_path),
+        "--golden-dir", str(tmp_path / "none"), "--report", str(report_path),
+    ])
+    assert code == 0
+    report = json.loads(report_path.read_text(encoding="utf-8"))
+    assert report["vendor"] == "dell" and report["files"] == 1
+    assert "prune list" in capsys.readouterr().out
@@ -0,0 +1,73 @@
+"""
+Tests for RuleProfiler (--profile-rules): per-rule evaluations, hits, time.
+"""
+
+from conftest import project_root
+from src.core.classifier import classify_row
+from src.core.normalizer import NormalizedRow, RowKind
+from src.diagnostics.rule_profiler import PROFILE_FILENAME, RuleProfiler, merge_profiles, save_rule_profile
+from src.rules.rules_engine import RuleSet
+
+
+def _row(module_name, option_name):
+    return NormalizedRow(
+        source_row_index=1,
+        row_kind=RowKind.ITEM,
+        group_name=None,
+        group_id=None,
+        product_name=None,
+        module_name=module_name,
+        option_name=option_name,
+        option_id=None,
+        skus=[],
+        qty=1,
+        option_price=0.0,
+    )
+
+
+ROWS = [
+    _row("Base", "PowerEdge R760 Server"),
+    _row("Hard Drives", "No Hard Drive"),
+    _row("Rack Rails", "ReadyRails Sliding Rails With Cable Management Arm"),
+]
+
+
+def test_profiled_ruleset_classifies_identically():
+    rules_path = str(project_root() / "rules" / "dell_rules.yaml")
+    plain = RuleSet.load(rules_path)
+    profiled = RuleSet.load(rules_path, profiler=RuleProfiler())
+    assert [classify_row(r, profiled) for r in ROWS] == [classify_row(r, plain) for r in ROWS]
+
+
+def test_profile_counts_every_section():
+    profiler = RuleProfiler()
+    ruleset = RuleSet.load(str(project_root() / "rules" / "dell_rules.yaml"), profiler=profiler)
+    results = [classify_row(r, ruleset) for r in ROWS]
+    profile = profiler.to_dict(input_file="x.xlsx")
+
+    by_key = {(r["section"], r["rule_id"]): r for r in profile["rules"]}
+    for result in results:
+        hits = [r for (section, rule_id), r in by_key.items() if rule_id == result.matched_rule_id]
+        assert hits and hits[0]["hits"] >= 1
+    assert by_key[("state_rules.absent_keywords", "STATE-001")]["hits"] == 1
+    sections = {r["section"] for r in profile["rules"]}
+    assert {"base_rules", "hw_rules", "device_type_rules", "hw_type_rules"} <= sections
+    assert profile["input_file"] == "x.xlsx"
+    assert profile["total_evaluations"] == sum(r["evaluations"] for r in profile["rules"])
+    never_evaluated = [r for r in profile["rules"] if r["evaluations"] == 0]
+    assert never_evaluated, "rules that were never evaluated are still listed"
+
+
+def test_merge_profiles_sums_counters(tmp_path):
+    a = {"rules": [{"section": "hw_rules", "rule_id": "HW-1", "evaluations": 3, "hits": 1, "time_ms": 0.5}]}
+    b = {"rules": [
+        {"section": "hw_rules", "rule_id": "HW-1", "evaluations": 2, "hits": 0, "time_ms": 0.25},
+        {"section": "hw_rules", "rule_id": "HW-2", "evaluations": 4, "hits": 0, "time_ms": 1.0},
+    ]}
+    merged = merge_profiles([a, b], vendor="dell")
+    assert merged["files"] == 2 and merged["vendor"] == "dell"
+    assert merged["rules"][0]["rule_id"] == "HW-2"  # sorted by cumulative time
+    hw1 = next(r for r in merged["rules"] if r["rule_id"] == "HW-1")
+    assert (hw1["evaluations"], hw1["hits"], hw1["time_ms"]) == (5, 1, 0.75)
+    assert merged["never_hit"] == ["hw_rules:HW-2"]
+    assert save_rule_profile(merged, tmp_path) == tmp_path / PROFILE_FILENAME
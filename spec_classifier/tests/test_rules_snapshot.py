@@ -0,0 +1,89 @@
+"""
+Tests for compiled rules snapshots (RuleSet.load snapshot_dir).
+"""
+
+import hashlib
+
+import pytest
+
+from conftest import project_root
+from src.core.classifier import classify_rows
+from src.core.normalizer import NormalizedRow, RowKind
+from src.diagnostics.rule_profiler import RuleProfiler
+from src.rules import rules_engine
+from src.rules.rules_engine import SNAPSHOT_SUFFIX, RuleSet
+
+
+def _row(module_name, option_name):
+    return NormalizedRow(
+        source_row_index=1,
+        row_kind=RowKind.ITEM,
+        group_name=None,
+        group_id=None,
+        product_name=None,
+        module_name=module_name,
+        option_name=option_name,
+        option_id=None,
+        skus=[],
+        qty=1,
+        option_price=0.0,
+    )
+
+
+@pytest.fixture
+def rules_copy(tmp_path):
+    path = tmp_path / "hpe_rules.yaml"
+    path.write_bytes((project_root() / "rules" / "hpe_rules.yaml").read_bytes())
+    return path
+
+
+def _snapshot_path(snapshot_dir, rules_path):
+    return snapshot_dir / (hashlib.sha256(rules_path.read_bytes()).hexdigest() + SNAPSHOT_SUFFIX)
+
+
+def _no_yaml(*args, **kwargs):
+    raise AssertionError("YAML parsed although a snapshot exists")
+
+
+def test_snapshot_written_and_reused(rules_copy, tmp_path, monkeypatch):
+    snapshot_dir = tmp_path / "snapshots"
+    built = RuleSet.load(str(rules_copy), snapshot_dir=snapshot_dir)
+    assert _snapshot_path(snapshot_dir, rules_copy).exists()
+
+    monkeypatch.setattr(rules_engine.yaml, "load", _no_yaml)
+    loaded = RuleSet.load(str(rules_copy), snapshot_dir=snapshot_dir)
+    assert loaded.fingerprint == built.fingerprint
+    rows = [
+        _row("Base", "ProLiant DL380 Gen11 8SFF NC CTO Server"),
+        _row("Memory", "HPE 32GB Dual Rank x8 DDR5-4800 Registered Smart Memory Kit"),
+        _row("Something", "Totally unmatched text"),
+    ]
+    assert classify_rows(rows, loaded) == classify_rows(rows, built)
+
+
+def test_edited_yaml_gets_new_snapshot(rules_copy, tmp_path):
+    snapshot_dir = tmp_path / "snapshots"
+    RuleSet.load(str(rules_copy), snapshot_dir=snapshot_dir)
+    rules_copy.write_text(rules_copy.read_text(encoding="utf-8") + "\n# edited\n", encoding="utf-8")
+    RuleSet.load(str(rules_copy), snapshot_dir=snapshot_dir)
+    assert len(list(snapshot_dir.glob("*" + SNAPSHOT_SUFFIX))) == 2
+
+
+def test_unreadable_or_stale_snapshot_is_rebuilt(rules_copy, tmp_path, monkeypatch):
+    snapshot_dir = tmp_path / "snapshots"
+    snapshot = _snapshot_path(snapshot_dir, rules_copy)
+    snapshot_dir.mkdir()
+    snapshot.write_bytes(b"not a pickle")
+    assert RuleSet.load(str(rules_copy), snapshot_dir=snapshot_dir).version
+    assert snapshot.read_bytes() != b"not a pickle"
+
+    monkeypatch.setattr(rules_engine, "_snapshot_code_version", "other code")
+    before = snapshot.read_bytes()
+    RuleSet.load(str(rules_copy), snapshot_dir=snapshot_dir)
+    assert snapshot.read_bytes() != before
+
+
+def test_profiled_load_bypasses_snapshot(rules_copy, tmp_path):
+    snapshot_dir = tmp_path / "snapshots"
+    RuleSet.load(str(rules_copy), profiler=RuleProfiler(), snapshot_dir=snapshot_dir)
+    assert not snapshot_dir.exists()
@@ -21,3 +21,9 @@ def test_compute_file_hash_matches_manual():
 def test_compute_file_hash_file_not_found():
     with pytest.raises((FileNotFoundError, OSError)):
         compute_file_hash("/nonexistent/path.yaml")
+
+
+def test_ruleset_fingerprint_is_rules_file_hash():
+    from src.rules.rules_engine import RuleSet
+    rules_path = project_root() / "rules" / "dell_rules.yaml"
+    assert RuleSet.load(str(rules_path)).fingerprint == compute_file_hash(str(rules_path))
@@ -314,6 +314,32 @@ def test_match_rule_unknown_field_guaranteed_skip():
     assert result is None, "Unknown field with .* pattern must NOT match"
 
 
+def test_unknown_field_warned_once_per_rule_at_load(caplog):
+    """Unknown field is reported when the rules are compiled, not on every row matched."""
+    import logging
+    data = {"hw_rules": [{"field": "nonexistent_field", "pattern": ".*", "rule_id": "HW-X"}]}
+    with caplog.at_level(logging.WARNING, logger="src.rules.rules_engine"):
+        rs = RuleSet(data)
+        assert "HW-X" in caplog.text
+        caplog.clear()
+        for _ in range(3):
+            assert rs.hw_rules.first_match(_row(module_name="Test", option_name="Test")) is None
+    assert caplog.records == []
+
+
+def test_match_view_values_equal_get_field_value():
+    """RowMatchView computes every known field exactly as _get_field_value does."""
+    from src.rules.rules_engine import RowMatchView, _KNOWN_FIELDS, _get_field_value, match_view
+    row = _row(module_name="Memory", option_name="  16GB RDIMM  ", skus=["370-AGZP", "x"])
+    row.is_bundle_root = False
+    row.service_duration_months = 36
+    view = match_view(row)
+    assert isinstance(view, RowMatchView) and match_view(view) is view
+    for field in _KNOWN_FIELDS:
+        assert view.values[field] == _get_field_value(row, field)
+    assert view.state_text == "16GB RDIMM"
+
+
 def test_match_rule_is_bundle_root_lowercase():
     """is_bundle_root should be serialized as lowercase 'true'/'false'."""
     from src.rules.rules_engine import _get_field_value
@@ -328,6 +354,113 @@ def test_match_rule_is_bundle_root_lowercase():
     assert val == "true", f"Expected 'true', got '{val}'"
 
 
+def test_ruleset_compiles_patterns_at_load(ruleset):
+    """RuleSet rule lists carry compiled patterns and still behave like lists of dicts."""
+    assert len(ruleset.base_rules) > 0
+    assert ruleset.base_rules[0]["rule_id"] == "BASE-001"
+    assert all(hasattr(e.regex, "search") for e in ruleset.hw_rules.entries)
+    assert [r["rule_id"] for r in ruleset.hw_rules] == [r["rule_id"] for r in ruleset.hw_rules.rules]
+
+
+def test_first_match_resolves_lowest_index_across_fields():
+    """Per-field grouping must return the same rule as the top-to-bottom scan."""
+    from src.rules.rules_engine import match_rule
+    row = _row(module_name="Chassis", option_name="Rail Kit", skus=["RK-1"])
+    rules = [
+        {"field": "sku", "pattern": "^ZZ", "rule_id": "R-001"},
+        {"field": "option_name", "pattern": "Kit", "rule_id": "R-002"},
+        {"field": "module_name", "pattern": "Chassis", "rule_id": "R-003"},
+        {"field": "option_name", "pattern": "Rail", "rule_id": "R-004"},
+    ]
+    assert match_rule(row, rules)["rule_id"] == "R-002"
+    assert match_rule(row, rules[2:])["rule_id"] == "R-003"
+
+
+@pytest.mark.parametrize("pattern, expected", [
+    (r"(?i)\bProSupport\b", ("prosupport",)),
+    (r"(?i)\bRack\s+Rails?\b", ("rack",)),
+    (r"(?i)\b(SSD|SATA)\b(?!.*NVMe)", ("sata", "ssd")),
+    (r"(?i)(?=.*BOSS-N1)(?=.*controller\s+card).*", ("controller",)),
+    (r"(?i)^\s*No\s+", None),
+    (r"(?i)\b(?:DIMM|Memory)?\s*Blank", ("blank",)),
+])
+def test_required_literals(pattern, expected):
+    from src.rules.rules_engine import required_literals
+    assert required_literals(pattern) == expected
+
+
+def test_literal_prefilter_matches_full_scan():
+    """Prefiltered first_match returns the same rule as running every regex in order."""
+    import re
+    from src.rules.rules_engine import _get_field_value
+    rows = [
+        _row(module_name="Rack Rails", option_name="ReadyRails Sliding Rails With Cable Management Arm"),
+        _row(module_name="Hard Drives", option_name="1.92TB SSD SATA Read Intensive 6Gbps 512 2.5in"),
+        _row(module_name="Processor", option_name="Intel® Xeon® Gold 6526Y 2.8G, 16C/32T"),
+        _row(module_name="Base", option_name="PowerEdge R760 Server", skus=["210-BDZY"]),
+        _row(module_name="", option_name="Ｒａｉｌ kit ſerver"),
+    ]
+    for vendor in ("dell", "hpe", "lenovo", "cisco", "huawei", "xfusion"):
+        rs = RuleSet.load(str(Path(__file__).resolve().parent.parent / "rules" / f"{vendor}_rules.yaml"))
+        for bucket in (rs.base_rules, rs.service_rules, rs.hw_rules, rs.device_type_rules, rs.hw_type_rules):
+            for row in rows:
+                expected = None
+                for rule in bucket:
+                    value = _get_field_value(row, rule.get("field") or "")
+                    if rule.get("pattern") and value is not None and re.search(rule["pattern"], value, re.IGNORECASE):
+                        expected = rule
+                        break
+                assert bucket.first_match(row) is expected
+
+
+@pytest.mark.parametrize("vendor", ["dell", "hpe", "lenovo", "cisco", "huawei", "xfusion"])
+def test_classify_rows_equals_classify_row(vendor):
+    """Columnar classify_rows returns exactly what classify_row returns for each row."""
+    from src.core.classifier import classify_rows
+    rs = RuleSet.load(str(Path(__file__).resolve().parent.parent / "rules" / f"{vendor}_rules.yaml"))
+    rows = [
+        _row(module_name="Base", option_name="PowerEdge R760 Server", skus=["210-BDZY"]),
+        _row(module_name="Rack Rails", option_name="ReadyRails Sliding Rails With Cable Management Arm"),
+        _row(module_name="Hard Drives", option_name="1.92TB SSD SATA Read Intensive 6Gbps 512 2.5in"),
+        _row(module_name="Hard Drives", option_name="No Hard Drive"),
+        _row(module_name="Power Supply", option_name="Dual, Hot-Plug, Power Supply Redundant (1+1), 800W"),
+        _row(module_name="Services", option_name="ProSupport Next Business Day Onsite Service, 36 Month(s)"),
+        _row(module_name="Something", option_name="Totally unmatched text"),
+        _row(row_kind=RowKind.HEADER),
+    ]
+    rows = rows + rows[::-1]
+    expected = [classify_row(r, rs) for r in rows]
+    actual = classify_rows(rows, rs)
+    assert actual == expected
+
+
+def test_hw_type_mapped_to_null_has_no_vocab_warning():
+    """A map entry of hw_type null leaves hw_type None without a HW_TYPE_VOCAB warning."""
+    from src.core.classifier import classify_rows
+    rs = RuleSet({
+        "hw_rules": [{"field": "option_name", "pattern": "Blank", "entity_type": "HW", "rule_id": "HW-BLANK-001"}],
+        "hw_type_rules": {"applies_to": ["HW"], "rule_id_map": {"HW-BLANK-001": None}},
+    })
+    row = _row(option_name="Blank")
+    result = classify_row(row, rs)
+    assert result.matched_rule_id == "HW-BLANK-001"
+    assert result.hw_type is None and result.warnings == ()
+    assert classify_rows([row], rs) == [result]
+
+
+def test_malformed_pattern_fails_at_load_with_rule_id():
+    """A broken regex is reported when the RuleSet is built, naming the offending rule_id."""
+    data = {"hw_rules": [{"field": "option_name", "pattern": "(?i)Rail(", "entity_type": "HW", "rule_id": "HW-BROKEN-001"}]}
+    with pytest.raises(ValueError, match="HW-BROKEN-001"):
+        RuleSet(data)
+
+
+def test_malformed_state_pattern_fails_at_load_with_rule_id():
+    data = {"state_rules": {"absent_keywords": [{"pattern": "[No", "state": "ABSENT", "rule_id": "STATE-BROKEN-001"}]}}
+    with pytest.raises(ValueError, match="STATE-BROKEN-001"):
+        RuleSet(data)
+
+
 # ---------------------------------------------------------------------------
 # Dell device_type / hw_type matrix
 # ---------------------------------------------------------------------------
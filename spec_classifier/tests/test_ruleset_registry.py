@@ -0,0 +1,44 @@
+"""
+Tests for RuleSetRegistry (one RuleSet per rules file and process, reloaded on change).
+"""
+
+import os
+
+import pytest
+
+from conftest import project_root
+from src.diagnostics.stats_collector import compute_file_hash
+from src.rules.ruleset_registry import RuleSetRegistry
+
+
+@pytest.fixture
+def rules_copy(tmp_path):
+    path = tmp_path / "dell_rules.yaml"
+    path.write_bytes((project_root() / "rules" / "dell_rules.yaml").read_bytes())
+    return path
+
+
+def test_registry_reuses_ruleset_for_unchanged_file(rules_copy):
+    registry = RuleSetRegistry()
+    first = registry.get(rules_copy)
+    assert registry.get(str(rules_copy)) is first
+    assert (registry.loads, registry.reuses) == (1, 1)
+    assert first.fingerprint == compute_file_hash(str(rules_copy))
+
+
+def test_registry_reloads_changed_file(rules_copy):
+    registry = RuleSetRegistry()
+    first = registry.get(rules_copy)
+    rules_copy.write_text(rules_copy.read_text(encoding="utf-8").replace("version:", "# edited\nversion:", 1),
+                          encoding="utf-8")
+    st = os.stat(rules_copy)
+    os.utime(rules_copy, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    second = registry.get(rules_copy)
+    assert second is not first
+    assert second.fingerprint == compute_file_hash(str(rules_copy)) != first.fingerprint
+    assert registry.loads == 2
+
+
+def test_registry_missing_file(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        RuleSetRegistry().get(tmp_path / "missing.yaml")
@@ -0,0 +1,63 @@
+"""
+Tests for stage timings (src/diagnostics/stage_timer.py): run_summary "timings" and batch_metrics.json.
+"""
+
+import json
+import time
+
+import pytest
+
+from src.diagnostics.stage_timer import StageTimer, _percentile, aggregate_timings, save_batch_metrics
+
+
+def test_stages_record_wall_cpu_and_throughput():
+    timer = StageTimer()
+    with timer.stage("parse") as stage:
+        time.sleep(0.01)
+        stage["rows"] = 100
+    with timer.stage("classify", rows=100):
+        sum(range(10000))
+    with timer.stage("classify"):  # a repeated stage adds up
+        pass
+    with pytest.raises(RuntimeError):
+        with timer.stage("cleaned_spec", rows=100):
+            raise RuntimeError("writer failed")
+
+    timings = timer.to_dict()
+    assert list(timings["stages"]) == ["parse", "classify", "cleaned_spec"]
+    parse = timings["stages"]["parse"]
+    assert parse["wall_s"] >= 0.01 and parse["cpu_s"] < parse["wall_s"]
+    assert parse["rows"] == 100 and parse["rows_per_s"] == pytest.approx(100 / parse["wall_s"], rel=0.01)
+    assert timings["stages"]["classify"]["rows"] == 100
+    assert timings["total_wall_s"] >= parse["wall_s"]
+    assert "tracemalloc_peak_mb" not in timings
+
+
+def test_trace_memory_reports_tracemalloc_peak():
+    timer = StageTimer(trace_memory=True)
+    timer.start()
+    with timer.stage("parse"):
+        block = [bytes(1024) for _ in range(2048)]
+    del block
+    timings = timer.to_dict()
+    timer.stop()
+    assert timings["tracemalloc_peak_mb"] >= 2.0
+
+
+def test_aggregate_timings_percentiles_by_vendor(tmp_path):
+    def timings(wall, rows=100):
+        return {"stages": {"parse": {"wall_s": wall, "cpu_s": wall, "rows": rows, "rows_per_s": rows / wall}},
+                "total_wall_s": wall, "total_cpu_s": wall, "peak_rss_mb": 50.0 + wall}
+
+    metrics = aggregate_timings([("dell", timings(1.0)), ("dell", timings(3.0)), ("hpe", timings(2.0))])
+    parse = metrics["stages"]["parse"]
+    assert metrics["files"] == 3 and parse["files"] == 3
+    assert parse["wall_s"] == {"total": 6.0, "p50": 2.0, "p95": 2.9, "max": 3.0}
+    assert metrics["peak_rss_mb"] == 53.0
+    assert list(metrics["by_vendor"]) == ["dell", "hpe"]
+    assert metrics["by_vendor"]["dell"]["stages"]["parse"]["wall_s"]["p50"] == 2.0
+    assert aggregate_timings([]) == {"files": 0, "stages": {}, "by_vendor": {}}
+
+    path = save_batch_metrics(metrics, tmp_path)
+    assert json.loads(path.read_text(encoding="utf-8")) == metrics
+    assert _percentile([5.0], 95) == 5.0
@@ -82,3 +82,26 @@ def test_boss_blank_present():
     from src.rules.rules_engine import RuleSet
     rs = RuleSet.load(str(project_root() / "rules" / "dell_rules.yaml"))
     assert detect_state("No BOSS card, 1 Rear Blank", rs.get_state_rules()).value == "PRESENT"
+
+
+@pytest.mark.parametrize("text", [
+    "No OCP - 2 Rear Blanks", "No BOSS card, 1 Rear Blank", "2 OCP - No Cable", "Disabled",
+    "Dell Connectivity Client - Disabled", "None", "Without rails, Disabled", "Intel Xeon Silver",
+    "   No HDD  ", "Nonexistent", "",
+])
+def test_state_detector_combined_matches_rule_by_rule(text):
+    """RuleSet.state_detector (joined matchers) agrees with the one-rule-at-a-time scan."""
+    from src.core.state_detector import StateDetector
+    from src.rules.rules_engine import RuleSet
+    rs = RuleSet.load(str(project_root() / "rules" / "dell_rules.yaml"))
+    detector = rs.state_detector
+    separate = StateDetector(detector.absent, detector.overrides, combine=False)
+    assert detector.detect(text) == separate.detect(text) == detect_state(text, rs.get_state_rules())
+
+
+def test_state_detector_scopes_global_flags_and_skips_backrefs():
+    from src.core.state_detector import _combine
+    import re
+    joined = _combine([re.compile(r"(?i)\bnone\b"), re.compile(r"^\s*No\s+")])
+    assert joined is not None and joined("Option: NONE") and not joined("Intel")
+    assert _combine([re.compile(r"(a)\1"), re.compile("b")]) is None
@@ -0,0 +1,116 @@
+"""
+Tests for detect_vendor (src/vendors/detect.py) and main.py --vendor auto (synthetic workbooks).
+"""
+
+import subprocess
+import sys
+
+import openpyxl
+import pytest
+
+from conftest import project_root
+from src.core import workbook
+from src.vendors.cisco.adapter import CiscoAdapter
+from src.vendors.dell.adapter import DellAdapter
+from src.vendors.detect import detect_vendor
+from src.vendors.hpe.adapter import HPEAdapter
+from src.vendors.huawei.adapter import HuaweiAdapter
+from src.vendors.lenovo.adapter import LenovoAdapter
+from src.vendors.xfusion.adapter import XFusionAdapter
+
+ADAPTERS = {
+    "dell": DellAdapter(),
+    "cisco": CiscoAdapter(),
+    "hpe": HPEAdapter(),
+    "lenovo": LenovoAdapter(),
+    "huawei": HuaweiAdapter(),
+    "xfusion": XFusionAdapter(),
+}
+
+
+def _save(path, sheets):
+    """sheets: {title: [rows]} in order."""
+    wb = openpyxl.Workbook()
+    wb.remove(wb.active)
+    for title, rows in sheets.items():
+        ws = wb.create_sheet(title)
+        for row in rows:
+            ws.append(row)
+    wb.save(path)
+    wb.close()
+    return path
+
+
+def _all_in_one(price_header):
+    rows = [[None, None, "COL_SORTNO.0", "COL_SALECODE.0"]] + [[None] * 11 for _ in range(7)]
+    rows.append([None, None, "No.", "Part Number", "Model", "Description", "Unit Qty.", "Qty.", price_header])
+    return rows
+
+
+WORKBOOKS = {
+    "dell": {"Sheet1": [["Quote"], [], ["Module Name", "Option Name", "SKUs", "Qty"], ["Base", "Server", "210-AAAA", 1]]},
+    "cisco": {"Summary": [["x"]], "Price Estimate": [["Line Number", "Part Number"]]},
+    "hpe": {"BOM": [["Product #", "Product Description", "Qty"], ["P1", "CPU", 1]]},
+    "lenovo": {"Quote": [
+        [None, None, "Data Center Solution Configurator Quote"], [],
+        ["Part number", "Product Description", "Qty", "Price", "Total Part Price", "Export Control"],
+    ]},
+    "huawei": {"AllInOne": _all_in_one("Unit Price\n(USD)\nFOB HONG KONG")},
+    "xfusion": {"AllInOne": _all_in_one("Unit Price\n(USD)"), "Main Equipment Statistic": [["x"]]},
+}
+
+
+@pytest.mark.parametrize("vendor", list(WORKBOOKS))
+def test_detect_vendor(tmp_path, vendor):
+    path = _save(tmp_path / f"{vendor}.xlsx", WORKBOOKS[vendor])
+    assert ADAPTERS[vendor].can_parse(str(path))
+    assert detect_vendor(path, ADAPTERS) == vendor
+
+
+def test_no_signature_matches(tmp_path):
+    path = _save(tmp_path / "other.xlsx", {"Notes": [["nothing", "to", "see"]]})
+    assert detect_vendor(path, ADAPTERS) is None
+
+
+def test_detect_vendor_reads_workbook_once(tmp_path, monkeypatch):
+    path = _save(tmp_path / "lenovo.xlsx", WORKBOOKS["lenovo"])
+    sessions = []
+    real_init = workbook.WorkbookSession.__init__
+
+    def counting_init(self, *args, **kwargs):
+        sessions.append(args[0])
+        real_init(self, *args, **kwargs)
+
+    monkeypatch.setattr(workbook.WorkbookSession, "__init__", counting_init)
+    assert detect_vendor(path, ADAPTERS) == "lenovo"
+    assert len(sessions) == 1
+
+
+def test_cli_batch_vendor_auto(tmp_path):
+    batch_dir = tmp_path / "in"
+    batch_dir.mkdir()
+    _save(batch_dir / "hp_auto.xlsx", {"BOM": [
+        ["Product #", "Product Description", "Qty", "Unit Price (USD)", "Config Name"],
+        ["P123 ABC", "Intel Xeon CPU", 2, 1500.0, "Server A"],
+        ["Total", None, None, None, None],
+    ]})
+    _save(batch_dir / "other.xlsx", {"Notes": [["nothing"]]})
+    output_dir = tmp_path / "out"
+    root = project_root()
+    result = subprocess.run(
+        [
+            sys.executable, "main.py",
+            "--batch-dir", str(batch_dir),
+            "--vendor", "auto",
+            "--config", str(root / "config.yaml"),
+            "--output-dir", str(output_dir),
+            "--no-cache",
+        ],
+        cwd=str(root),
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert result.returncode == 0, f"CLI failed: stderr={result.stderr!r}"
+    assert "1 processed, 1 skipped, 0 failed" in result.stdout
+    assert (output_dir / "SPLIT" / "hpe" / "hp_auto" / "run_summary.json").exists()
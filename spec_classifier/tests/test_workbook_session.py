@@ -0,0 +1,181 @@
+"""
+Tests for WorkbookSession / open_workbook (one read of an input workbook per file).
+"""
+
+import datetime
+
+import openpyxl
+import pandas as pd
+import pytest
+
+from src.core import workbook
+from src.core.workbook import WorkbookSession, iter_records, open_workbook
+from src.vendors.dell.adapter import DellAdapter
+
+
+@pytest.fixture
+def xlsx(tmp_path):
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "Data"
+    ws.append(["Quote", None, None])
+    ws.append([])
+    ws.append(["Module Name", "Option Name", "Qty", "Price", "Flag"])
+    ws.append(["Base", "Server", 1, 10.5, True])
+    ws.append(["Memory", "32GB", 2.0, "=C5*2", False])
+    ws.append(["Drive", None, 3, "#N/A", None, None])
+    ws.append(["Date", datetime.datetime(2024, 5, 1), None, None, None, "tail"])
+    ws.append([])
+    ws.append([None, None])
+    other = wb.create_sheet("Other")
+    other.append(["x"])
+    path = tmp_path / "spec.xlsx"
+    wb.save(path)
+    return path
+
+
+@pytest.mark.parametrize("header,dtype", [(None, None), (2, None), (None, str)])
+def test_dataframe_matches_read_excel(xlsx, header, dtype):
+    expected = pd.read_excel(xlsx, header=header, dtype=dtype, engine="openpyxl")
+    pd.testing.assert_frame_equal(WorkbookSession(xlsx).dataframe(0, header=header, dtype=dtype), expected)
+
+
+
+@pytest.fixture
+def typed_xlsx(tmp_path):
+    """One column per typing rule read_excel applies, plus a second sheet of edge cases."""
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append(["Date", "When", "Bool", "BoolText", "Float", "Int", "Numeric text", "Mixed",
+               "Mixed", None, 7, "NA text", "Merged", "Sparse"])
+    rows = [
+        [datetime.date(2024, 5, 1), datetime.datetime(2024, 5, 1, 12, 30), True, "TRUE", 1.5, 1.0,
+         "12", 1, "a", None, 1, "NA", "merged", None],
+        [datetime.date(2024, 6, 1), None, False, "false", None, 2, "3.5", "b", True, None, 2, "n/a", None, None],
+        [None, datetime.datetime(2023, 1, 2), True, "True", 3.0, 3, "1e3", 2.5, None, None, 3, "x", None, "#N/A"],
+        [datetime.date(2024, 7, 1), None, None, "FALSE", -0.25, 4, "", None, False, None, 4, "null", "end", None],
+    ]
+    for row in rows:
+        ws.append(row)
+    ws.merge_cells("M2:M4")
+    ws["N4"] = "=NA()"
+    ws.append([])
+    ws.append([None, None, None, None, None, None, None, None, None, None, 5])
+    edge = wb.create_sheet("Edge")
+    edge.append(["h", "h", None, "h.1", 2.0, None, "z", "big"])
+    edge.append([True, "True", None, 1, "#N/A N/A", None, False, 1e20])
+    edge.append(["x", False, None, None, "<NA>", 1, 0, True])
+    header_only = wb.create_sheet("HeaderOnly")
+    header_only.append(["a", None, "b"])
+    wb.create_sheet("Empty")
+    path = tmp_path / "typed.xlsx"
+    wb.save(path)
+    # NA() is not evaluated by openpyxl: store its cached value as Excel would.
+    book = openpyxl.load_workbook(path)
+    book.active["N4"].value = "#N/A"
+    book.active["N4"].data_type = "e"
+    book.save(path)
+    return path
+
+
+@pytest.mark.parametrize("reader", ["openpyxl", "native"])
+@pytest.mark.parametrize("header,dtype", [(0, None), (None, None), (1, None), (None, str), (0, str)])
+def test_dataframe_matches_read_excel_on_typed_cells(typed_xlsx, reader, header, dtype):
+    session = WorkbookSession(typed_xlsx, reader=reader)
+    for sheet in session.sheet_names:
+        try:
+            expected = pd.read_excel(typed_xlsx, sheet_name=sheet, header=header, dtype=dtype, engine="openpyxl")
+        except ValueError:
+            # header past the last row
+            with pytest.raises(ValueError):
+                session.dataframe(sheet, header=header, dtype=dtype)
+            continue
+        pd.testing.assert_frame_equal(session.dataframe(sheet, header=header, dtype=dtype), expected)
+
+
+def test_na_strings_match_read_excel(tmp_path):
+    wb = openpyxl.Workbook()
+    for value in sorted(workbook._NA_STRINGS - {""}) + ["N/A ", "none", "-"]:
+        wb.active.append([value, 1])
+    path = tmp_path / "na.xlsx"
+    wb.save(path)
+    expected = pd.read_excel(path, header=None, engine="openpyxl")
+    pd.testing.assert_frame_equal(WorkbookSession(path).dataframe(0, header=None), expected)
+
+
+def test_rows_match_openpyxl(xlsx):
+    session = WorkbookSession(xlsx)
+    for data_only in (True, False):
+        wb = openpyxl.load_workbook(xlsx, read_only=True, data_only=data_only)
+        ws = wb["Data"]
+        assert session.rows("Data", data_only=data_only) == list(ws.iter_rows(values_only=True))
+        assert list(WorkbookSession(xlsx).stream_rows("Data", data_only=data_only)) == list(
+            ws.iter_rows(values_only=True)
+        )
+        assert list(session.stream_rows("Data", data_only=data_only)) == list(ws.iter_rows(values_only=True))
+        assert list(session.iter_rows(0, max_row=4, data_only=data_only)) == list(
+            ws.iter_rows(max_row=4, values_only=True)
+        )
+        wb.close()
+    assert session.sheet_names == ["Data", "Other"]
+    assert session.rows("Other") == [("x",)]
+
+
+def test_nested_open_workbook_shares_one_load(xlsx, monkeypatch):
+    loads = []
+    real_load = workbook.openpyxl.load_workbook
+    monkeypatch.setattr(workbook.openpyxl, "load_workbook", lambda *a, **kw: loads.append(kw) or real_load(*a, **kw))
+    with open_workbook(xlsx) as outer:
+        adapter = DellAdapter()
+        assert adapter.can_parse(str(xlsx))
+        rows, header_row_index = adapter.parse(str(xlsx))
+        with open_workbook(str(xlsx)) as inner:
+            assert inner is outer
+    assert header_row_index == 2
+    assert [r["Module Name"] for r in rows][:3] == ["Base", "Memory", "Drive"]
+    assert len(loads) == 1
+    with open_workbook(xlsx) as again:
+        assert again is not outer
+
+
+
+def test_open_workbook_with_other_reader_opens_own_session(xlsx):
+    with open_workbook(xlsx) as outer:
+        with open_workbook(xlsx, reader="native") as inner:
+            assert inner is not outer and inner.reader == "native"
+            with open_workbook(xlsx) as nested:
+                assert nested is inner
+        with open_workbook(xlsx, reader=outer.reader) as same:
+            assert same is outer
+        with open_workbook(xlsx) as restored:
+            assert restored is outer
+    assert not workbook._active
+
+def test_missing_file(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        with open_workbook(tmp_path / "missing.xlsx"):
+            pass
+
+
+def test_head_rows_numbers_rows_like_dataframe(xlsx):
+    session = WorkbookSession(xlsx)
+    head = session.head_rows(0, 3)
+    assert head[0][0] == "Quote" and not any(head[1]) and head[2][0] == "Module Name"
+    assert len(session._sheet(0, data_only=True).rows) == 3
+    df = session.dataframe(0, header=None)
+    assert df.iloc[2, 0] == "Module Name"
+
+
+@pytest.mark.parametrize("frame", [
+    pd.DataFrame({"a": ["x", None, "z"], "b": [1, 2, 3], "c": [1.5, None, 2.0]}),
+    pd.DataFrame({"a": [1.0, 2.0, None], "b": [1, 2, 3]}),
+    pd.DataFrame({"a": pd.to_datetime(["2024-01-01", None])}),
+])
+def test_iter_records_matches_iterrows(frame):
+    expected = [row.to_dict() for _, row in frame.iterrows()]
+    got = list(iter_records(frame))
+    assert [list(r) for r in got] == [list(r) for r in expected]
+    for g, e in zip(got, expected):
+        for key in e:
+            assert type(g[key]) is type(e[key])
+            assert (g[key] == e[key]) or (pd.isna(g[key]) and pd.isna(e[key]))
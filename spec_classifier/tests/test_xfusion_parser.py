@@ -7,7 +7,7 @@ import openpyxl
 import pytest
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
-from src.vendors.xfusion.parser import parse_excel, _is_sku_shape
+from src.vendors.xfusion.parser import iter_excel_rows, parse_excel, _is_sku_shape
 
 
 # ---------------------------------------------------------------------------
@@ -218,3 +218,49 @@ def test_parser_drops_fully_empty_separator_rows(tmp_path):
     assert len(rows) == 2
     assert rows[0]["Part Number"] == "Memory"
     assert rows[1]["Part Number"] == "0620Y006-006"
+
+
+# ---------------------------------------------------------------------------
+# Test 11: iter_excel_rows streams the same rows parse_excel returns; the
+# normalizer generator rolls up over it in a single pass
+# ---------------------------------------------------------------------------
+
+def test_iter_excel_rows_streams_parse_excel_rows(tmp_path):
+    from src.vendors.xfusion.normalizer import iter_normalize_xfusion_rows, normalize_xfusion_rows
+
+    p = tmp_path / "xf.xlsx"
+    _make_xfusion_xlsx(p, [
+        [None, None, None,    "1288H V7_Site1", None, None, None, None, None, None, None],
+        [None, None, "1.1.1", "Memory", "Memory", None, None, None, None, 180000, None],
+        [None, None, None,    None,     None,     None, None, None, None, None,   None],
+        [None, None, "",      "0620Y006-006", "M548R64", "DDR5 RDIMM", 12, 24, 7500, 180000, "49"],
+    ])
+    rows_iter = iter_excel_rows(str(p))
+    assert iter(rows_iter) is rows_iter
+    rows, _ = parse_excel(str(p))
+    assert list(rows_iter) == rows
+    streamed = list(iter_normalize_xfusion_rows(iter_excel_rows(str(p))))
+    assert streamed == normalize_xfusion_rows(rows)
+    assert streamed[-1].group_name == "1288H V7" and streamed[-1].module_name == "Memory"
+
+
+# ---------------------------------------------------------------------------
+# Test 12: inside an open_workbook session (main.py) parse_excel decodes
+# AllInOne through the session cache, shared with the annotated export
+# ---------------------------------------------------------------------------
+
+def test_parse_excel_in_session_decodes_sheet_once(tmp_path, monkeypatch):
+    from src.core import workbook
+
+    p = tmp_path / "xf.xlsx"
+    _make_xfusion_xlsx(p, [
+        [None, None, "", "0231Y091", "MODEL-X", "Description", 1, 2, 100.0, 200.0, "30"],
+    ])
+    decodes = []
+    real_value_rows = workbook._value_rows
+    monkeypatch.setattr(workbook, "_value_rows", lambda ws, *a: decodes.append(ws.title) or real_value_rows(ws, *a))
+    with workbook.open_workbook(p) as session:
+        rows, _ = parse_excel(str(p))
+        df = session.dataframe("AllInOne", header=None)
+    assert decodes == ["AllInOne"]
+    assert rows[0]["Part Number"] == df.iloc[9, 3] == "0231Y091"
@@ -0,0 +1,180 @@
+"""
+Tests for the native xlsx reader (src/core/xlsx_reader.py): same rows as read_only openpyxl.
+"""
+
+import zipfile
+
+import openpyxl
+import pandas as pd
+import pytest
+import yaml
+
+from conftest import project_root
+from src.core import workbook
+from src.core.workbook import WorkbookSession, excel_reader, open_workbook
+from src.core.xlsx_reader import XlsxReaderError, XlsxWorkbook
+
+_MAIN = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_RELS = "http://schemas.openxmlformats.org/package/2006/relationships"
+_DOC_RELS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+
+# Written by hand (as Excel and other producers do, not as openpyxl does): cells without
+# r, inline and rich strings, shared / array formulas, custom date formats, error cells,
+# gaps, an out-of-order row and a dimension that is too small.
+_SHEET1 = f"""<?xml version="1.0" encoding="UTF-8"?>
+<worksheet xmlns="{_MAIN}"><dimension ref="A1:C3"/><sheetData>
+<row r="1"><c r="A1" t="s"><v>0</v></c><c r="B1" t="s"><v>1</v></c><c r="D1" t="s"><v>2</v></c></row>
+<row r="2"><c t="n"><v>42</v></c><c><v>1.5</v></c><c><v>1E3</v></c><c t="b"><v>1</v></c><c t="str"><v>text</v></c></row>
+<row r="4"><c r="A4" s="1"><v>45413</v></c><c r="B4" s="2"><v>0.5</v></c><c r="C4" s="3"><v>45413.25</v></c>
+  <c r="E4" t="e"><v>#N/A</v></c><c r="F4" t="inlineStr"><is><t xml:space="preserve"> inline </t></is></c></row>
+<row r="3"><c r="A3"><v>99</v></c></row>
+<row r="5.0"><c r="A5"><f>B5*2</f><v>8</v></c><c r="B5"><v>4</v></c>
+  <c r="C5"><f t="shared" ref="C5:C7" si="0">A5+B5</f><v>12</v></c><c r="D5" t="e"><f>1/0</f><v>#DIV/0!</v></c></row>
+<row r="6"><c r="C6"><f t="shared" si="0"/><v>0</v></c><c r="D6"><f t="array" ref="D6:D7">SUM(A1:A2)</f><v>43.5</v></c>
+  <c r="E6" t="d"><v>2024-05-01T10:00:00</v></c><c r="F6" t="inlineStr"><is><r><t>rich</t></r><r><t> inline</t></r></is></c></row>
+<row r="7" spans="1:3"><c r="A7"><v></v></c><c r="B7" t="s"><v>3</v></c><c r="C7" s="1"><v>-1</v></c><c r="d7"><v>7</v></c></row>
+<row r="9"/>
+<row r="10"><c r="B10" t="e"><v>#REF!</v></c><c r="B10"><v>1</v></c><c r="C10" t="e"><v>#NAME?</v></c></row>
+</sheetData></worksheet>"""
+
+_SHEET2 = f"""<?xml version="1.0" encoding="UTF-8"?>
+<worksheet xmlns="{_MAIN}"><sheetData>
+<row><c t="s"><v>4</v></c></row><row><c><v>1</v></c><c><v>2</v></c></row>
+</sheetData></worksheet>"""
+
+_STRINGS = f"""<?xml version="1.0" encoding="UTF-8"?>
+<sst xmlns="{_MAIN}" count="5" uniqueCount="5">
+<si><t>Module Name</t></si>
+<si><r><rPr><b/></rPr><t>Option</t></r><r><t xml:space="preserve"> Name</t></r></si>
+<si><t>x005F_x000D_tail</t></si>
+<si><t/></si>
+<si><t>second sheet</t><rPh sb="0" eb="1"><t>ignored</t></rPh></si>
+</sst>"""
+
+_STYLES = f"""<?xml version="1.0" encoding="UTF-8"?>
+<styleSheet xmlns="{_MAIN}">
+<numFmts count="2"><numFmt numFmtId="164" formatCode="yyyy\\-mm\\-dd"/><numFmt numFmtId="165" formatCode="[h]:mm:ss"/></numFmts>
+<cellXfs count="4"><xf numFmtId="0"/><xf numFmtId="164"/><xf numFmtId="165"/><xf numFmtId="22"/></cellXfs>
+</styleSheet>"""
+
+
+def _package(path, workbook_pr=""):
+    sheets = f'<sheet name="Data" sheetId="1" r:id="rId1"/><sheet name="Second" sheetId="2" r:id="rId2"/>'
+    rels = (
+        f'<Relationship Id="rId1" Type="{_DOC_RELS}/worksheet" Target="worksheets/sheet1.xml"/>'
+        f'<Relationship Id="rId2" Type="{_DOC_RELS}/worksheet" Target="/xl/worksheets/sheet2.xml"/>'
+        f'<Relationship Id="rId3" Type="{_DOC_RELS}/sharedStrings" Target="sharedStrings.xml"/>'
+        f'<Relationship Id="rId4" Type="{_DOC_RELS}/styles" Target="styles.xml"/>'
+    )
+    overrides = ""
+    for part, ct in [
+        ("/xl/workbook.xml", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"),
+        ("/xl/worksheets/sheet1.xml", "application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"),
+        ("/xl/worksheets/sheet2.xml", "application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"),
+        ("/xl/sharedStrings.xml", "application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"),
+        ("/xl/styles.xml", "application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"),
+    ]:
+        overrides += f'<Override PartName="{part}" ContentType="{ct}"/>'
+    parts = {
+        "[Content_Types].xml": (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            f'<Default Extension="xml" ContentType="application/xml"/>{overrides}</Types>'
+        ),
+        "_rels/.rels": (
+            f'<?xml version="1.0" encoding="UTF-8"?><Relationships xmlns="{_RELS}">'
+            f'<Relationship Id="rId1" Type="{_DOC_RELS}/officeDocument" Target="xl/workbook.xml"/></Relationships>'
+        ),
+        "xl/workbook.xml": (
+            f'<?xml version="1.0" encoding="UTF-8"?><workbook xmlns="{_MAIN}" xmlns:r="{_DOC_RELS}">'
+            f"{workbook_pr}<sheets>{sheets}</sheets></workbook>"
+        ),
+        "xl/_rels/workbook.xml.rels": f'<?xml version="1.0" encoding="UTF-8"?><Relationships xmlns="{_RELS}">{rels}</Relationships>',
+        "xl/worksheets/sheet1.xml": _SHEET1,
+        "xl/worksheets/sheet2.xml": _SHEET2,
+        "xl/sharedStrings.xml": _STRINGS,
+        "xl/styles.xml": _STYLES,
+    }
+    with zipfile.ZipFile(path, "w") as z:
+        for name, text in parts.items():
+            z.writestr(name, text)
+    return path
+
+
+def _rows_with_types(rows):
+    return [[(type(v), v) for v in row] for row in rows]
+
+
+@pytest.mark.filterwarnings("ignore:Workbook contains no default style")
+@pytest.mark.parametrize("workbook_pr", ["", '<workbookPr date1904="1"/>'])
+def test_native_rows_match_openpyxl(tmp_path, workbook_pr):
+    path = _package(tmp_path / "hand.xlsx", workbook_pr)
+    native, reference = WorkbookSession(path, reader="native"), WorkbookSession(path, reader="openpyxl")
+    assert native.sheet_names == reference.sheet_names == ["Data", "Second"]
+    for sheet in ("Data", "Second", 0, 1):
+        for data_only in (True, False):
+            got, expected = native.rows(sheet, data_only), reference.rows(sheet, data_only)
+            assert _rows_with_types(got) == _rows_with_types(expected)
+            assert list(native.stream_rows(sheet, data_only)) == expected
+            assert native._sheet(sheet, data_only).errors == reference._sheet(sheet, data_only).errors
+    assert isinstance(native._books[True], XlsxWorkbook)
+    assert native.rows("Data")[0] == ("Module Name", "Option Name", None)
+    pd.testing.assert_frame_equal(native.dataframe(0, header=None), reference.dataframe(0, header=None))
+    pd.testing.assert_frame_equal(native.dataframe(0, header=None), pd.read_excel(path, header=None))
+
+
+def test_native_rows_match_openpyxl_on_written_workbook(tmp_path):
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append(["Module Name", "Option Name", "Qty"])
+    ws.append(["Base", "=A2&B1", 2])
+    ws.append([])
+    ws.append([None, None, 3.25, True])
+    path = tmp_path / "written.xlsx"
+    wb.save(path)
+    native, reference = WorkbookSession(path, reader="native"), WorkbookSession(path)
+    for data_only in (True, False):
+        assert native.rows(0, data_only) == reference.rows(0, data_only)
+        assert list(native.iter_rows(0, max_row=2, data_only=data_only)) == list(
+            reference.iter_rows(0, max_row=2, data_only=data_only)
+        )
+
+
+def test_chartsheets_are_listed_but_not_worksheets(tmp_path):
+    wb = openpyxl.Workbook()
+    wb.active.append(["Module Name", 1])
+    wb.create_chartsheet("Chart")
+    path = tmp_path / "chart.xlsx"
+    wb.save(path)
+    book = XlsxWorkbook(path.read_bytes())
+    assert book.sheetnames == ["Sheet", "Chart"]
+    assert [ws.title for ws in book.worksheets] == ["Sheet"]
+    assert WorkbookSession(path, reader="native").rows(0) == [("Module Name", 1)]
+
+
+def test_native_falls_back_to_openpyxl(tmp_path):
+    path = tmp_path / "broken.xlsx"
+    path.write_bytes(b"not a zip")
+    with pytest.raises(XlsxReaderError):
+        XlsxWorkbook(path.read_bytes())
+    with open_workbook(path, reader="native") as session:
+        with pytest.raises(Exception) as native_error:
+            session.sheet_names
+        assert session.reader == "openpyxl"
+    with pytest.raises(Exception) as openpyxl_error:
+        WorkbookSession(path).sheet_names
+    assert type(native_error.value) is type(openpyxl_error.value)
+
+
+def test_reader_from_config(tmp_path):
+    config = {"excel_reader": {"default": "native", "lenovo": "openpyxl"}}
+    assert excel_reader(config, "dell") == "native"
+    assert excel_reader(config, "lenovo") == "openpyxl"
+    assert excel_reader({}, "dell") == workbook.DEFAULT_READER
+    # Shipped config: openpyxl unless a vendor opts in to the native reader.
+    with open(project_root() / "config.yaml", encoding="utf-8") as f:
+        shipped = yaml.safe_load(f)
+    assert shipped["excel_reader"]["default"] == workbook.DEFAULT_READER == "openpyxl"
+    with pytest.raises(ValueError):
+        WorkbookSession(_package(tmp_path / "hand.xlsx"), reader="xlrd")